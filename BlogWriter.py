@@ -1,21 +1,33 @@
 import customtkinter as ctk
-import os
 import json
-import re
-import threading
+import asyncio
+import time
 from tkinter import messagebox, filedialog
 from dotenv import load_dotenv
-from openai import OpenAI
-from naversearch import search_naver_blog
-from title_prompt import (
-    get_analysis_prompt,
-    get_analysis_system_prompt,
-    get_generation_prompt,
-    get_generation_system_prompt
+from pipeline import (
+    BlogPipeline,
+    PipelineError,
+    BudgetExceeded,
+    save_article
 )
-from blog_content_prompt import (
-    get_blog_writing_prompt,
-    get_blog_writing_system_prompt
+from article_engine import (
+    arun_article_pool,
+    DEFAULT_MAX_WORKERS,
+    MAX_WORKERS_LIMIT
+)
+from ui_dispatch import UIDispatcher, ui_thread
+from title_list import VirtualTitleList
+from async_runtime import get_runtime
+from batch_api import run_batch_writing, describe_batch
+from keyword_expansion import EXPANSION_DEPTH
+from article_index import SIMILAR_ARTICLE_MODE, SIMILAR_MODES, SIMILAR_MODE_LABELS, SIMILAR_WRITE, SIMILAR_SKIP
+from cost_ledger import get_ledger, get_meter, format_report
+from job_manifest import (
+    JobManifest,
+    STATUS_DONE,
+    STATUS_PARTIAL,
+    STATUS_FAILED,
+    STATUS_SKIPPED
 )
 
 # .env 파일 로드
@@ -36,15 +48,23 @@ class BlogWriterApp(ctk.CTk):
         
         # 데이터 저장
         self.results = None
+        self.search_result_text = ""
         self.generated_titles = []
-        self.title_checkboxes = []
         self.save_path = ""
         self.phase = "title_generation"  # 'title_generation' or 'blog_writing'
         self.stop_writing_flag = False  # 작성 중단 플래그
         
+        # 작업 스레드의 화면 업데이트를 메인 루프에서 실행
+        self.ui = UIDispatcher(self)
+        self.ui.start()
+        
+        # 제목 생성/글 작성은 백그라운드 이벤트 루프 하나에서 실행
+        self.runtime = get_runtime()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # UI 초기화
         self.create_widgets()
-        
+    
     def create_widgets(self):
         # 메인 컨테이너 (좌우 2분할)
         self.grid_columnconfigure(0, weight=3)
@@ -119,7 +139,27 @@ class BlogWriterApp(ctk.CTk):
             text="30개",
             font=ctk.CTkFont(size=12)
         )
-        self.search_value_label.pack(pady=(0, 10), padx=20, anchor="center")
+        self.search_value_label.pack(pady=(0, 5), padx=20, anchor="center")
+        
+        # 검색/분석 캐시 무시 (새로 실행)
+        self.refresh_search_var = ctk.BooleanVar(value=False)
+        self.refresh_search_checkbox = ctk.CTkCheckBox(
+            left_panel,
+            text="🔄 캐시 무시하고 새로 검색·분석",
+            variable=self.refresh_search_var,
+            font=ctk.CTkFont(size=12)
+        )
+        self.refresh_search_checkbox.pack(pady=(0, 10), padx=20, anchor="w")
+        
+        # 연관 키워드 확장 (검색 결과에서 뽑은 키워드를 다시 검색해 분석에 반영)
+        self.expand_keywords_var = ctk.BooleanVar(value=False)
+        self.expand_keywords_checkbox = ctk.CTkCheckBox(
+            left_panel,
+            text="🌐 연관 키워드까지 검색해서 분석",
+            variable=self.expand_keywords_var,
+            font=ctk.CTkFont(size=12)
+        )
+        self.expand_keywords_checkbox.pack(pady=(0, 10), padx=20, anchor="w")
         
         # 생성할 제목 수
         generate_label = ctk.CTkLabel(
@@ -175,6 +215,18 @@ class BlogWriterApp(ctk.CTk):
         )
         self.blog_write_button.pack(pady=10, padx=20, fill="x")
         
+        # 이어서 작성 버튼 (중단/실패한 작업 재개)
+        self.resume_button = ctk.CTkButton(
+            left_panel,
+            text="🔁 이전 작업 이어서 작성",
+            command=self.resume_blog_writing,
+            height=35,
+            font=ctk.CTkFont(size=13),
+            fg_color=("gray60", "gray30"),
+            hover_color=("gray50", "gray25")
+        )
+        self.resume_button.pack(pady=(0, 10), padx=20, fill="x")
+        
         # 작성 중단 버튼 (초기에는 숨김)
         self.stop_button = ctk.CTkButton(
             left_panel,
@@ -215,6 +267,7 @@ class BlogWriterApp(ctk.CTk):
         self.tabview.add("✨ 생성된 제목")
         self.tabview.add("⚙️ 글 작성 설정")
         self.tabview.add("📝 작성 중인 글")
+        self.tabview.add("💰 비용")
         
         # 탭 1: 검색 결과
         self.search_textbox = ctk.CTkTextbox(
@@ -266,11 +319,9 @@ class BlogWriterApp(ctk.CTk):
         )
         self.deselect_all_button.pack(side="right", padx=5)
         
-        self.titles_scrollable = ctk.CTkScrollableFrame(
-            titles_tab,
-            fg_color="transparent"
-        )
-        self.titles_scrollable.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+        # 보이는 줄만 체크박스로 그리는 목록 (제목이 많아도 바로 표시, 검색/정렬 가능)
+        self.title_list = VirtualTitleList(titles_tab)
+        self.title_list.pack(fill="both", expand=True, padx=10, pady=(10, 5))
         
         # 다음 버튼 (초기에는 숨김)
         self.next_to_settings_button = ctk.CTkButton(
@@ -376,6 +427,62 @@ class BlogWriterApp(ctk.CTk):
         )
         self.max_chars_value_label.pack(pady=(0, 15), padx=20, anchor="center")
         
+        # 구분선
+        separator_workers = ctk.CTkFrame(settings_tab, height=2, fg_color=("#cccccc", "#333333"))
+        separator_workers.pack(fill="x", padx=20, pady=20)
+        
+        # 동시 작성 수 설정
+        workers_label = ctk.CTkLabel(
+            settings_tab,
+            text="🚀 동시 작성 수",
+            font=ctk.CTkFont(size=16, weight="bold")
+        )
+        workers_label.pack(pady=(10, 10), padx=20, anchor="w")
+        
+        self.workers_slider = ctk.CTkSlider(
+            settings_tab,
+            from_=1,
+            to=MAX_WORKERS_LIMIT,
+            number_of_steps=MAX_WORKERS_LIMIT - 1,
+            command=self.update_workers_label
+        )
+        self.workers_slider.set(DEFAULT_MAX_WORKERS)
+        self.workers_slider.pack(pady=(0, 5), padx=20, fill="x")
+        
+        self.workers_value_label = ctk.CTkLabel(
+            settings_tab,
+            text=f"동시에 {DEFAULT_MAX_WORKERS}개씩 작성",
+            font=ctk.CTkFont(size=13, weight="bold"),
+            text_color=("#2d6a4f", "#52b788")
+        )
+        self.workers_value_label.pack(pady=(0, 15), padx=20, anchor="center")
+        
+        # Batch API 사용 여부 (대량 작성 시 비용 절감, 결과는 최대 24시간 후)
+        self.batch_api_var = ctk.BooleanVar(value=False)
+        batch_api_checkbox = ctk.CTkCheckBox(
+            settings_tab,
+            text="📦 Batch API로 한 번에 작성 (비용 절감, 완료까지 최대 24시간)",
+            variable=self.batch_api_var,
+            font=ctk.CTkFont(size=13)
+        )
+        batch_api_checkbox.pack(pady=(5, 15), padx=20, anchor="w")
+        
+        # 제목이 비슷한 기존 글(자료 저장소에 기록된 글)이 있을 때 처리 방법
+        similar_label = ctk.CTkLabel(
+            settings_tab,
+            text="🔁 제목이 비슷한 기존 글이 있으면",
+            font=ctk.CTkFont(size=14)
+        )
+        similar_label.pack(pady=(5, 5), padx=20, anchor="w")
+        
+        self.similar_mode_var = ctk.StringVar(value=SIMILAR_MODE_LABELS[SIMILAR_ARTICLE_MODE])
+        similar_mode = ctk.CTkSegmentedButton(
+            settings_tab,
+            values=[SIMILAR_MODE_LABELS[mode] for mode in SIMILAR_MODES],
+            variable=self.similar_mode_var
+        )
+        similar_mode.pack(pady=(0, 15), padx=20, anchor="w")
+        
         # 탭 5: 작성 중인 글
         blog_tab = self.tabview.tab("📝 작성 중인 글")
         
@@ -409,6 +516,38 @@ class BlogWriterApp(ctk.CTk):
         self.blog_textbox.pack(fill="both", expand=True, padx=10, pady=10)
         self.blog_textbox.insert("1.0", "작성 중인 블로그 글이 여기에 표시됩니다...")
         self.blog_textbox.configure(state="disabled")
+        
+        # 탭 6: 비용 (토큰 사용량과 비용 집계)
+        cost_tab = self.tabview.tab("💰 비용")
+        
+        cost_header = ctk.CTkFrame(cost_tab, fg_color="transparent")
+        cost_header.pack(fill="x", padx=10, pady=(10, 0))
+        
+        self.cost_scope_var = ctk.StringVar(value="이번 실행")
+        cost_scope = ctk.CTkSegmentedButton(
+            cost_header,
+            values=["이번 실행", "최근 7일", "전체"],
+            variable=self.cost_scope_var,
+            command=lambda value: self.refresh_cost_report()
+        )
+        cost_scope.pack(side="left")
+        
+        cost_refresh_button = ctk.CTkButton(
+            cost_header,
+            text="🔄 새로고침",
+            command=self.refresh_cost_report,
+            width=100
+        )
+        cost_refresh_button.pack(side="right")
+        
+        self.cost_textbox = ctk.CTkTextbox(
+            cost_tab,
+            font=ctk.CTkFont(family="Consolas", size=12),
+            wrap="none"
+        )
+        self.cost_textbox.pack(fill="both", expand=True, padx=10, pady=10)
+        self.cost_textbox.insert("1.0", "분석/제목 생성/글 작성 요청의 토큰 사용량과 비용이 여기에 표시됩니다...")
+        self.cost_textbox.configure(state="disabled")
     
     def update_search_label(self, value):
         """검색할 블로그 수 레이블 업데이트"""
@@ -428,6 +567,10 @@ class BlogWriterApp(ctk.CTk):
         max_val = int(value)
         self.max_chars_value_label.configure(text=f"최대: {max_val}자")
     
+    def update_workers_label(self, value):
+        """동시 작성 수 레이블 업데이트"""
+        self.workers_value_label.configure(text=f"동시에 {int(value)}개씩 작성")
+    
     def start_title_generation(self):
         """제목 생성 시작"""
         keyword = self.keyword_entry.get().strip()
@@ -443,147 +586,89 @@ class BlogWriterApp(ctk.CTk):
         self.progress_bar.set(0)
         self.status_label.configure(text="제목 생성 프로세스 시작...")
         
-        # 스레드로 실행
+        # 백그라운드 이벤트 루프에서 실행
         num_search = int(self.search_slider.get())
         num_generate = int(self.generate_slider.get())
+        refresh = self.refresh_search_var.get()
+        expand_depth = EXPANSION_DEPTH if self.expand_keywords_var.get() else 0
         
-        thread = threading.Thread(
-            target=self.run_title_generation,
-            args=(keyword, num_search, num_generate)
-        )
-        thread.daemon = True
-        thread.start()
+        self.runtime.submit(self.run_title_generation(keyword, num_search, num_generate, refresh, expand_depth))
     
-    def run_title_generation(self, keyword, num_search, num_generate):
-        """제목 생성 프로세스 실행"""
+    async def run_title_generation(self, keyword, num_search, num_generate, refresh=False, expand_depth=0):
+        """제목 생성 프로세스 실행 (이벤트 루프 스레드에서 실행되므로 화면 갱신은 ui_thread 함수로)"""
+        pipeline = None
         try:
-            # OpenAI API 클라이언트 초기화
-            api_key = os.getenv("OPEN_AI_API_KEY")
-            if not api_key:
-                self.update_status("❌ OpenAI API 키가 없습니다.", 0)
-                messagebox.showerror("오류", "OpenAI API 키가 .env 파일에 없습니다.")
-                self.title_gen_button.configure(state="normal")
-                return
-            
-            client = OpenAI(api_key=api_key)
-            
-            # 1단계: 네이버 블로그 검색
-            self.update_status("🔍 1/3: 네이버 블로그 검색 중...", 0.1)
-            blog_titles = search_naver_blog(keyword, display=num_search)
-            
-            if not blog_titles:
-                self.update_status("❌ 검색 결과 없음", 0)
-                messagebox.showerror("오류", "검색 결과가 없습니다.")
-                self.title_gen_button.configure(state="normal")
-                return
-            
-            self.update_status(f"✅ {len(blog_titles)}개 블로그 제목 수집 완료", 0.3)
-            
-            # 검색 결과 표시
-            search_result = f"'{keyword}' 검색 결과 ({len(blog_titles)}개)\n\n"
-            search_result += "=" * 60 + "\n\n"
-            for idx, title in enumerate(blog_titles, 1):
-                search_result += f"{idx}. {title}\n\n"
-            self.update_textbox(self.search_textbox, search_result)
-            
-            # 2단계: AI 분석
-            self.update_status("🤖 2/3: ChatGPT로 제목 분석 중...", 0.4)
-            
-            titles_text = "\n".join([f"{i+1}. {title}" for i, title in enumerate(blog_titles)])
-            analysis_prompt = get_analysis_prompt(titles_text, keyword)
-            
-            analysis_response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": get_analysis_system_prompt()},
-                    {"role": "user", "content": analysis_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2500
+            pipeline = BlogPipeline(
+                on_progress=lambda stage, message, progress: self.update_status(message, progress)
             )
-            
-            analysis_result = analysis_response.choices[0].message.content
-            self.update_status("✅ 분석 완료!", 0.6)
-            self.update_textbox(self.analysis_textbox, analysis_result)
-            
-            # 3단계: 새로운 제목 생성
-            self.update_status(f"✨ 3/3: 새로운 제목 {num_generate}개 생성 중...", 0.7)
-            
-            generation_prompt = get_generation_prompt(analysis_result, titles_text, keyword, num_generate)
-            
-            generation_response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": get_generation_system_prompt()},
-                    {"role": "user", "content": generation_prompt}
-                ],
-                temperature=0.8,
-                max_tokens=1500
+            pipeline.add_hook("after_search", self.show_search_results)
+            pipeline.add_hook("after_expansion", self.show_keyword_graph)
+            pipeline.add_hook(
+                "after_analysis",
+                lambda keyword, analysis: self.update_textbox(self.analysis_textbox, analysis.to_display())
             )
             
-            generated_titles_text = generation_response.choices[0].message.content
-            self.update_status("✅ 제목 생성 완료!", 1.0)
-            self.update_textbox(self.analysis_textbox, analysis_result)
+            results = await pipeline.arun_titles(
+                keyword, num_search, num_generate, refresh=refresh, replace_duplicates=True,
+                expand_depth=expand_depth
+            )
+            self.results = results
             
-            # 제목 파싱
-            self.generated_titles = self.parse_titles(generated_titles_text)
+            # 비슷한 제목을 걸러낸 제목 (걸러낸 만큼 다시 생성해 채움)
+            self.generated_titles = results["titles"]
             
-            # 제목 체크박스 생성
-            self.create_title_checkboxes()
+            # 제목 선택 목록 표시
+            self.show_generated_titles()
             
             # 완료
             self.update_status("🎉 제목 생성이 완료되었습니다!", 1.0)
             
             # 블로그 글 생성 여부 묻기
-            self.after(500, self.ask_blog_writing)
-            
+            self.ui.post(self.after, 500, self.ask_blog_writing)
+        
+        except PipelineError as e:
+            self.update_status(e.status, 0)
+            self.ui.post(messagebox.showerror, "오류", str(e))
+        
         except Exception as e:
             self.update_status("❌ 오류 발생", 0)
-            messagebox.showerror("오류", f"오류가 발생했습니다:\n{str(e)}")
+            self.ui.post(messagebox.showerror, "오류", f"오류가 발생했습니다:\n{str(e)}")
         
         finally:
-            self.title_gen_button.configure(state="normal")
+            if pipeline is not None:
+                await pipeline.aclose()
+            self.ui.post(self.title_gen_button.configure, state="normal")
+            self.refresh_cost_report()
     
-    def create_title_checkboxes(self):
-        """생성된 제목 체크박스 생성"""
-        # 기존 체크박스 제거
-        for widget in self.titles_scrollable.winfo_children():
-            widget.destroy()
-        
-        self.title_checkboxes = []
-        
-        for idx, title in enumerate(self.generated_titles, 1):
-            # 프레임 생성
-            title_frame = ctk.CTkFrame(
-                self.titles_scrollable,
-                fg_color=("gray90", "gray20"),
-                corner_radius=10
-            )
-            title_frame.pack(fill="x", padx=10, pady=5)
-            
-            # 체크박스 변수
-            var = ctk.BooleanVar(value=True)
-            
-            # 체크박스
-            checkbox = ctk.CTkCheckBox(
-                title_frame,
-                text=f"{idx}. {title}",
-                variable=var,
-                font=ctk.CTkFont(size=13)
-            )
-            checkbox.pack(side="left", padx=15, pady=15, fill="x", expand=True)
-            
-            self.title_checkboxes.append((title, var))
+    def show_search_results(self, keyword, titles):
+        """검색 결과 탭 표시"""
+        search_result = f"'{keyword}' 검색 결과 ({len(titles)}개)\n\n"
+        search_result += "=" * 60 + "\n\n"
+        for idx, title in enumerate(titles, 1):
+            search_result += f"{idx}. {title}\n\n"
+        self.search_result_text = search_result
+        self.update_textbox(self.search_textbox, search_result)
+    
+    def show_keyword_graph(self, keyword, graph):
+        """검색 결과 탭 아래에 연관 키워드 표시"""
+        related = graph.to_prompt(limit=None) or "연관 키워드를 찾지 못했습니다."
+        self.update_textbox(
+            self.search_textbox,
+            f"{self.search_result_text}{'=' * 60}\n\n🌐 연관 키워드 (가중치: 등장한 검색 결과 수)\n\n{related}\n"
+        )
+    
+    @ui_thread()
+    def show_generated_titles(self):
+        """생성된 제목을 선택 목록에 표시 (모두 선택된 상태)"""
+        self.title_list.set_titles(self.generated_titles)
     
     def select_all_titles(self):
-        """모든 제목 선택"""
-        for _, var in self.title_checkboxes:
-            var.set(True)
+        """보이는(검색된) 제목 모두 선택"""
+        self.title_list.select_all()
     
     def deselect_all_titles(self):
-        """모든 제목 선택 해제"""
-        for _, var in self.title_checkboxes:
-            var.set(False)
+        """보이는(검색된) 제목 모두 선택 해제"""
+        self.title_list.deselect_all()
     
     def ask_blog_writing(self):
         """블로그 글 생성 여부 확인"""
@@ -609,7 +694,7 @@ class BlogWriterApp(ctk.CTk):
     def go_to_settings(self):
         """글 작성 설정 탭으로 이동"""
         # 선택된 제목 확인
-        selected_titles = [title for title, var in self.title_checkboxes if var.get()]
+        selected_titles = self.title_list.selected_titles()
         
         if not selected_titles:
             messagebox.showwarning("경고", "최소 1개 이상의 제목을 선택해주세요!")
@@ -629,7 +714,7 @@ class BlogWriterApp(ctk.CTk):
     def start_blog_writing(self):
         """블로그 글 작성 시작"""
         # 선택된 제목만 추출
-        selected_titles = [title for title, var in self.title_checkboxes if var.get()]
+        selected_titles = self.title_list.selected_titles()
         
         if not selected_titles:
             messagebox.showwarning("경고", "최소 1개 이상의 제목을 선택해주세요!")
@@ -655,6 +740,52 @@ class BlogWriterApp(ctk.CTk):
         
         self.save_path = save_path
         
+        keyword = self.keyword_entry.get().strip()
+        model = self.model_var.get()
+        
+        # 작업 기록 생성 (제목별 진행 상태 저장)
+        manifest = JobManifest.create(save_path, selected_titles, keyword, model, min_chars, max_chars)
+        self.launch_blog_writing(manifest)
+    
+    def resume_blog_writing(self):
+        """저장 폴더의 작업 기록을 불러와 완료되지 않은 글만 이어서 작성"""
+        save_path = filedialog.askdirectory(title="이어서 작성할 블로그 글 폴더를 선택하세요")
+        if not save_path:
+            return
+        
+        try:
+            manifest = JobManifest.load(save_path)
+        except Exception as e:
+            messagebox.showerror("오류", f"작업 기록을 읽을 수 없습니다:\n{str(e)}")
+            return
+        
+        if manifest is None:
+            messagebox.showwarning("경고", "선택한 폴더에 작업 기록(_job_manifest.json)이 없습니다.")
+            return
+        
+        remaining = manifest.remaining()
+        if not remaining:
+            messagebox.showinfo("안내", "모든 글이 이미 작성되었습니다!")
+            return
+        
+        result = messagebox.askyesno(
+            "이어서 작성",
+            f"- 키워드: {manifest.keyword}\n"
+            f"- 모델: {manifest.model}\n"
+            f"- 글자 수: {manifest.min_chars}~{manifest.max_chars}자\n"
+            f"- 완료: {manifest.count(STATUS_DONE)}개 / 남은 글: {len(remaining)}개 "
+            f"(실패 {manifest.count(STATUS_FAILED)}개, 일부 저장 {manifest.count(STATUS_PARTIAL)}개)\n"
+            + (f"- 진행 중인 Batch 작업: {manifest.batch_id} (결과를 받아옵니다)\n" if manifest.batch_id else "")
+            + "\n완료되지 않은 글을 이어서 작성하시겠습니까?"
+        )
+        if not result:
+            return
+        
+        self.save_path = save_path
+        self.launch_blog_writing(manifest)
+    
+    def launch_blog_writing(self, manifest):
+        """작업 기록의 남은 글을 백그라운드에서 작성"""
         # 중단 플래그 초기화
         self.stop_writing_flag = False
         
@@ -662,20 +793,22 @@ class BlogWriterApp(ctk.CTk):
         self.blog_write_button.pack_forget()
         self.stop_button.pack(pady=10, padx=20, fill="x")
         self.title_gen_button.configure(state="disabled")
+        self.resume_button.configure(state="disabled")
         
         # 작성 중인 글 탭으로 이동
         self.tabview.set("📝 작성 중인 글")
         
-        # 스레드로 실행
-        keyword = self.keyword_entry.get().strip()
-        model = self.model_var.get()
-        
-        thread = threading.Thread(
-            target=self.run_blog_writing,
-            args=(selected_titles, keyword, model, min_chars, max_chars)
-        )
-        thread.daemon = True
-        thread.start()
+        # 백그라운드 이벤트 루프에서 실행 (Batch 작업을 기다리던 작업 기록은 Batch API로 이어서 받아옴)
+        # Batch API는 상태 확인 간격마다 기다리는 동기 코드이므로 루프를 막지 않도록 스레드에서 실행
+        if self.batch_api_var.get() or manifest.batch_id:
+            self.runtime.submit(asyncio.to_thread(self.run_batch_api_writing, manifest))
+        else:
+            self.runtime.submit(self.run_blog_writing(manifest, int(self.workers_slider.get()), self.similar_mode()))
+    
+    def similar_mode(self):
+        """선택한 비슷한 글 처리 방법 (SIMILAR_MODES)"""
+        label = self.similar_mode_var.get()
+        return next((mode for mode in SIMILAR_MODES if SIMILAR_MODE_LABELS[mode] == label), SIMILAR_WRITE)
     
     def stop_writing(self):
         """블로그 글 작성 중단"""
@@ -690,142 +823,352 @@ class BlogWriterApp(ctk.CTk):
             self.update_status("⛔ 사용자가 작성을 중단했습니다.", 0)
             messagebox.showinfo("중단", "작성이 중단되었습니다.\n현재까지 작성된 글은 저장되었습니다.")
     
-    def run_blog_writing(self, titles, keyword, model, min_chars, max_chars):
-        """블로그 글 작성 프로세스 실행"""
+    def on_close(self):
+        """창을 닫으면 진행 중인 요청을 취소하고 이벤트 루프 종료"""
+        self.stop_writing_flag = True
+        self.runtime.shutdown(timeout=2)
+        self.destroy()
+    
+    async def run_blog_writing(self, manifest, max_workers=DEFAULT_MAX_WORKERS, similar_mode=SIMILAR_WRITE):
+        """
+        블로그 글 작성 프로세스 실행 (작업 기록의 남은 글을 동시에 작성)
+        글마다 스레드 대신 이벤트 루프의 작업으로 실행하므로 콜백 사이의 상태는 잠금 없이 공유합니다.
+        similar_mode가 write가 아니면 작성 전에 제목이 비슷한 기존 글을 찾아 건너뛰거나(skip) 참고 자료로 넣습니다(seed).
+        """
+        pipeline = None
         try:
-            api_key = os.getenv("OPEN_AI_API_KEY")
-            client = OpenAI(api_key=api_key)
+            pipeline = BlogPipeline()
+            # API 키가 없으면 작성 전에 중단
+            pipeline.require_api_key()
             
-            total_blogs = len(titles)
-            completed = 0
+            keyword = manifest.keyword
+            model = manifest.model
+            min_chars = manifest.min_chars
+            max_chars = manifest.max_chars
             
-            for idx, title in enumerate(titles, 1):
-                # 중단 플래그 확인
-                if self.stop_writing_flag:
-                    break
-                
-                # 진행률 계산
-                progress = idx / total_blogs
-                progress_percent = int(progress * 100)
-                
-                self.update_blog_progress(
-                    f"📝 [{idx}/{total_blogs}] '{title}' 작성 중... ({progress_percent}%)",
-                    progress
-                )
-                self.current_blog_label.configure(text=f"[{idx}/{total_blogs}] {title}")
+            # 완료된 글은 건너뛰고, 기존 번호를 유지한 채 남은 글만 작성
+            remaining = manifest.remaining()
+            indices = [idx for idx, _ in remaining]
+            titles = [title for _, title in remaining]
+            
+            total_blogs = len(manifest.items)
+            done_before = total_blogs - len(remaining)
+            in_progress = {}
+            completed = []
+            failed = []
+            partial = []
+            # 비슷한 기존 글이 있어 건너뛴 글 {번호: ArticleMatch}
+            skipped = {}
+            # 미리보기 탭에 스트리밍 중인 글 번호 (동시에 하나만 표시)
+            preview = {"idx": None}
+            budget_error = {"error": None}
+            
+            async def write_article(idx, title):
+                # 비슷한 기존 글 확인 (요청 비용을 쓰기 전에)
+                match = None
+                if similar_mode != SIMILAR_WRITE:
+                    match = await pipeline.afind_similar_article(title)
+                if match is not None and similar_mode == SIMILAR_SKIP:
+                    skipped[idx] = match
+                    return None
                 
-                # 블로그 글 작성
-                blog_prompt = get_blog_writing_prompt(title, keyword, min_chars, max_chars)
+                # 미리보기가 비어 있으면 이 글을 스트리밍으로 표시
+                owns_preview = preview["idx"] is None
+                if owns_preview:
+                    preview["idx"] = idx
                 
-                blog_response = client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {"role": "system", "content": get_blog_writing_system_prompt()},
-                        {"role": "user", "content": blog_prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=4000
-                )
+                if owns_preview:
+                    self.update_textbox(self.blog_textbox, f"[{idx}/{total_blogs}] {title}\n\n")
                 
-                blog_content = blog_response.choices[0].message.content
+                try:
+                    # 블로그 글 작성 (스트리밍)
+                    blog_content, stopped = await pipeline.awrite_article(
+                        keyword,
+                        title,
+                        model=model,
+                        min_chars=min_chars,
+                        max_chars=max_chars,
+                        should_stop=lambda: self.stop_writing_flag,
+                        on_chunk=(lambda text: self.append_textbox(self.blog_textbox, text)) if owns_preview else None,
+                        reference=match.seed_text() if match is not None else None
+                    )
+                except BudgetExceeded as e:
+                    # 예산을 넘으면 남은 글은 요청하지 않음
+                    budget_error["error"] = e
+                    self.stop_writing_flag = True
+                    raise
+                finally:
+                    if owns_preview:
+                        preview["idx"] = None
                 
-                # 마크다운 볼드체 제거 (**내용** -> 내용)
-                blog_content = re.sub(r'\*\*(.*?)\*\*', r'\1', blog_content)
+                # 중단되어 받은 내용이 없으면 저장하지 않음
+                if stopped and not blog_content.strip():
+                    return None
                 
-                # 미리보기 업데이트
-                self.update_textbox(self.blog_textbox, blog_content)
+                # 파일 저장 (번호는 제목 순서 기준)
+                file_name = save_article(self.save_path, idx, title, keyword, blog_content, partial=stopped)
                 
-                # 파일 저장
-                safe_filename = self.sanitize_filename(title)
-                file_path = os.path.join(self.save_path, f"{idx:02d}_{safe_filename}.txt")
+                if stopped:
+                    partial.append(idx)
                 
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"제목: {title}\n")
-                    f.write(f"키워드: {keyword}\n")
-                    f.write(f"글자 수: {len(blog_content)}자\n")
-                    f.write("=" * 80 + "\n\n")
-                    f.write(blog_content)
-                
-                completed = idx
+                return file_name
+            
+            def on_start(idx, title):
+                in_progress[idx] = title
+                done_count = done_before + len(completed) + len(failed) + len(skipped)
+                running = sorted(in_progress)
                 
+                progress = done_count / total_blogs
                 self.update_blog_progress(
-                    f"✅ [{idx}/{total_blogs}] 저장 완료: {safe_filename}.txt ({progress_percent}%)",
+                    f"📝 [{idx}/{total_blogs}] '{title}' 작성 중... "
+                    f"(동시 {len(running)}개, {int(progress * 100)}%)",
                     progress
                 )
+                self.ui.post(
+                    self.current_blog_label.configure,
+                    text=f"작성 중: {', '.join(f'{i}번' for i in running)} / 총 {total_blogs}개",
+                    key="current_blog"
+                )
+            
+            def on_finish(idx, title, file_name, error):
+                in_progress.pop(idx, None)
+                if idx in skipped:
+                    match = skipped[idx]
+                    manifest.update(idx, STATUS_SKIPPED, output=match.path or match.match_title)
+                    done_count = done_before + len(completed) + len(failed) + len(skipped)
+                    self.update_blog_progress(
+                        f"⏭️ [{idx}/{total_blogs}] 비슷한 글이 있어 건너뜀: {match.describe()}",
+                        done_count / total_blogs
+                    )
+                    return
+                
+                if error is not None:
+                    failed.append((idx, title, error))
+                elif file_name is not None and idx not in partial:
+                    completed.append(idx)
+                done_count = done_before + len(completed) + len(failed) + len(skipped)
+                
+                # 작업 기록 갱신 (받은 내용 없이 중단된 글은 대기 상태 유지)
+                if error is not None:
+                    manifest.update(idx, STATUS_FAILED, error=str(error))
+                elif file_name is not None:
+                    manifest.update(idx, STATUS_PARTIAL if idx in partial else STATUS_DONE, output=file_name)
+                
+                progress = done_count / total_blogs
+                if error is None and file_name is None:
+                    message = f"⛔ [{idx}/{total_blogs}] 작성 중단: {title}"
+                elif error is None and idx in partial:
+                    message = f"⛔ [{idx}/{total_blogs}] 중단 - 일부 저장: {file_name}"
+                elif error is None:
+                    message = f"✅ [{idx}/{total_blogs}] 저장 완료: {file_name} ({int(progress * 100)}%)"
+                else:
+                    message = f"❌ [{idx}/{total_blogs}] 작성 실패: {title} ({int(progress * 100)}%)"
+                self.update_blog_progress(message, progress)
+            
+            await arun_article_pool(
+                titles,
+                write_article,
+                max_concurrency=max_workers,
+                should_stop=lambda: self.stop_writing_flag,
+                on_start=on_start,
+                on_finish=on_finish,
+                indices=indices
+            )
+            
+            # 예산 초과로 중단
+            if budget_error["error"] is not None:
+                raise budget_error["error"]
+            
+            # 비슷한 기존 글이 있어 건너뛴 글
+            skipped_lines = "".join(
+                f"  - {idx}. {match.describe()}\n" for idx, match in sorted(skipped.items())
+            )
+            skipped_summary = f"- 건너뛴 글: {len(skipped)}개 (비슷한 기존 글 있음)\n{skipped_lines}" if skipped else ""
             
             # 완료 또는 중단
             if self.stop_writing_flag:
-                self.update_blog_progress(f"⛔ 작성 중단됨 ({completed}/{total_blogs}개 완료)", completed / total_blogs)
-                self.update_status(f"⛔ 작성 중단: {completed}개 완료", 0)
+                stop_message = f"⛔ 작성 중단됨 ({done_before + len(completed)}/{total_blogs}개 완료"
+                if partial:
+                    stop_message += f", {len(partial)}개 일부 저장"
+                self.update_blog_progress(stop_message + ")", (done_before + len(completed)) / total_blogs)
+                self.update_status(f"⛔ 작성 중단: {len(completed)}개 완료", 0)
+            elif failed:
+                self.update_blog_progress(
+                    f"⚠️ 작성 완료: {len(completed)}개 성공, {len(failed)}개 실패",
+                    1.0
+                )
+                self.update_status(f"⚠️ {len(failed)}개 글 작성 실패", 1.0)
+                
+                failed_lines = "\n".join(f"- {idx}. {title}: {error}" for idx, title, error in sorted(failed, key=lambda x: x[0]))
+                self.ui.post(
+                    messagebox.showwarning,
+                    "일부 실패",
+                    f"블로그 글 작성이 끝났지만 일부 글은 실패했습니다.\n\n"
+                    f"- 작성된 글: {len(completed)}개\n"
+                    f"- 실패한 글: {len(failed)}개\n{failed_lines}\n"
+                    f"{skipped_summary}"
+                    f"- 저장 위치: {self.save_path}"
+                )
             else:
                 self.update_blog_progress(f"🎉 모든 블로그 글 작성 완료! (100%)", 1.0)
                 self.update_status("🎉 모든 작업이 완료되었습니다!", 1.0)
                 
-                messagebox.showinfo(
+                self.ui.post(
+                    messagebox.showinfo,
                     "완료",
                     f"블로그 글 작성이 완료되었습니다!\n\n"
-                    f"- 작성된 글: {total_blogs}개\n"
+                    f"- 작성된 글: {len(completed)}개 (전체 {total_blogs}개)\n"
+                    f"{skipped_summary}"
                     f"- 저장 위치: {self.save_path}"
                 )
-            
+        
+        except PipelineError as e:
+            self.update_status(e.status, 0)
+            self.ui.post(messagebox.showerror, "오류", str(e))
+        
         except Exception as e:
             self.update_status("❌ 오류 발생", 0)
-            messagebox.showerror("오류", f"오류가 발생했습니다:\n{str(e)}")
+            self.ui.post(messagebox.showerror, "오류", f"오류가 발생했습니다:\n{str(e)}")
         
         finally:
-            # 버튼 복구
-            self.stop_button.pack_forget()
-            self.blog_write_button.pack(pady=10, padx=20, fill="x")
-            self.blog_write_button.configure(state="normal")
-            self.title_gen_button.configure(state="normal")
+            if pipeline is not None:
+                await pipeline.aclose()
+            self.restore_writing_buttons()
     
-    def parse_titles(self, text):
-        """생성된 제목 텍스트에서 제목만 추출"""
-        titles = []
-        lines = text.strip().split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+    def run_batch_api_writing(self, manifest):
+        """Batch API로 블로그 글 작성 (작업을 제출하고 완료될 때까지 상태 확인)"""
+        try:
+            pipeline = BlogPipeline()
+            # API 키가 없으면 작성 전에 중단
+            pipeline.require_api_key()
+            
+            total_blogs = len(manifest.items)
+            remaining = len(manifest.remaining())
+            completed = []
+            failed = []
             
-            # "1. 제목 - 설명" 형식에서 제목만 추출
-            line = re.sub(r'^\d+\.\s*', '', line)
-            if ' - ' in line:
-                line = line.split(' - ')[0].strip()
-            line = line.replace('**', '').strip()
+            self.update_textbox(self.blog_textbox, "")
+            self.update_blog_progress(f"📦 Batch API로 글 {remaining}개 작성 요청 중...", 0)
+            self.ui.post(
+                self.current_blog_label.configure,
+                text=f"Batch 작성: {remaining}개 / 총 {total_blogs}개",
+                key="current_blog"
+            )
+            
+            def on_progress(batch):
+                counts = batch.request_counts
+                progress = counts.completed / counts.total if counts and counts.total else 0
+                self.update_blog_progress(describe_batch(batch), progress)
+            
+            def on_finish(manifest, idx, title, file_name, error):
+                if error is None:
+                    completed.append(idx)
+                    self.append_textbox(self.blog_textbox, f"✅ [{idx}/{total_blogs}] 저장 완료: {file_name}\n")
+                else:
+                    failed.append((idx, title, error))
+                    self.append_textbox(self.blog_textbox, f"❌ [{idx}/{total_blogs}] 작성 실패: {title} ({error})\n")
+            
+            result = run_batch_writing(
+                pipeline,
+                [manifest],
+                self.save_path,
+                should_stop=lambda: self.stop_writing_flag,
+                on_progress=on_progress,
+                on_finish=on_finish
+            )
             
-            if line and len(line) > 5:
-                titles.append(line)
+            if result["stopped"]:
+                self.update_status("⛔ Batch 결과 기다리기 중단", 0)
+                self.ui.post(
+                    messagebox.showinfo,
+                    "Batch 작업",
+                    "Batch 작업은 OpenAI 서버에서 계속 진행됩니다.\n"
+                    "'🔁 이전 작업 이어서 작성'으로 같은 폴더를 선택하면 결과를 받아옵니다.\n\n"
+                    f"- 작업 ID: {result['batch_id']}"
+                )
+            elif failed or manifest.remaining():
+                self.update_status(f"⚠️ Batch 작성 완료: {len(completed)}개 성공, {len(failed)}개 실패", 1.0)
+                self.ui.post(
+                    messagebox.showwarning,
+                    "일부 실패",
+                    f"Batch 작업({result['status']})이 끝났지만 일부 글은 작성되지 않았습니다.\n\n"
+                    f"- 작성된 글: {len(completed)}개\n"
+                    f"- 남은 글: {len(manifest.remaining())}개 ('🔁 이전 작업 이어서 작성'으로 다시 요청)\n"
+                    f"- 저장 위치: {self.save_path}"
+                )
+            else:
+                self.update_blog_progress("🎉 모든 블로그 글 작성 완료! (100%)", 1.0)
+                self.update_status("🎉 모든 작업이 완료되었습니다!", 1.0)
+                self.ui.post(
+                    messagebox.showinfo,
+                    "완료",
+                    f"Batch API로 블로그 글 작성이 완료되었습니다!\n\n"
+                    f"- 작성된 글: {len(completed)}개 (전체 {total_blogs}개)\n"
+                    f"- 저장 위치: {self.save_path}"
+                )
         
-        return titles[:int(self.generate_slider.get())]
+        except PipelineError as e:
+            self.update_status(e.status, 0)
+            self.ui.post(messagebox.showerror, "오류", str(e))
+        
+        except Exception as e:
+            self.update_status("❌ 오류 발생", 0)
+            self.ui.post(messagebox.showerror, "오류", f"오류가 발생했습니다:\n{str(e)}")
+        
+        finally:
+            self.restore_writing_buttons()
     
-    def sanitize_filename(self, filename):
-        """파일명에 사용할 수 없는 문자 제거"""
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '')
-        filename = filename.replace(' ', '_')
-        if len(filename) > 50:
-            filename = filename[:50]
-        return filename
+    @ui_thread()
+    def restore_writing_buttons(self):
+        """글 작성이 끝난 뒤 버튼 복구"""
+        self.stop_button.pack_forget()
+        self.blog_write_button.pack(pady=10, padx=20, fill="x")
+        self.blog_write_button.configure(state="normal")
+        self.resume_button.configure(state="normal")
+        self.title_gen_button.configure(state="normal")
+        self.refresh_cost_report()
     
+    @ui_thread(key="cost_report")
+    def refresh_cost_report(self):
+        """비용 탭 내용 갱신 (선택한 범위의 키워드별/글별 비용과 토큰/초)"""
+        meter = get_meter()
+        scope = self.cost_scope_var.get()
+        if scope == "이번 실행":
+            report = format_report(get_ledger(), run_id=meter.run_id)
+            header = f"실행 ID: {meter.run_id}\n{meter.describe()}\n\n"
+        else:
+            since = time.time() - 7 * 86400 if scope == "최근 7일" else None
+            report = format_report(get_ledger(), since=since)
+            header = ""
+        self.update_textbox(self.cost_textbox, header + report)
+    
+    @ui_thread(key="status")
     def update_status(self, text, progress):
         """상태 텍스트 및 프로그레스 바 업데이트"""
         self.status_label.configure(text=text)
         self.progress_bar.set(progress)
     
+    @ui_thread(key="blog_progress")
     def update_blog_progress(self, text, progress):
         """블로그 작성 진행률 업데이트"""
         self.blog_progress_label.configure(text=text)
         self.blog_progress_bar.set(progress)
     
+    @ui_thread(key=lambda textbox, content: id(textbox))
     def update_textbox(self, textbox, content):
         """텍스트박스 내용 업데이트"""
         textbox.configure(state="normal")
         textbox.delete("1.0", "end")
         textbox.insert("1.0", content)
         textbox.configure(state="disabled")
+    
+    @ui_thread()
+    def append_textbox(self, textbox, content):
+        """텍스트박스 끝에 내용 추가 (스트리밍 표시용)"""
+        textbox.configure(state="normal")
+        textbox.insert("end", content)
+        textbox.see("end")
+        textbox.configure(state="disabled")
 
 
 def main():
@@ -1,15 +1,12 @@
 import streamlit as st
-import os
 import json
+import html
+import queue
 from dotenv import load_dotenv
-from openai import OpenAI
-from naversearch import search_naver_blog
-from prompt import (
-    get_analysis_prompt,
-    get_analysis_system_prompt,
-    get_generation_prompt,
-    get_generation_system_prompt
-)
+from pipeline import BlogPipeline, PipelineError
+from async_runtime import get_runtime
+from title_analysis import TitleAnalysis
+from title_dedupe import format_duplicates
 
 # .env 파일 로드
 load_dotenv()
@@ -159,91 +156,65 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+def format_postdate(postdate):
+    """검색 결과 작성일 표시 ('20240131' → '2024.01.31')"""
+    if not postdate or len(postdate) != 8:
+        return postdate or ""
+    return f"{postdate[:4]}.{postdate[4:6]}.{postdate[6:]}"
+
+
 def analyze_and_generate_with_progress(keyword, num_search=30, num_generate=10):
     """
     진행률을 표시하며 블로그 제목 분석 및 생성을 수행합니다.
+    요청은 백그라운드 이벤트 루프에서 실행하고, Streamlit 위젯은 스크립트 스레드에서만 갱신할 수 있으므로
+    진행 상황을 큐로 받아 이 함수에서 표시합니다.
     """
     # 진행률 표시 컨테이너
     progress_bar = st.progress(0)
     status_text = st.empty()
+    updates = queue.Queue()
     
-    # OpenAI API 클라이언트 초기화
-    api_key = os.getenv("OPEN_AI_API_KEY")
-    if not api_key:
-        st.error("⚠️ OpenAI API 키가 .env 파일에 없습니다.")
-        return None
+    def show_progress(message, progress):
+        status_text.markdown(f"**{message}**")
+        progress_bar.progress(int(progress * 100))
     
-    client = OpenAI(api_key=api_key)
+    async def run():
+        pipeline = BlogPipeline(on_progress=lambda stage, message, progress: updates.put((message, progress)))
+        try:
+            return await pipeline.arun_titles(keyword, num_search, num_generate)
+        finally:
+            await pipeline.aclose()
     
+    future = get_runtime().submit(run())
     try:
-        # 1단계: 네이버 블로그 검색 (0-30%)
-        status_text.markdown("🔍 **1단계: 네이버 블로그 검색 중...**")
-        progress_bar.progress(10)
-        
-        blog_titles = search_naver_blog(keyword, display=num_search)
-        
-        if not blog_titles:
-            st.error("❌ 검색 결과가 없습니다.")
-            return None
-        
-        progress_bar.progress(30)
-        status_text.markdown(f"✅ **{len(blog_titles)}개의 블로그 제목 수집 완료!**")
-        
-        # 2단계: GPT 분석 (30-60%)
-        status_text.markdown("🤖 **2단계: ChatGPT로 제목 분석 중...**")
-        progress_bar.progress(40)
-        
-        titles_text = "\n".join([f"{i+1}. {title}" for i, title in enumerate(blog_titles)])
-        analysis_prompt = get_analysis_prompt(titles_text, keyword)
-        
-        analysis_response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": get_analysis_system_prompt()},
-                {"role": "user", "content": analysis_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=2500
-        )
-        
-        analysis_result = analysis_response.choices[0].message.content
-        progress_bar.progress(60)
-        status_text.markdown("✅ **분석 완료!**")
+        # 끝날 때까지 진행 상황 표시 (스크립트가 다시 실행되어 중단되면 요청도 취소)
+        while True:
+            try:
+                show_progress(*updates.get(timeout=0.1))
+            except queue.Empty:
+                if future.done():
+                    break
+        while not updates.empty():
+            show_progress(*updates.get_nowait())
         
-        # 3단계: 새로운 제목 생성 (60-90%)
-        status_text.markdown(f"✨ **3단계: 새로운 블로그 제목 {num_generate}개 생성 중...**")
-        progress_bar.progress(70)
-        
-        generation_prompt = get_generation_prompt(analysis_result, titles_text, keyword, num_generate)
-        
-        generation_response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": get_generation_system_prompt()},
-                {"role": "user", "content": generation_prompt}
-            ],
-            temperature=0.8,
-            max_tokens=1500
-        )
-        
-        generated_titles = generation_response.choices[0].message.content
-        progress_bar.progress(90)
-        status_text.markdown("✅ **새 제목 생성 완료!**")
+        results = future.result()
         
         # 완료
         progress_bar.progress(100)
         status_text.markdown("🎉 **모든 작업 완료!**")
         
-        return {
-            "keyword": keyword,
-            "original_titles": blog_titles,
-            "analysis": analysis_result,
-            "generated_titles": generated_titles
-        }
-        
+        return results
+    
+    except PipelineError as e:
+        st.error(f"❌ {e}")
+        return None
+    
     except Exception as e:
         st.error(f"❌ 오류 발생: {str(e)}")
         return None
+    
+    finally:
+        future.cancel()
 
 
 def main():
@@ -335,23 +306,38 @@ def main():
             st.markdown(f"### 📊 '{results['keyword']}' 검색 결과 ({len(results['original_titles'])}개)")
             st.markdown("---")
             
-            for idx, title in enumerate(results['original_titles'], 1):
+            # 검색 결과는 태그/엔티티를 변환한 글자이므로 HTML로 표시할 때 다시 이스케이프
+            search_results = results.get('search_results') or [{"title": title} for title in results['original_titles']]
+            for idx, result in enumerate(search_results, 1):
+                meta = " · ".join(
+                    value for value in (result.get('bloggername'), format_postdate(result.get('postdate'))) if value
+                )
                 st.markdown(
-                    f'<div class="blog-title-item"><strong>{idx}.</strong> {title}</div>',
+                    f'<div class="blog-title-item"><strong>{idx}.</strong> {html.escape(result["title"])}'
+                    + (f'<br><small>{html.escape(meta)}</small>' if meta else "")
+                    + '</div>',
                     unsafe_allow_html=True
                 )
+                if result.get('description'):
+                    st.caption(result['description'])
         
         # 탭 2: 분석 결과
         with tab2:
             st.markdown("### 🔍 AI 분석 결과")
             st.markdown("---")
-            st.markdown(results['analysis'])
+            st.markdown(TitleAnalysis.from_dict(results['analysis']).to_display())
         
         # 탭 3: 생성된 제목
         with tab3:
             st.markdown(f"### ✨ 새롭게 생성된 블로그 제목 ({num_generate}개)")
             st.markdown("---")
             st.markdown(results['generated_titles'])
+            
+            if results['duplicates']:
+                st.warning(
+                    f"♻️ 기존 제목과 비슷한 제목 {len(results['duplicates'])}개는 글 작성 대상에서 제외됩니다.\n\n"
+                    + format_duplicates(results['duplicates'])
+                )
         
         # 탭 4: JSON
         with tab4:
@@ -0,0 +1,387 @@
+"""
+블로그 글 동시 작성 엔진
+여러 제목의 블로그 글 작성 요청을 워커 풀에서 동시에 처리합니다.
+요청마다 입력 토큰 중 프롬프트 캐시가 적용된 양을 집계합니다.
+
+asyncio 버전(arun_article_pool, astream_completion)은 요청마다 스레드를 만들지 않고
+이벤트 루프 하나에서 작업(Task)으로 동시에 처리하며, 작업을 취소하면 스트림을 바로 닫습니다.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from rate_limit import chat_completion, achat_completion, get_limiter, estimate_tokens
+
+# 동시에 진행할 글 작성 요청 수 (기본값 / 최대값)
+DEFAULT_MAX_WORKERS = 3
+MAX_WORKERS_LIMIT = 10
+
+
+def run_article_pool(titles, write_article, max_workers=DEFAULT_MAX_WORKERS,
+                     should_stop=None, on_start=None, on_finish=None, indices=None):
+    """
+    제목 리스트를 워커 풀에서 동시에 처리합니다.
+    
+    번호(idx)는 제목 리스트의 순서로 미리 정해지므로 완료 순서와 관계없이
+    파일명 접두어(01_, 02_ ...)가 항상 같게 유지됩니다.
+    제너레이터를 넘기면 제목이 나올 때마다 바로 작업을 제출하므로
+    제목 생성이 끝나기 전에 앞의 글부터 작성을 시작합니다.
+    
+    Args:
+        titles (iterable): 작성할 블로그 제목 (리스트 또는 제목이 생기는 대로 내보내는 제너레이터)
+        write_article (callable): write_article(idx, title) 형태의 작성 함수 (idx는 1부터 시작)
+        max_workers (int): 동시에 진행할 최대 요청 수
+        should_stop (callable): 중단 여부를 반환하는 함수 (True면 새 작업을 시작하지 않음)
+        on_start (callable): on_start(idx, title) - 작성 시작 시 호출
+        on_finish (callable): on_finish(idx, title, result, error) - 작성 완료/실패 시 호출
+        indices (list): 제목별 번호 (기본값: 1부터 순서대로, 이어서 작성할 때 기존 번호 유지용)
+    
+    Returns:
+        tuple: ({idx: 결과}, {idx: 예외}) 완료된 글과 실패한 글
+    """
+    max_workers = max(1, min(int(max_workers), MAX_WORKERS_LIMIT))
+    results = {}
+    errors = {}
+    lock = threading.Lock()
+    
+    def stopped():
+        return should_stop is not None and should_stop()
+    
+    def task(idx, title):
+        # 대기열에서 꺼내졌을 때 이미 중단되었으면 요청을 보내지 않음
+        if stopped():
+            return None
+        
+        if on_start:
+            on_start(idx, title)
+        
+        try:
+            result = write_article(idx, title)
+        except Exception as e:
+            with lock:
+                errors[idx] = e
+            if on_finish:
+                on_finish(idx, title, None, e)
+            return None
+        
+        with lock:
+            results[idx] = result
+        if on_finish:
+            on_finish(idx, title, result, None)
+        return result
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="article")
+    try:
+        futures = [
+            executor.submit(task, idx, title)
+            for idx, title in (zip(indices, titles) if indices is not None else enumerate(titles, 1))
+        ]
+        
+        for future in as_completed(futures):
+            if not future.cancelled():
+                future.result()
+            if stopped():
+                # 아직 시작하지 않은 작업 취소 (진행 중인 요청은 끝까지 기다림)
+                for pending in futures:
+                    pending.cancel()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    
+    return results, errors
+
+
+# asyncio 작성에서 중단 여부를 확인하는 간격 (초)
+STOP_POLL_INTERVAL = 0.1
+
+
+async def arun_article_pool(titles, write_article, max_concurrency=DEFAULT_MAX_WORKERS,
+                            should_stop=None, on_start=None, on_finish=None, indices=None):
+    """
+    run_article_pool의 asyncio 버전
+    글마다 스레드 대신 작업(Task)을 만들고 세마포어로 동시 요청 수를 제한하므로
+    수백 개의 글을 동시에 요청해도 스레드가 늘어나지 않습니다.
+    
+    중단되면(should_stop) 아직 작성을 시작하지 않은 작업은 바로 취소하고,
+    작성 중인 글은 다음 청크에서 멈춰 받은 내용까지 돌려받습니다.
+    이 코루틴 자체를 취소하면 모든 작업을 취소하고 스트림을 닫은 뒤 끝납니다.
+    
+    Args:
+        titles (iterable): 작성할 블로그 제목
+        write_article (callable): write_article(idx, title) 형태의 코루틴 함수 (idx는 1부터 시작)
+        max_concurrency (int): 동시에 진행할 최대 요청 수 (스레드 풀과 달리 상한 없음)
+        should_stop (callable): 중단 여부를 반환하는 함수
+        on_start (callable): on_start(idx, title) - 작성 시작 시 호출
+        on_finish (callable): on_finish(idx, title, result, error) - 작성 완료/실패 시 호출
+        indices (list): 제목별 번호 (기본값: 1부터 순서대로)
+    
+    Returns:
+        tuple: ({idx: 결과}, {idx: 예외}) 완료된 글과 실패한 글
+    """
+    slots = asyncio.Semaphore(max(1, int(max_concurrency)))
+    results = {}
+    errors = {}
+    started = set()
+    
+    def stopped():
+        return should_stop is not None and should_stop()
+    
+    async def task(idx, title):
+        async with slots:
+            if stopped():
+                return
+            
+            started.add(idx)
+            if on_start:
+                on_start(idx, title)
+            
+            try:
+                result = await write_article(idx, title)
+            except Exception as e:
+                errors[idx] = e
+                if on_finish:
+                    on_finish(idx, title, None, e)
+                return
+            
+            results[idx] = result
+            if on_finish:
+                on_finish(idx, title, result, None)
+    
+    pairs = zip(indices, titles) if indices is not None else enumerate(titles, 1)
+    tasks = {idx: asyncio.ensure_future(task(idx, title)) for idx, title in pairs}
+    
+    async def watch_stop():
+        # 중단되면 대기 중인 작업 취소 (작성 중인 글은 스트림에서 직접 멈춤)
+        while not stopped():
+            await asyncio.sleep(STOP_POLL_INTERVAL)
+        for idx, pending in tasks.items():
+            if idx not in started:
+                pending.cancel()
+    
+    watcher = asyncio.ensure_future(watch_stop()) if should_stop is not None else None
+    try:
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+    finally:
+        # 바깥에서 취소된 경우에도 남은 작업을 모두 정리
+        for pending in tasks.values():
+            pending.cancel()
+        if watcher is not None:
+            watcher.cancel()
+        await asyncio.gather(*tasks.values(), *([watcher] if watcher else []), return_exceptions=True)
+    
+    return results, errors
+
+
+# 스트리밍 청크를 UI에 반영하는 단위 (글자 수 / 초)
+STREAM_FLUSH_CHARS = 80
+STREAM_FLUSH_INTERVAL = 0.15
+
+
+class StreamBuffer:
+    """
+    스트리밍 청크를 모아서 일정 크기나 시간 간격마다 한 번에 전달하는 버퍼
+    (토큰마다 위젯을 다시 그리지 않도록 묶어서 반영합니다)
+    """
+    
+    def __init__(self, on_flush, flush_chars=STREAM_FLUSH_CHARS, flush_interval=STREAM_FLUSH_INTERVAL):
+        self.on_flush = on_flush
+        self.flush_chars = flush_chars
+        self.flush_interval = flush_interval
+        self.parts = []
+        self.size = 0
+        self.last_flush = time.monotonic()
+    
+    def add(self, text):
+        """청크 추가 (조건을 만족하면 바로 전달)"""
+        self.parts.append(text)
+        self.size += len(text)
+        
+        now = time.monotonic()
+        if self.size >= self.flush_chars or now - self.last_flush >= self.flush_interval:
+            self.flush()
+    
+    def flush(self):
+        """모인 청크를 전달"""
+        if self.parts:
+            self.on_flush("".join(self.parts))
+            self.parts = []
+            self.size = 0
+        self.last_flush = time.monotonic()
+
+
+def _usage_value(usage, name):
+    """usage 객체/dict(Batch API 결과)에서 값 읽기"""
+    if isinstance(usage, dict):
+        return usage.get(name)
+    return getattr(usage, name, None)
+
+
+def cached_prompt_tokens(usage):
+    """입력 토큰 중 프롬프트 캐시가 적용된 토큰 수"""
+    details = _usage_value(usage, "prompt_tokens_details")
+    return (_usage_value(details, "cached_tokens") if details else None) or 0
+
+
+def usage_tokens(usage):
+    """
+    토큰 사용량을 숫자로 꺼냅니다.
+    
+    Returns:
+        tuple: (입력 토큰, 그중 캐시된 입력 토큰, 출력 토큰)
+    """
+    return (
+        _usage_value(usage, "prompt_tokens") or 0,
+        cached_prompt_tokens(usage),
+        _usage_value(usage, "completion_tokens") or 0
+    )
+
+
+def describe_usage(usage):
+    """토큰 사용량 표시 문구 (예: '입력 1500토큰 (캐시 1024, 68%) / 출력 2100토큰')"""
+    prompt_tokens = _usage_value(usage, "prompt_tokens") or 0
+    cached = cached_prompt_tokens(usage)
+    percent = round(cached * 100 / prompt_tokens) if prompt_tokens else 0
+    return (
+        f"입력 {prompt_tokens}토큰 (캐시 {cached}, {percent}%) / "
+        f"출력 {_usage_value(usage, 'completion_tokens') or 0}토큰"
+    )
+
+
+class UsageStats:
+    """여러 요청의 토큰 사용량 합계 (스레드 안전)"""
+    
+    def __init__(self):
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+    
+    def add(self, usage):
+        """요청 하나의 usage를 더함"""
+        prompt_tokens, cached_tokens, completion_tokens = usage_tokens(usage)
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += prompt_tokens
+            self.cached_tokens += cached_tokens
+            self.completion_tokens += completion_tokens
+    
+    def describe(self):
+        """합계 표시 문구"""
+        with self._lock:
+            usage = {
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": self.cached_tokens}
+            }
+            return f"글 {self.requests}개: {describe_usage(usage)}"
+
+
+# 글 작성 요청 전체의 토큰 사용량 (스트리밍/Batch 작성 공용)
+article_usage = UsageStats()
+
+
+def stream_completion(client, should_stop=None, on_chunk=None, on_usage=None, **kwargs):
+    """
+    채팅 완성 요청을 스트리밍으로 받아 텍스트를 이어 붙입니다.
+    
+    Args:
+        client (OpenAI): OpenAI 클라이언트
+        should_stop (callable): 중단 여부를 반환하는 함수 (True면 스트림을 즉시 닫음)
+        on_chunk (callable): on_chunk(text) - 묶음 단위로 도착한 텍스트를 전달받는 함수
+        on_usage (callable): on_usage(usage) - 스트림 끝에서 토큰 사용량(캐시된 입력 토큰 포함)을 받는 함수
+        **kwargs: chat.completions.create에 전달할 인자 (model, messages 등)
+    
+    Returns:
+        tuple: (지금까지 받은 전체 텍스트, 중단 여부)
+    """
+    # 속도 제한/재시도는 스트림을 여는 요청에만 적용
+    # 마지막 청크로 토큰 사용량을 받음 (include_usage)
+    stream = chat_completion(client, stream=True, stream_options={"include_usage": True}, **kwargs)
+    buffer = StreamBuffer(on_chunk) if on_chunk else None
+    parts = []
+    stopped = False
+    usage = None
+    
+    try:
+        for chunk in stream:
+            if should_stop is not None and should_stop():
+                stopped = True
+                break
+            
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+            
+            if not chunk.choices:
+                continue
+            
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                if buffer:
+                    buffer.add(delta)
+    finally:
+        if buffer:
+            buffer.flush()
+        if stopped:
+            # 남은 응답을 기다리지 않고 연결 종료
+            stream.close()
+    
+    if usage is not None:
+        # 스트림을 열 때 추정해 예약한 토큰 중 쓰지 않은 양 반환
+        estimated = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens"))
+        get_limiter(kwargs["model"]).refund_tokens(estimated - usage.total_tokens)
+        if on_usage:
+            on_usage(usage)
+    
+    return "".join(parts), stopped
+
+
+async def astream_completion(client, should_stop=None, on_chunk=None, on_usage=None, **kwargs):
+    """
+    stream_completion의 asyncio 버전 (작업이 취소되면 스트림을 바로 닫고 취소를 전달)
+    
+    Args:
+        client (AsyncOpenAI): 비동기 OpenAI 클라이언트
+    
+    Returns:
+        tuple: (지금까지 받은 전체 텍스트, 중단 여부)
+    """
+    stream = await achat_completion(client, stream=True, stream_options={"include_usage": True}, **kwargs)
+    buffer = StreamBuffer(on_chunk) if on_chunk else None
+    parts = []
+    stopped = False
+    finished = False
+    usage = None
+    
+    try:
+        async for chunk in stream:
+            if should_stop is not None and should_stop():
+                stopped = True
+                break
+            
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+            
+            if not chunk.choices:
+                continue
+            
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                if buffer:
+                    buffer.add(delta)
+        finished = not stopped
+    finally:
+        if buffer:
+            buffer.flush()
+        if not finished:
+            # 중단되거나 취소되면 남은 응답을 기다리지 않고 연결 종료
+            await stream.close()
+    
+    if usage is not None:
+        estimated = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens"))
+        get_limiter(kwargs["model"]).refund_tokens(estimated - usage.total_tokens)
+        if on_usage:
+            on_usage(usage)
+    
+    return "".join(parts), stopped
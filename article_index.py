@@ -0,0 +1,372 @@
+"""
+비슷한 기존 글 찾기 (해시 TF-IDF 임베딩 + 코사인 유사도)
+자료 저장소에 기록된 글의 제목을 벡터로 만들어 두고, 새 글을 작성하기 전에 제목이 비슷한 글이 있는지 확인합니다.
+비슷한 글이 있으면 작성을 건너뛰거나, 기존 글을 참고 자료로 넣어 새로 작성할 수 있습니다. (API 비용 절감)
+
+제목을 정규화한 글자 2-gram과 단어 토큰을 해시로 고정 크기 벡터에 넣고 TF-IDF 가중치를 준 뒤 길이를 1로 맞춥니다.
+모든 글의 벡터를 미리 (칸 × 글) 행렬로 만들어 두고, 검색할 제목에 들어 있는 칸의 행만 골라 곱해
+모든 글과의 유사도를 한 번에 구합니다. (NumPy가 없으면 해시 칸별 역색인으로 같은 값을 계산)
+글이 추가되면(저장소의 글 수/마지막 기록 시각이 바뀌면) 다음 검색 때 새 글만 벡터로 만들어 색인 뒤에 붙이고
+(IDF는 그대로 사용), 마지막으로 색인을 만든 뒤 글 수가 REBUILD_GROWTH보다 많이 늘면 처음부터 다시 만듭니다.
+
+사용 예:
+    python article_index.py "초보 캠핑 준비물 총정리"
+"""
+import os
+import math
+import time
+import hashlib
+import argparse
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from dotenv import load_dotenv
+from corpus_store import get_corpus, KIND_ARTICLE
+from title_dedupe import normalize_title, shingles
+from title_stats import tokenize
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# .env 파일 로드
+load_dotenv()
+
+# 이 값 이상이면 비슷한 글로 판단 (제목 벡터의 코사인 유사도, 0~1)
+SIMILAR_ARTICLE_THRESHOLD = float(os.getenv("SIMILAR_ARTICLE_THRESHOLD", 0.75))
+
+# 비슷한 글이 있을 때 처리 방법
+SIMILAR_WRITE = "write"
+SIMILAR_SKIP = "skip"
+SIMILAR_SEED = "seed"
+SIMILAR_MODES = (SIMILAR_WRITE, SIMILAR_SKIP, SIMILAR_SEED)
+
+SIMILAR_MODE_LABELS = {
+    SIMILAR_WRITE: "새로 작성",
+    SIMILAR_SKIP: "작성 건너뛰기",
+    SIMILAR_SEED: "기존 글 참고해서 작성"
+}
+
+# 기본 처리 방법 (write: 확인하지 않음)
+SIMILAR_ARTICLE_MODE = os.getenv("SIMILAR_ARTICLE_MODE", SIMILAR_WRITE)
+if SIMILAR_ARTICLE_MODE not in SIMILAR_MODES:
+    SIMILAR_ARTICLE_MODE = SIMILAR_WRITE
+
+# 해시 벡터 크기 (제목은 짧아 2048칸이면 충돌이 드묾)
+HASH_DIM = 2048
+
+# 색인을 만든 뒤 글 수가 이 비율보다 많이 늘면 IDF를 다시 계산하도록 처음부터 다시 만듦
+REBUILD_GROWTH = 0.1
+
+# 참고 자료로 넣을 기존 글의 최대 글자 수
+SEED_MAX_CHARS = 3000
+
+
+def title_features(title):
+    """
+    제목의 특징 (정규화한 글자 2-gram + 단어 토큰, 등장 횟수)
+    
+    Returns:
+        Counter: {특징: 횟수}
+    """
+    text = normalize_title(title)
+    features = Counter(text[i:i + 2] for i in range(len(text) - 1)) if len(text) > 1 else Counter(shingles(text))
+    features.update(f"w:{token}" for token in tokenize(title))
+    return features
+
+
+def _feature_slot(feature, dim):
+    """특징이 들어갈 칸과 부호 (부호를 섞어 충돌한 특징끼리 더해져 커지지 않도록 함)"""
+    value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), "little")
+    return value % dim, 1.0 if (value >> 63) & 1 else -1.0
+
+
+@dataclass
+class ArticleMatch:
+    """비슷한 기존 글"""
+    title: str
+    match_title: str
+    keyword: str
+    similarity: float
+    doc_id: int
+    path: str = None
+    content: str = None
+    
+    def describe(self):
+        """한 줄 설명 (예: '제목' ≈ [키워드] '기존 제목' (86%))"""
+        return f"'{self.title}' ≈ [{self.keyword}] '{self.match_title}' ({self.similarity:.0%})"
+    
+    def seed_text(self, max_chars=SEED_MAX_CHARS):
+        """참고 자료로 넣을 기존 글 (너무 길면 앞부분만)"""
+        content = (self.content or "").strip()
+        return content[:max_chars]
+    
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "match_title": self.match_title,
+            "keyword": self.keyword,
+            "similarity": round(self.similarity, 3),
+            "path": self.path
+        }
+
+
+class ArticleIndex:
+    """
+    작성한 글 제목의 임베딩 색인
+    
+    사용 예:
+        index = ArticleIndex(get_corpus())
+        match = index.find_similar("초보 캠핑 준비물 총정리")
+        if match is not None:
+            print(match.describe())
+    """
+    
+    def __init__(self, corpus, threshold=SIMILAR_ARTICLE_THRESHOLD, dim=HASH_DIM):
+        self.corpus = corpus
+        self.threshold = threshold
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._version = None
+        # (글 목록, IDF, 처음 보는 특징의 IDF, 행렬, 역색인) - 바꿀 때 한 번에 교체
+        self._state = ([], {}, 1.0, None, None)
+        # 새 글을 붙일 여유 칸이 있는 행렬 (행렬은 이 중 앞부분)
+        self._buffer = None
+        # 글 번호 → 행, 마지막으로 색인한 글 번호, 처음부터 만들 때의 글 수
+        self._rows = {}
+        self._last_id = 0
+        self._built = 0
+    
+    def __len__(self):
+        return len(self._state[0])
+    
+    def refresh(self):
+        """저장소의 글이 바뀌었으면 새 글을 색인에 추가합니다. (많이 늘었으면 처음부터 다시 만듦)"""
+        version = self.corpus.version(KIND_ARTICLE)
+        if version == self._version:
+            return
+        
+        with self._lock:
+            if version == self._version:
+                return
+            
+            if self._version is None or version[0] < self._version[0]:
+                self.build(self.corpus.articles())
+            else:
+                # 마지막 확인 이후 추가/갱신된 글 (같은 제목으로 다시 작성한 글 포함)
+                changed = self.corpus.articles(after_id=self._last_id, updated_since=self._version[1])
+                added = sum(1 for article in changed if article["id"] not in self._rows)
+                if len(self) + added > self._built * (1 + REBUILD_GROWTH):
+                    self.build(self.corpus.articles())
+                else:
+                    self.add(changed)
+            self._version = version
+    
+    def build(self, articles):
+        """
+        글 목록으로 색인을 처음부터 만듭니다.
+        
+        Args:
+            articles (list): dict(id, keyword, title, path) 리스트 (CorpusStore.articles())
+        """
+        features = [title_features(article["title"]) for article in articles]
+        
+        # 특징별 문서 빈도 → IDF (smooth: 한 번도 나오지 않은 특징이 가장 큼)
+        df = Counter()
+        for counts in features:
+            df.update(counts.keys())
+        total = len(articles)
+        idf = {feature: math.log((1 + total) / (1 + count)) + 1 for feature, count in df.items()}
+        default_idf = math.log(1 + total) + 1
+        
+        self._buffer = None
+        self._rows = {}
+        self._last_id = 0
+        self._built = total
+        self._state = self._extend(([], idf, default_idf, None, None), articles, features)
+    
+    def add(self, articles):
+        """
+        색인에 없는 글만 벡터로 만들어 뒤에 붙입니다. (IDF는 색인을 만들 때의 값 사용)
+        이미 있는 글은 경로 등 정보만 바꿉니다.
+        
+        Args:
+            articles (list): dict(id, keyword, title, path) 리스트 (CorpusStore.articles())
+        """
+        state = self._state
+        new = [article for article in articles if article["id"] not in self._rows]
+        known = [article for article in articles if article["id"] in self._rows]
+        if known:
+            listed = list(state[0])
+            for article in known:
+                listed[self._rows[article["id"]]] = article
+            state = (listed,) + state[1:]
+        self._state = self._extend(state, new, [title_features(article["title"]) for article in new])
+    
+    def _extend(self, state, articles, features):
+        """
+        state 뒤에 글을 붙인 새 state (검색 중인 이전 state의 글/행은 바뀌지 않음)
+        
+        Returns:
+            tuple: (글 목록, IDF, 처음 보는 특징의 IDF, 행렬, 역색인)
+        """
+        listed, idf, default_idf, matrix, postings = state
+        start = len(listed)
+        listed = listed + articles
+        total = len(listed)
+        for row, article in enumerate(articles, start):
+            self._rows[article["id"]] = row
+            self._last_id = max(self._last_id, article["id"])
+        
+        vectors = [self._vector(counts, idf, default_idf) for counts in features]
+        if np is not None:
+            # 칸별로 연속해서 저장 (검색할 때 제목에 들어 있는 칸의 행만 읽음)
+            # 다시 만들 때까지 늘어날 글 수만큼 여유 칸을 두어 글을 붙일 때 행렬 전체를 복사하지 않도록 함
+            if self._buffer is None or total > self._buffer.shape[1]:
+                capacity = max(total, int(self._built * (1 + REBUILD_GROWTH)) + 1, 64)
+                buffer = np.zeros((self.dim, capacity), dtype=np.float32)
+                if self._buffer is not None:
+                    buffer[:, :start] = self._buffer[:, :start]
+                self._buffer = buffer
+            for column, vector in enumerate(vectors, start):
+                for slot, value in vector.items():
+                    self._buffer[slot, column] = value
+            matrix = self._buffer[:, :total]
+        else:
+            # 바뀌는 칸의 목록만 복사해서 추가
+            postings, copied = dict(postings or {}), set()
+            for row, vector in enumerate(vectors, start):
+                for slot, value in vector.items():
+                    if slot not in copied:
+                        postings[slot] = list(postings.get(slot, ()))
+                        copied.add(slot)
+                    postings[slot].append((row, value))
+        return (listed, idf, default_idf, matrix, postings)
+    
+    def _vector(self, counts, idf, default_idf):
+        """특징 횟수 → 길이가 1인 해시 TF-IDF 벡터 ({칸: 값})"""
+        vector = {}
+        for feature, count in counts.items():
+            slot, sign = _feature_slot(feature, self.dim)
+            vector[slot] = vector.get(slot, 0.0) + sign * count * idf.get(feature, default_idf)
+        
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        if not norm:
+            return {}
+        return {slot: value / norm for slot, value in vector.items()}
+    
+    def search(self, title, limit=5):
+        """
+        제목이 비슷한 글을 찾습니다. (기준값과 관계없이 유사도가 큰 순)
+        
+        Args:
+            title (str): 작성할 제목
+            limit (int): 최대 개수
+        
+        Returns:
+            list: (글 dict, 유사도) 튜플 리스트
+        """
+        self.refresh()
+        articles, idf, default_idf, matrix, postings = self._state
+        vector = self._vector(title_features(title), idf, default_idf)
+        if not articles or not vector:
+            return []
+        
+        if matrix is not None:
+            slots = np.fromiter(vector.keys(), dtype=np.intp, count=len(vector))
+            values = np.fromiter(vector.values(), dtype=np.float32, count=len(vector))
+            scores = values @ matrix[slots]
+            if limit < len(scores):
+                top = np.argpartition(-scores, limit)[:limit]
+            else:
+                top = np.arange(len(scores))
+            ranked = sorted(((int(row), float(scores[row])) for row in top), key=lambda item: -item[1])
+        else:
+            scores = {}
+            for slot, value in vector.items():
+                for row, weight in postings.get(slot, ()):
+                    scores[row] = scores.get(row, 0.0) + value * weight
+            ranked = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        
+        return [(articles[row], score) for row, score in ranked if score > 0]
+    
+    def find_similar(self, title):
+        """
+        기준값 이상으로 비슷한 글 하나 (본문 포함)
+        
+        Returns:
+            ArticleMatch: 가장 비슷한 글 (없으면 None)
+        """
+        found = self.search(title, limit=1)
+        if not found or found[0][1] < self.threshold:
+            return None
+        
+        article, similarity = found[0]
+        return ArticleMatch(
+            title=title,
+            match_title=article["title"],
+            keyword=article["keyword"],
+            similarity=min(similarity, 1.0),
+            doc_id=article["id"],
+            path=article["path"],
+            content=self.corpus.body(article["id"])
+        )
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_article_index():
+    """
+    공유 저장소의 글 색인 (저장소를 끄면 None)
+    
+    Returns:
+        ArticleIndex: 색인
+    """
+    global _default_index
+    corpus = get_corpus()
+    if corpus is None:
+        return None
+    if _default_index is None:
+        with _default_index_lock:
+            if _default_index is None:
+                _default_index = ArticleIndex(corpus)
+    return _default_index
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="작성한 글 중 제목이 비슷한 글 찾기")
+    parser.add_argument("title", help="작성할 제목")
+    parser.add_argument("--limit", type=int, default=5, help="최대 개수 (기본값: 5)")
+    args = parser.parse_args()
+    
+    index = get_article_index()
+    if index is None:
+        print("자료 저장소가 꺼져 있습니다. (BLOGWRITER_CORPUS_DISABLED)")
+        return
+    
+    started = time.perf_counter()
+    index.refresh()
+    built = (time.perf_counter() - started) * 1000
+    
+    started = time.perf_counter()
+    found = index.search(args.title, limit=args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    
+    print("=" * 80)
+    print(f"🔎 글 {len(index)}개 중 '{args.title}'와 비슷한 글 (색인 {built:.1f}ms, 검색 {elapsed:.1f}ms"
+          f"{', NumPy' if np is not None else ''})")
+    print("=" * 80)
+    for article, similarity in found:
+        mark = "≈" if similarity >= index.threshold else " "
+        print(f"{mark} {similarity:.0%} [{article['keyword']}] {article['title']}")
+        if article["path"]:
+            print(f"    {article['path']}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
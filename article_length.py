@@ -0,0 +1,140 @@
+"""
+블로그 글 길이 맞추기
+요청한 글자 수 범위로 출력 토큰 한도를 정하고, 작성된 글이 범위를 벗어나면
+전체를 다시 쓰지 않고 부족한 분량만 이어서 쓰거나 덜 중요한 문단만 빼서 맞춥니다.
+"""
+import math
+
+# 한국어 블로그 글의 글자당 토큰 수 (공백/문장부호 포함, 여유를 두고 잡은 값)
+TOKENS_PER_CHAR = 1.2
+
+# 출력 토큰 한도 최솟값
+MIN_OUTPUT_TOKENS = 256
+
+# 모델별 최대 출력 토큰 (이보다 큰 max_tokens를 보내면 요청이 거부됨)
+MODEL_OUTPUT_TOKENS = {
+    "gpt-4o": 16384,
+    "gpt-4o-mini": 16384,
+    "gpt-4-turbo": 4096
+}
+
+# 목록에 없는 모델의 최대 출력 토큰
+DEFAULT_OUTPUT_TOKENS = 4096
+
+# 짧을 때 이어서 쓰기를 시도하는 최대 횟수
+MAX_CONTINUATIONS = 2
+
+# 줄일 문단을 고르는 응답 형식 (삭제해도 되는 문단 번호를 덜 중요한 순서로)
+TRIM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "remove": {
+            "type": "array",
+            "items": {"type": "integer"}
+        }
+    },
+    "required": ["remove"],
+    "additionalProperties": False
+}
+
+TRIM_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "article_trim",
+        "strict": True,
+        "schema": TRIM_SCHEMA
+    }
+}
+
+
+def count_chars(text):
+    """글자 수 (저장 파일의 '글자 수'와 같은 기준, 공백 포함)"""
+    return len(text)
+
+
+def output_token_limit(model):
+    """모델의 최대 출력 토큰 (날짜가 붙은 모델 이름은 가장 길게 일치하는 이름 기준)"""
+    matches = [name for name in MODEL_OUTPUT_TOKENS if model == name or model.startswith(name + "-")]
+    return MODEL_OUTPUT_TOKENS[max(matches, key=len)] if matches else DEFAULT_OUTPUT_TOKENS
+
+
+def max_tokens_for(chars, model):
+    """
+    글자 수만큼 작성하는 데 필요한 출력 토큰 한도 (모델의 최대 출력 토큰을 넘지 않음)
+    
+    Args:
+        chars (int): 작성할 최대 글자 수
+        model (str): 글 작성 모델
+    
+    Returns:
+        int: max_tokens 값
+    """
+    tokens = math.ceil(max(chars, 0) * TOKENS_PER_CHAR)
+    return max(MIN_OUTPUT_TOKENS, min(tokens, output_token_limit(model)))
+
+
+def length_status(text, min_chars, max_chars):
+    """
+    글자 수 범위 확인
+    
+    Returns:
+        str: 'short', 'long', 범위 안이면 None
+    """
+    chars = count_chars(text)
+    if chars < min_chars:
+        return "short"
+    if chars > max_chars:
+        return "long"
+    return None
+
+
+def join_continuation(text, continuation):
+    """이어서 쓴 내용을 본문 뒤에 붙임 (문단 사이 빈 줄 유지)"""
+    continuation = continuation.strip("\n")
+    if not continuation:
+        return text
+    return text.rstrip("\n") + "\n\n" + continuation
+
+
+def split_paragraphs(text):
+    """빈 줄 기준 문단 리스트 (빈 문단 제외)"""
+    return [paragraph.strip("\n") for paragraph in text.split("\n\n") if paragraph.strip()]
+
+
+def number_paragraphs(paragraphs):
+    """줄일 문단을 고르는 프롬프트용 텍스트 ([번호] (글자 수) 문단)"""
+    return "\n\n".join(
+        f"[{i}] ({count_chars(paragraph)}자)\n{paragraph}" for i, paragraph in enumerate(paragraphs, 1)
+    )
+
+
+def remove_paragraphs(paragraphs, order, min_chars, max_chars):
+    """
+    덜 중요한 순서대로 문단을 빼서 최대 글자 수 이하로 줄입니다.
+    빼면 최소 글자 수보다 짧아지는 문단은 건너뜁니다.
+    
+    Args:
+        paragraphs (list): 문단 리스트
+        order (list): 뺄 문단 번호 (1부터, 덜 중요한 순서)
+        min_chars (int): 최소 글자 수
+        max_chars (int): 최대 글자 수
+    
+    Returns:
+        tuple: (줄인 본문, 뺀 문단 수)
+    """
+    removed = set()
+    text = "\n\n".join(paragraphs)
+    
+    for number in order:
+        if count_chars(text) <= max_chars:
+            break
+        if not 1 <= number <= len(paragraphs) or number in removed:
+            continue
+        
+        candidate = "\n\n".join(p for i, p in enumerate(paragraphs, 1) if i != number and i not in removed)
+        if count_chars(candidate) < min_chars:
+            continue
+        removed.add(number)
+        text = candidate
+    
+    return text, len(removed)
@@ -0,0 +1,147 @@
+"""
+백그라운드 asyncio 런타임
+Tk 메인 루프나 Streamlit 스크립트 스레드를 막지 않도록 별도 스레드 하나에서 이벤트 루프를 계속 실행하고,
+화면 쪽에서는 코루틴을 제출해 concurrent.futures.Future로 결과를 받습니다.
+
+작업마다 스레드를 만들지 않으므로 글 작성 요청이 많아져도 스레드 수가 늘어나지 않고,
+Future를 취소하면 이벤트 루프 안의 작업(Task)이 취소되어 진행 중인 스트림이 바로 닫힙니다.
+"""
+import asyncio
+import threading
+
+
+class AsyncRuntime:
+    """
+    백그라운드 스레드에서 실행되는 이벤트 루프
+    
+    사용 예:
+        runtime = get_runtime()
+        future = runtime.submit(pipeline.arun_titles("캠핑"))
+        future.add_done_callback(on_done)   # 다른 스레드에서 호출되므로 화면 갱신은 UIDispatcher로
+        future.cancel()                     # 진행 중인 요청 취소
+    """
+    
+    def __init__(self, name="async-runtime"):
+        self.name = name
+        self.loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._futures = set()
+    
+    def start(self):
+        """이벤트 루프 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            
+            self.loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            
+            def run():
+                asyncio.set_event_loop(self.loop)
+                self.loop.call_soon(ready.set)
+                self.loop.run_forever()
+            
+            self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+    
+    def in_loop_thread(self):
+        """현재 스레드가 이벤트 루프 스레드인지 여부"""
+        return self._thread is not None and threading.current_thread() is self._thread
+    
+    def submit(self, coro):
+        """
+        코루틴을 이벤트 루프에 제출합니다. (어느 스레드에서나 호출 가능)
+        
+        Args:
+            coro: 실행할 코루틴
+        
+        Returns:
+            concurrent.futures.Future: 결과 Future (cancel()하면 작업 취소)
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._discard)
+        return future
+    
+    def _discard(self, future):
+        with self._lock:
+            self._futures.discard(future)
+    
+    def run(self, coro, timeout=None):
+        """
+        코루틴을 제출하고 끝날 때까지 기다려 결과를 반환합니다.
+        
+        Raises:
+            RuntimeError: 이벤트 루프 스레드에서 호출했을 때 (교착 방지)
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("이벤트 루프 스레드에서는 run()을 호출할 수 없습니다. await를 사용하세요.")
+        return self.submit(coro).result(timeout)
+    
+    def call_soon(self, fn, *args):
+        """이벤트 루프 스레드에서 fn(*args)를 실행 (어느 스레드에서나 호출 가능)"""
+        self.start()
+        self.loop.call_soon_threadsafe(fn, *args)
+    
+    def cancel_all(self):
+        """제출한 작업을 모두 취소"""
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+    
+    async def _drain(self, timeout):
+        """루프 안의 작업을 모두 취소하고 finally 블록까지 끝날 때까지 기다림 (최대 timeout초)"""
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        try:
+            await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout)
+        except asyncio.TimeoutError:
+            pass
+        await self.loop.shutdown_asyncgens()
+    
+    def shutdown(self, timeout=5):
+        """작업을 모두 취소하고 정리가 끝나면 이벤트 루프 스레드를 종료"""
+        with self._lock:
+            thread = self._thread
+        if thread is None:
+            return
+        
+        # 루프 안에서 작업을 취소하고 정리(스트림 닫기, 일부 저장)가 끝난 뒤에 루프를 멈춤
+        # (cancel_all을 먼저 호출하면 정리 중인 작업이 한 번 더 취소되므로 여기서만 취소)
+        if thread.is_alive() and not self.in_loop_thread():
+            drain = asyncio.run_coroutine_threadsafe(self._drain(timeout), self.loop)
+            try:
+                drain.result(timeout + 1)
+            except Exception:
+                # 정리가 늦어지거나 실패해도 종료는 계속 진행
+                self.cancel_all()
+        else:
+            self.cancel_all()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        thread.join(timeout)
+        with self._lock:
+            self._thread = None
+            if not thread.is_alive():
+                self.loop.close()
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime():
+    """프로그램 전체에서 공유하는 런타임 (처음 호출 시 생성, 이벤트 루프는 제출할 때 시작)"""
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = AsyncRuntime()
+    return _runtime
@@ -0,0 +1,346 @@
+"""
+OpenAI Batch API 블로그 글 작성
+선택한 모든 제목의 글 작성 요청을 JSONL 파일 하나로 묶어 한 번에 제출하고,
+완료될 때까지 상태를 확인한 뒤 결과를 제목별 .txt 파일로 나누어 저장합니다.
+
+즉시 응답이 필요 없는 대량 작업(밤새 실행 등)에서 비용을 줄이고 처리량을 높입니다.
+제출한 작업 ID는 작업 기록(_job_manifest.json)에 저장되므로 중간에 종료해도 이어서 결과를 받아올 수 있습니다.
+OPEN_AI_BASE_URL을 로컬 테스트 서버(batch_test_server.py)로 지정하면 API 비용 없이 시험할 수 있습니다.
+"""
+import os
+import json
+import time
+from job_manifest import STATUS_DONE, STATUS_FAILED
+from article_engine import article_usage
+from cost_ledger import estimate_cost
+from rate_limit import get_limiter, call_with_retry
+from pipeline import PipelineError, article_request, clean_article, save_article
+
+# Batch API 설정
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+
+# 작업 하나에 넣을 수 있는 최대 요청 수
+MAX_BATCH_REQUESTS = 50000
+
+# 상태 확인 간격 (초)
+POLL_INTERVAL = float(os.getenv("OPEN_AI_BATCH_POLL_INTERVAL", 30))
+
+# 제출용 JSONL 파일 이름
+BATCH_INPUT_FILE = "_batch_input.jsonl"
+
+# 더 이상 바뀌지 않는 작업 상태
+FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+# 상태 표시 문구
+STATUS_LABELS = {
+    "validating": "입력 파일 확인 중",
+    "in_progress": "작성 중",
+    "finalizing": "결과 정리 중",
+    "completed": "완료",
+    "failed": "실패",
+    "expired": "시간 초과",
+    "cancelling": "취소 중",
+    "cancelled": "취소됨"
+}
+
+
+def make_custom_id(job_no, idx):
+    """요청 ID (작업 번호-글 번호)"""
+    return f"{job_no}-{idx}"
+
+
+def build_batch_requests(jobs):
+    """
+    작업 기록들의 남은 글을 Batch API 요청 목록으로 만듭니다.
+    
+    Args:
+        jobs (list): (작업 번호, JobManifest) 리스트 (여러 키워드를 한 번에 제출 가능)
+    
+    Returns:
+        tuple: (요청 리스트, {custom_id: (manifest, idx, title)})
+    """
+    requests = []
+    targets = {}
+    
+    for job_no, manifest in jobs:
+        for idx, title in manifest.remaining():
+            custom_id = make_custom_id(job_no, idx)
+            requests.append({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": article_request(
+                    manifest.keyword, title, manifest.model, manifest.min_chars, manifest.max_chars
+                )
+            })
+            targets[custom_id] = (manifest, idx, title)
+    
+    return requests, targets
+
+
+def write_batch_file(path, requests):
+    """요청 목록을 JSONL 파일로 저장"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for request in requests:
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+
+def submit_batch(client, path, metadata=None):
+    """
+    JSONL 파일을 업로드하고 Batch 작업을 만듭니다.
+    
+    Returns:
+        Batch: 생성된 작업
+    """
+    limiter = get_limiter("batch")
+    
+    def upload():
+        with open(path, 'rb') as f:
+            return client.files.create(file=f, purpose="batch")
+    
+    input_file = call_with_retry(upload, limiter)
+    return call_with_retry(
+        lambda: client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW,
+            metadata=metadata
+        ),
+        limiter
+    )
+
+
+def describe_batch(batch):
+    """작업 상태 표시 문구 (예: '⏳ Batch 작성 중: 120/1000개 완료')"""
+    label = STATUS_LABELS.get(batch.status, batch.status)
+    counts = getattr(batch, "request_counts", None)
+    if counts and counts.total:
+        message = f"Batch {label}: {counts.completed}/{counts.total}개 완료"
+        if counts.failed:
+            message += f", {counts.failed}개 실패"
+    else:
+        message = f"Batch {label}"
+    return ("✅ " if batch.status == "completed" else "⏳ ") + message
+
+
+def wait_for_batch(client, batch_id, poll_interval=POLL_INTERVAL, should_stop=None, on_progress=None):
+    """
+    작업이 끝날 때까지 상태를 확인합니다.
+    
+    Args:
+        client (OpenAI): OpenAI 클라이언트
+        batch_id (str): 작업 ID
+        poll_interval (float): 상태 확인 간격 (초)
+        should_stop (callable): 기다리기를 중단할지 반환하는 함수 (작업은 서버에서 계속 진행)
+        on_progress (callable): on_progress(batch) - 상태를 확인할 때마다 호출
+    
+    Returns:
+        tuple: (마지막으로 확인한 작업, 중단 여부)
+    """
+    limiter = get_limiter("batch")
+    
+    while True:
+        batch = call_with_retry(lambda: client.batches.retrieve(batch_id), limiter)
+        if on_progress:
+            on_progress(batch)
+        
+        if batch.status in FINAL_STATUSES:
+            return batch, False
+        
+        # 중단 요청에 바로 반응하도록 짧게 나누어 대기
+        deadline = time.monotonic() + poll_interval
+        while time.monotonic() < deadline:
+            if should_stop is not None and should_stop():
+                return batch, True
+            time.sleep(min(0.5, poll_interval))
+
+
+def read_result_lines(client, file_id):
+    """결과/오류 파일의 JSONL 줄을 읽습니다."""
+    if not file_id:
+        return []
+    
+    content = call_with_retry(lambda: client.files.content(file_id), get_limiter("batch"))
+    return [json.loads(line) for line in content.text.splitlines() if line.strip()]
+
+
+def parse_batch_results(client, batch):
+    """
+    작업의 결과 파일과 오류 파일을 읽어 요청별 결과로 나눕니다.
+    
+    Returns:
+        dict: {custom_id: (본문, 오류 메시지, 토큰 사용량 dict)} - 성공이면 오류 메시지가 None
+    """
+    results = {}
+    lines = read_result_lines(client, getattr(batch, "output_file_id", None))
+    lines += read_result_lines(client, getattr(batch, "error_file_id", None))
+    
+    for line in lines:
+        response = line.get("response") or {}
+        body = response.get("body") or {}
+        
+        if line.get("error"):
+            error = line["error"].get("message") or str(line["error"])
+            results[line["custom_id"]] = (None, error, None)
+        elif response.get("status_code") != 200:
+            error = (body.get("error") or {}).get("message") or f"HTTP {response.get('status_code')}"
+            results[line["custom_id"]] = (None, error, None)
+        else:
+            results[line["custom_id"]] = (body["choices"][0]["message"]["content"], None, body.get("usage"))
+    
+    return results
+
+
+def run_batch_writing(pipeline, manifests, work_dir, poll_interval=POLL_INTERVAL,
+                      should_stop=None, on_progress=None, on_finish=None):
+    """
+    작업 기록들의 남은 글을 Batch API로 한 번에 작성하여 저장합니다.
+    
+    이미 제출한 작업이 작업 기록에 있으면 다시 제출하지 않고 작업별로 결과를 기다리고,
+    작업이 없는 작업 기록의 남은 글만 새 작업 하나로 제출합니다.
+    
+    Args:
+        pipeline (BlogPipeline): OpenAI 클라이언트와 after_article 훅을 제공하는 파이프라인
+        manifests (list): JobManifest 리스트
+        work_dir (str): 제출용 JSONL 파일을 저장할 폴더
+        poll_interval (float): 상태 확인 간격 (초)
+        should_stop (callable): 기다리기를 중단할지 반환하는 함수
+        on_progress (callable): on_progress(batch) - 상태를 확인할 때마다 호출
+        on_finish (callable): on_finish(manifest, idx, title, file_name, error) - 글 하나를 처리할 때마다 호출
+    
+    Returns:
+        dict: batch_id(마지막으로 기다린 작업), batch_ids, status, completed, failed, stopped
+    
+    Raises:
+        PipelineError: 요청 수가 한도를 넘거나 작업 자체가 실패했을 때
+        BudgetExceeded: 새로 제출할 작업의 예상 비용이 예산을 넘을 때
+    """
+    manifests = [manifest for manifest in manifests if manifest.remaining()]
+    summary = {"batch_id": None, "batch_ids": [], "status": None, "completed": 0, "failed": 0, "stopped": False}
+    if not manifests:
+        return summary
+    
+    client = pipeline.client
+    
+    # 이미 제출한 작업별로 묶고, 작업이 없는 작업 기록만 새로 제출
+    groups = {}
+    new_manifests = []
+    for manifest in manifests:
+        if manifest.batch_id is not None:
+            groups.setdefault(manifest.batch_id, []).append(manifest)
+        else:
+            new_manifests.append(manifest)
+    
+    estimates = {}
+    if new_manifests:
+        batch_id, estimates[batch_id] = submit_manifests(pipeline, client, new_manifests, work_dir)
+        groups[batch_id] = new_manifests
+    
+    failures = []
+    try:
+        for batch_id, group in groups.items():
+            summary["batch_id"] = batch_id
+            summary["batch_ids"].append(batch_id)
+            try:
+                batch, stopped = wait_for_batch(client, batch_id, poll_interval, should_stop, on_progress)
+            finally:
+                pipeline.meter.release(estimates.pop(batch_id, 0.0))
+            
+            # 완료되지 않은 작업의 상태를 우선 표시
+            if summary["status"] in (None, "completed"):
+                summary["status"] = batch.status
+            if stopped:
+                summary["stopped"] = True
+                return summary
+            
+            completed = collect_batch_results(pipeline, client, batch, group, summary, on_finish)
+            if batch.status == "failed" and not completed:
+                errors = getattr(getattr(batch, "errors", None), "data", None) or []
+                failures.append("\n".join(getattr(error, "message", str(error)) for error in errors))
+    finally:
+        # 기다리기를 중단해 확인하지 못한 작업의 예약도 해제
+        for estimate in estimates.values():
+            pipeline.meter.release(estimate)
+    
+    if failures:
+        detail = "\n".join(failure for failure in failures if failure)
+        raise PipelineError(f"Batch 작업이 실패했습니다.\n{detail}".strip(), status="❌ Batch 작업 실패")
+    
+    return summary
+
+
+def submit_manifests(pipeline, client, manifests, work_dir):
+    """
+    작업 기록들의 남은 글을 새 Batch 작업 하나로 제출하고 작업 기록에 작업 ID를 남깁니다.
+    제출 전에 작업 전체의 최대 예상 비용으로 예산을 확인하며, 예약한 비용은 결과를 받을 때까지 유지합니다.
+    
+    Returns:
+        tuple: (작업 ID, 예약한 예상 비용)
+    """
+    requests, _ = build_batch_requests(list(enumerate(manifests, 1)))
+    if len(requests) > MAX_BATCH_REQUESTS:
+        raise PipelineError(
+            f"Batch 작업 하나에 최대 {MAX_BATCH_REQUESTS}개까지 요청할 수 있습니다. (요청: {len(requests)}개)",
+            status="❌ Batch 요청 수 초과"
+        )
+    
+    estimate = sum(
+        estimate_cost(request["body"]["model"], request["body"]["messages"], request["body"]["max_tokens"], batch=True)
+        for request in requests
+    )
+    pipeline.check_budget(estimate)
+    
+    try:
+        input_path = os.path.join(work_dir, BATCH_INPUT_FILE)
+        write_batch_file(input_path, requests)
+        batch = submit_batch(client, input_path, metadata={"keywords": ", ".join(m.keyword for m in manifests)[:500]})
+    except Exception:
+        pipeline.meter.release(estimate)
+        raise
+    
+    for job_no, manifest in enumerate(manifests, 1):
+        manifest.set_batch(batch.id, job_no)
+    return batch.id, estimate
+
+
+def collect_batch_results(pipeline, client, batch, manifests, summary, on_finish=None):
+    """
+    끝난 작업의 결과를 제목별 파일로 저장하고 작업 기록을 갱신합니다.
+    (결과가 없는 요청은 대기 상태로 남아 다음에 다시 제출)
+    
+    Returns:
+        int: 이 작업에서 저장한 글 수
+    """
+    _, targets = build_batch_requests([(manifest.batch_job, manifest) for manifest in manifests])
+    completed = 0
+    
+    for custom_id, (content, error, usage) in parse_batch_results(client, batch).items():
+        target = targets.get(custom_id)
+        if target is None:
+            continue
+        manifest, idx, title = target
+        
+        file_name = None
+        if error is None:
+            content = clean_article(content)
+            file_name = save_article(manifest.save_dir, idx, title, manifest.keyword, content)
+            manifest.update(idx, STATUS_DONE, output=file_name)
+            if usage:
+                article_usage.add(usage)
+                pipeline.meter.record("article", manifest.model, usage, keyword=manifest.keyword, title=title, batch=True)
+            pipeline.emit(
+                "after_article", keyword=manifest.keyword, title=title, content=content, stopped=False, usage=usage
+            )
+            completed += 1
+        else:
+            manifest.update(idx, STATUS_FAILED, error=error)
+            summary["failed"] += 1
+        
+        if on_finish:
+            on_finish(manifest, idx, title, file_name, error)
+    
+    summary["completed"] += completed
+    for manifest in manifests:
+        manifest.set_batch(None)
+    return completed
@@ -0,0 +1,641 @@
+"""
+헤드리스 배치 모드
+키워드 목록(txt/csv/jsonl)을 읽어 검색 → 분석 → 제목 생성 → 글 작성 전체 과정을
+GUI 없이 여러 키워드에 대해 동시에 실행합니다.
+
+사용 예:
+    python batch_cli.py keywords.txt -o output --keyword-workers 4 --openai-concurrency 8
+"""
+import os
+import csv
+import sys
+import json
+import queue
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from pipeline import (
+    BlogPipeline,
+    PipelineError,
+    BudgetExceeded,
+    sanitize_filename,
+    save_article
+)
+from article_engine import run_article_pool, article_usage, describe_usage
+from batch_api import run_batch_writing, describe_batch, POLL_INTERVAL
+from cost_ledger import UsageMeter, BUDGET_USD
+from keyword_expansion import EXPANSION_MAX_KEYWORDS
+from corpus_store import REUSE_ANALYSIS_DAYS
+from article_index import SIMILAR_ARTICLE_MODE, SIMILAR_MODES, SIMILAR_WRITE, SIMILAR_SKIP
+from job_manifest import (
+    JobManifest,
+    STATUS_DONE,
+    STATUS_PARTIAL,
+    STATUS_FAILED,
+    STATUS_SKIPPED
+)
+
+# .env 파일 로드
+load_dotenv()
+
+_print_lock = threading.Lock()
+
+
+def log(keyword, message):
+    """키워드별 진행 상황 출력 (여러 스레드의 출력이 섞이지 않도록 잠금)"""
+    with _print_lock:
+        print(f"[{keyword}] {message}", flush=True)
+
+
+def load_keywords(path):
+    """
+    키워드 목록 파일을 읽습니다.
+    
+    - .txt: 한 줄에 키워드 하나 (#으로 시작하는 줄은 무시)
+    - .csv: 'keyword' 열 (없으면 첫 번째 열)
+    - .jsonl: 한 줄에 {"keyword": "..."} 또는 "..."
+    
+    Args:
+        path (str): 키워드 목록 파일 경로
+    
+    Returns:
+        list: 중복을 제거한 키워드 리스트 (입력 순서 유지)
+    """
+    ext = os.path.splitext(path)[1].lower()
+    keywords = []
+    
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        if ext == '.csv':
+            rows = list(csv.reader(f))
+            if rows:
+                header = [cell.strip().lower() for cell in rows[0]]
+                if 'keyword' in header:
+                    col = header.index('keyword')
+                    rows = rows[1:]
+                else:
+                    col = 0
+                keywords = [row[col] for row in rows if len(row) > col]
+        elif ext == '.jsonl':
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                data = json.loads(line)
+                keywords.append(data['keyword'] if isinstance(data, dict) else str(data))
+        else:
+            keywords = [line for line in f if not line.lstrip().startswith('#')]
+    
+    keywords = [keyword.strip() for keyword in keywords if keyword.strip()]
+    return list(dict.fromkeys(keywords))
+
+
+class BatchRunner:
+    """여러 키워드의 전체 파이프라인을 동시에 실행"""
+    
+    def __init__(self, args):
+        self.args = args
+        # 전체 키워드에 걸친 동시 요청 수 제한
+        self.naver_slots = threading.BoundedSemaphore(args.naver_concurrency)
+        self.openai_slots = threading.BoundedSemaphore(args.openai_concurrency)
+        self.stop_event = threading.Event()
+        # 이번 실행 전체의 토큰/비용 기록과 예산
+        self.meter = UsageMeter(budget_usd=args.budget)
+        # 다음 키워드 검색을 미리 시작하기 위한 상태 (키워드 순서, 시작한 키워드, 미리 시작한 검색)
+        self.keywords = []
+        self.started = set()
+        self.prefetched = {}
+        self.prefetch_lock = threading.Lock()
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+    
+    def create_pipeline(self, keyword):
+        """키워드별 파이프라인 생성 (동시 요청 제한과 예산은 모든 키워드가 공유)"""
+        pipeline = BlogPipeline(
+            on_progress=lambda stage, message, progress: log(keyword, message),
+            naver_slots=self.naver_slots,
+            openai_slots=self.openai_slots,
+            meter=self.meter,
+            reuse_analysis_days=self.args.reuse_analysis
+        )
+        pipeline.add_hook("after_article", self.log_usage)
+        return pipeline
+    
+    def log_usage(self, keyword, title, content, stopped, usage):
+        """글마다 토큰 사용량 출력 (입력 토큰 중 프롬프트 캐시가 적용된 양 포함)"""
+        if usage is not None:
+            log(keyword, f"📊 {title[:30]}: {describe_usage(usage)}")
+    
+    def write_article(self, pipeline, manifest, title, idx, articles_dir, partial, skipped):
+        """블로그 글 하나를 작성하여 저장 (작업 기록의 모델/글자 수 사용, --similar-articles에 따라 비슷한 기존 글 확인)"""
+        match = None
+        if self.args.similar_articles != SIMILAR_WRITE:
+            match = pipeline.find_similar_article(title)
+        if match is not None and self.args.similar_articles == SIMILAR_SKIP:
+            skipped[idx] = match
+            return None
+        
+        try:
+            blog_content, stopped = pipeline.write_article(
+                manifest.keyword,
+                title,
+                model=manifest.model,
+                min_chars=manifest.min_chars,
+                max_chars=manifest.max_chars,
+                should_stop=self.stop_event.is_set,
+                reference=match.seed_text() if match is not None else None
+            )
+        except BudgetExceeded:
+            # 예산을 넘으면 모든 키워드의 새 요청을 중단
+            self.stop_on_budget()
+            raise
+        
+        if stopped and not blog_content.strip():
+            return None
+        
+        if stopped:
+            partial.add(idx)
+        return save_article(articles_dir, idx, title, manifest.keyword, blog_content, partial=stopped)
+    
+    def keyword_dirs(self, keyword):
+        """키워드별 결과 폴더와 글 저장 폴더 (없으면 생성)"""
+        keyword_dir = os.path.join(self.args.output, sanitize_filename(keyword))
+        articles_dir = os.path.join(keyword_dir, "articles")
+        os.makedirs(articles_dir, exist_ok=True)
+        return keyword_dir, articles_dir
+    
+    def resume_manifest(self, keyword, articles_dir):
+        """--resume이고 이전 작업 기록이 있으면 불러옴 (없으면 None)"""
+        manifest = JobManifest.load(articles_dir) if self.args.resume else None
+        if manifest is not None:
+            log(keyword, f"🔁 이전 작업 이어서 작성 (완료 {manifest.count(STATUS_DONE)}/{len(manifest.items)}개)")
+        return manifest
+    
+    def save_analysis(self, keyword_dir, search_results, analysis):
+        """검색 결과(제목/링크/요약/블로거/작성일)와 분석 결과 저장"""
+        with open(os.path.join(keyword_dir, "search_results.json"), 'w', encoding='utf-8') as f:
+            json.dump(search_results, f, ensure_ascii=False, indent=2)
+        
+        with open(os.path.join(keyword_dir, "analysis.json"), 'w', encoding='utf-8') as f:
+            json.dump(analysis, f, ensure_ascii=False, indent=2)
+    
+    def save_keyword_graph(self, keyword, keyword_dir, graph):
+        """연관 키워드 그래프 저장 (확장하지 않았으면 저장하지 않음)"""
+        if not graph:
+            return
+        
+        log(keyword, f"🌐 연관 키워드 {len(graph['nodes']) - 1}개 (keyword_graph.json)")
+        with open(os.path.join(keyword_dir, "keyword_graph.json"), 'w', encoding='utf-8') as f:
+            json.dump(graph, f, ensure_ascii=False, indent=2)
+    
+    def save_duplicates(self, keyword, keyword_dir, duplicates):
+        """비슷해서 걸러낸 제목 저장 (없으면 저장하지 않음)"""
+        if not duplicates:
+            return
+        
+        log(keyword, f"♻️ 기존 제목과 비슷한 제목 {len(duplicates)}개 제외 (duplicates.json)")
+        with open(os.path.join(keyword_dir, "duplicates.json"), 'w', encoding='utf-8') as f:
+            json.dump(duplicates, f, ensure_ascii=False, indent=2)
+    
+    def prepare_keyword(self, keyword):
+        """
+        1~3단계: 검색 → 분석 → 제목 생성 후 작업 기록 생성
+        (--resume이고 이전 작업 기록이 있으면 그대로 불러옴)
+        
+        Returns:
+            JobManifest: 키워드의 작업 기록
+        
+        Raises:
+            PipelineError: 검색 결과가 없을 때
+        """
+        args = self.args
+        keyword_dir, articles_dir = self.keyword_dirs(keyword)
+        
+        # 이전 작업 기록이 있으면 제목 생성은 건너뛰고 남은 글만 작성
+        manifest = self.resume_manifest(keyword, articles_dir)
+        if manifest is not None:
+            return manifest
+        
+        results = self.create_pipeline(keyword).run_titles(
+            keyword, args.num_search, args.num_generate, replace_duplicates=args.replace_duplicates,
+            expand_depth=args.expand_depth, expand_keywords=args.expand_keywords
+        )
+        self.save_analysis(keyword_dir, results["search_results"], results["analysis"])
+        self.save_keyword_graph(keyword, keyword_dir, results["keyword_graph"])
+        self.save_duplicates(keyword, keyword_dir, results["duplicates"])
+        
+        with open(os.path.join(keyword_dir, "generated_titles.txt"), 'w', encoding='utf-8') as f:
+            f.write(results["generated_titles"])
+        
+        titles = results["titles"]
+        if args.articles is not None:
+            titles = titles[:args.articles]
+        
+        return JobManifest.create(
+            articles_dir, titles, keyword, args.model, args.min_chars, args.max_chars
+        )
+    
+    def search(self, pipeline, keyword):
+        """
+        1단계: 검색 (미리 시작한 검색이 있으면 그 결과를 사용)
+        검색이 끝나면 아직 시작하지 않은 다음 키워드의 검색을 미리 시작하여
+        이 키워드를 분석/작성하는 동안 다음 키워드의 검색이 끝나 있도록 합니다.
+        
+        Returns:
+            list: SearchResult 리스트
+        """
+        with self.prefetch_lock:
+            self.started.add(keyword)
+            future = self.prefetched.pop(keyword, None)
+        
+        if future is None:
+            search_results = pipeline.search_results(keyword, self.args.num_search)
+        else:
+            search_results = future.result()
+        
+        self.prefetch_next()
+        return search_results
+    
+    def prefetch_next(self):
+        """아직 시작하지 않은 다음 키워드 하나의 검색을 미리 시작"""
+        if self.stop_event.is_set():
+            return
+        
+        with self.prefetch_lock:
+            keyword = next((keyword for keyword in self.keywords if keyword not in self.started), None)
+            if keyword is None:
+                return
+            self.started.add(keyword)
+            pipeline = self.create_pipeline(keyword)
+            self.prefetched[keyword] = self.prefetch_executor.submit(
+                pipeline.search_results, keyword, self.args.num_search
+            )
+    
+    def run_pipelined(self, keyword, keyword_dir, articles_dir):
+        """
+        1~4단계를 겹쳐서 실행합니다.
+        제목 생성 응답을 스트리밍으로 받아 제목 한 줄이 완성될 때마다 작업 기록에 추가하고
+        바로 글 작성 대기열에 넣으므로, 마지막 제목이 나오기 전에 첫 글 작성이 시작됩니다.
+        앞서 나온 제목이나 검색 결과와 비슷한 제목은 대기열에 넣지 않습니다.
+        
+        Returns:
+            JobManifest: 키워드의 작업 기록
+        
+        Raises:
+            PipelineError: 검색 결과가 없을 때
+        """
+        args = self.args
+        pipeline = self.create_pipeline(keyword)
+        
+        log(keyword, "🔍 네이버 블로그 검색 중...")
+        search_results = self.search(pipeline, keyword)
+        blog_titles = [result.title for result in search_results]
+        log(keyword, f"✅ {len(blog_titles)}개 블로그 제목 수집 완료")
+        
+        graph = None
+        if args.expand_depth > 0:
+            log(keyword, "🌐 연관 키워드 확장 중...")
+            graph = pipeline.expand_keywords(keyword, args.expand_depth, args.expand_keywords)
+            self.save_keyword_graph(keyword, keyword_dir, graph.to_dict())
+        
+        log(keyword, "🤖 ChatGPT로 제목 분석 중...")
+        analysis = pipeline.analyze(keyword, blog_titles, graph=graph)
+        self.save_analysis(keyword_dir, [result.to_dict() for result in search_results], analysis.to_dict())
+        
+        limit = args.num_generate if args.articles is None else min(args.articles, args.num_generate)
+        manifest = JobManifest.create(articles_dir, [], keyword, args.model, args.min_chars, args.max_chars)
+        index = pipeline.title_index(blog_titles)
+        duplicates = []
+        arrived = queue.Queue()
+        outcome = {}
+        
+        def on_title(title):
+            # 스트리밍 중에는 이벤트 루프에서, 그 뒤 대체 제목은 생성 스레드에서 차례로 호출되므로 번호는 추가한 순서대로 1번부터
+            if len(manifest.items) >= limit:
+                return
+            duplicate = index.check(title)
+            if duplicate is not None:
+                duplicates.append(duplicate)
+                return
+            index.add(title)
+            manifest.add(title)
+            arrived.put(title)
+        
+        def generate():
+            try:
+                outcome["text"] = pipeline.generate_titles(
+                    keyword, blog_titles, analysis, args.num_generate, on_title=on_title
+                )
+                # 걸러낸 만큼 한 번 더 생성해 같은 대기열로 이어서 작성
+                missing = limit - len(manifest.items)
+                if args.replace_duplicates and duplicates and missing > 0 and not self.stop_event.is_set():
+                    kept = [item["title"] for item in manifest.items]
+                    rejected = [duplicate.title for duplicate in duplicates]
+                    for title in pipeline.replace_titles(keyword, analysis, kept, rejected, missing):
+                        on_title(title)
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                arrived.put(None)
+        
+        def titles():
+            while True:
+                title = arrived.get()
+                if title is None:
+                    return
+                yield title
+        
+        log(keyword, f"✨ 새로운 제목 {args.num_generate}개 생성 중... (생성되는 대로 글 작성 시작)")
+        producer = threading.Thread(target=generate, name="titles", daemon=True)
+        producer.start()
+        self.write_articles(keyword, manifest, titles(), total=limit)
+        producer.join()
+        
+        if "error" in outcome:
+            raise outcome["error"]
+        
+        self.save_duplicates(keyword, keyword_dir, [duplicate.to_dict() for duplicate in duplicates])
+        with open(os.path.join(keyword_dir, "generated_titles.txt"), 'w', encoding='utf-8') as f:
+            f.write(outcome["text"])
+        return manifest
+    
+    def write_articles(self, keyword, manifest, titles=None, total=None):
+        """
+        4단계: 작업 기록의 남은 글을 동시에 작성
+        (titles에 제너레이터를 넘기면 남은 글 대신 제목이 생성되는 대로 1번부터 작성)
+        """
+        pipeline = self.create_pipeline(keyword)
+        partial = set()
+        skipped = {}
+        
+        if titles is None:
+            remaining = manifest.remaining()
+            titles = [title for _, title in remaining]
+            indices = [idx for idx, _ in remaining]
+            log(keyword, f"✍️ 블로그 글 {len(remaining)}개 작성 중...")
+        else:
+            indices = None
+        total = total or len(manifest.items)
+        
+        def on_finish(idx, title, file_name, error):
+            if idx in skipped:
+                match = skipped[idx]
+                manifest.update(idx, STATUS_SKIPPED, output=match.path or match.match_title)
+                log(keyword, f"⏭️ [{idx}/{total}] 비슷한 글이 있어 건너뜀: {match.describe()}")
+            elif error is not None:
+                manifest.update(idx, STATUS_FAILED, error=str(error))
+                log(keyword, f"❌ [{idx}/{total}] 작성 실패: {title} ({error})")
+            elif file_name is None:
+                log(keyword, f"⛔ [{idx}/{total}] 작성 중단: {title}")
+            elif idx in partial:
+                manifest.update(idx, STATUS_PARTIAL, output=file_name)
+                log(keyword, f"⛔ [{idx}/{total}] 일부 저장: {file_name}")
+            else:
+                manifest.update(idx, STATUS_DONE, output=file_name)
+                log(keyword, f"✅ [{idx}/{total}] 저장 완료: {file_name}")
+        
+        run_article_pool(
+            titles,
+            lambda idx, title: self.write_article(pipeline, manifest, title, idx, manifest.save_dir, partial, skipped),
+            max_workers=self.args.article_workers,
+            should_stop=self.stop_event.is_set,
+            on_finish=on_finish,
+            indices=indices
+        )
+    
+    def summarize(self, keyword, manifest):
+        """
+        이번 실행분과 이전 실행분을 합쳐 작업 기록 기준으로 요약하고 result.json에 저장
+        
+        Returns:
+            dict: 키워드별 결과 요약
+        """
+        items = manifest.items
+        done = {str(item["idx"]): item["output"] for item in items if item["status"] == STATUS_DONE}
+        failed = {str(item["idx"]): item["error"] for item in items if item["status"] == STATUS_FAILED}
+        skipped = {str(item["idx"]): item["output"] for item in items if item["status"] == STATUS_SKIPPED}
+        summary = {
+            "keyword": keyword,
+            "status": "done" if len(done) + len(skipped) == len(items) else "partial",
+            "generated_titles": [item["title"] for item in items],
+            "articles": done,
+            "failed": failed,
+            "skipped": skipped,
+            "remaining": len(manifest.remaining())
+        }
+        if manifest.batch_id:
+            summary["batch_id"] = manifest.batch_id
+        
+        # 이번 실행에서 이 키워드에 쓴 비용 (USD)
+        costs = {row["name"]: row["cost"] for row in self.meter.ledger.summarize("keyword", run_id=self.meter.run_id)}
+        summary["cost_usd"] = round(costs.get(keyword, 0.0), 6)
+        
+        keyword_dir = os.path.dirname(manifest.save_dir)
+        with open(os.path.join(keyword_dir, "result.json"), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        
+        log(keyword, f"🎉 완료: {len(done)}/{len(items)}개 작성, {len(failed)}개 실패"
+                     + (f", {len(skipped)}개 건너뜀 (비슷한 기존 글)" if skipped else ""))
+        return summary
+    
+    def run_keyword(self, keyword):
+        """
+        키워드 하나의 전체 파이프라인 실행
+        
+        Returns:
+            dict: 키워드별 결과 요약
+        """
+        keyword_dir, articles_dir = self.keyword_dirs(keyword)
+        manifest = self.resume_manifest(keyword, articles_dir)
+        if manifest is None:
+            manifest = self.run_pipelined(keyword, keyword_dir, articles_dir)
+        else:
+            self.write_articles(keyword, manifest)
+        return self.summarize(keyword, manifest)
+    
+    def map_keywords(self, fn, keywords):
+        """
+        키워드별로 fn(keyword)를 동시에 실행합니다. (Ctrl+C를 누르면 진행 중인 요청만 마무리)
+        
+        Returns:
+            list: (키워드, 결과, 오류) 튜플 리스트 (완료된 순서)
+        """
+        outcomes = []
+        executor = ThreadPoolExecutor(max_workers=self.args.keyword_workers, thread_name_prefix="keyword")
+        futures = {executor.submit(fn, keyword): keyword for keyword in keywords}
+        
+        try:
+            for future in as_completed(futures):
+                keyword = futures[future]
+                try:
+                    outcomes.append((keyword, future.result(), None))
+                except Exception as e:
+                    outcomes.append((keyword, None, e))
+        except KeyboardInterrupt:
+            # 새 작업은 시작하지 않고, 진행 중인 요청만 마무리
+            print("\n⛔ 중단 요청됨 - 진행 중인 요청을 마무리하는 중...", flush=True)
+            self.stop_event.set()
+            for future in futures:
+                future.cancel()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        return outcomes
+    
+    def stop_on_budget(self):
+        """예산 초과 시 새 요청을 보내지 않도록 중단 (한 번만 안내)"""
+        if not self.stop_event.is_set():
+            self.stop_event.set()
+            with _print_lock:
+                print(f"\n❌ 예산 초과 - 새 요청을 중단합니다. ({self.meter.describe()})", flush=True)
+    
+    def error_summary(self, keyword, error):
+        """실패한 키워드의 요약"""
+        if isinstance(error, BudgetExceeded):
+            self.stop_on_budget()
+            log(keyword, error.status)
+            return {"keyword": keyword, "status": "budget_exceeded", "error": str(error)}
+        
+        if isinstance(error, PipelineError):
+            log(keyword, error.status)
+            return {"keyword": keyword, "status": "no_results", "error": str(error)}
+        
+        log(keyword, f"❌ 오류 발생: {error}")
+        return {"keyword": keyword, "status": "error", "error": str(error)}
+    
+    def run(self, keywords):
+        """모든 키워드 실행 후 요약 반환"""
+        if self.args.batch_api:
+            return self.run_batch_api(keywords)
+        
+        self.keywords = keywords
+        try:
+            return [
+                summary if error is None else self.error_summary(keyword, error)
+                for keyword, summary, error in self.map_keywords(self.run_keyword, keywords)
+            ]
+        finally:
+            self.prefetch_executor.shutdown(wait=True, cancel_futures=True)
+    
+    def run_batch_api(self, keywords):
+        """
+        키워드별로 제목까지 생성한 뒤, 모든 키워드의 글을 Batch API 작업 하나로 제출하여 작성
+        
+        Returns:
+            list: 키워드별 결과 요약
+        """
+        summaries = []
+        manifests = {}
+        for keyword, manifest, error in self.map_keywords(self.prepare_keyword, keywords):
+            if error is None:
+                manifests[keyword] = manifest
+            else:
+                summaries.append(self.error_summary(keyword, error))
+        
+        if manifests and not self.stop_event.is_set():
+            total = sum(len(manifest.remaining()) for manifest in manifests.values())
+            print(f"\n📦 Batch API로 글 {total}개 작성 요청 (키워드 {len(manifests)}개)", flush=True)
+            
+            def on_finish(manifest, idx, title, file_name, error):
+                if error is None:
+                    log(manifest.keyword, f"✅ [{idx}/{len(manifest.items)}] 저장 완료: {file_name}")
+                else:
+                    log(manifest.keyword, f"❌ [{idx}/{len(manifest.items)}] 작성 실패: {title} ({error})")
+            
+            try:
+                result = run_batch_writing(
+                    BlogPipeline(meter=self.meter),
+                    list(manifests.values()),
+                    self.args.output,
+                    poll_interval=self.args.poll_interval,
+                    should_stop=self.stop_event.is_set,
+                    on_progress=lambda batch: print(describe_batch(batch), flush=True),
+                    on_finish=on_finish
+                )
+                if result["stopped"] or result["status"] in ("expired", "cancelled"):
+                    print(f"ℹ️ Batch 작업({', '.join(result['batch_ids'])}) 상태: {result['status']} - "
+                          "--resume으로 다시 실행하면 남은 글을 이어서 받아옵니다.", flush=True)
+            except KeyboardInterrupt:
+                # 작업은 서버에서 계속 진행되므로 작업 ID만 남기고 종료
+                print("\n⛔ 기다리기를 중단했습니다. Batch 작업은 서버에서 계속 진행되며 "
+                      "--resume으로 다시 실행하면 결과를 받아옵니다.", flush=True)
+            except PipelineError as e:
+                print(f"{e.status}: {e}", flush=True)
+        
+        summaries.extend(self.summarize(keyword, manifest) for keyword, manifest in manifests.items())
+        return summaries
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="키워드 목록으로 검색 → 분석 → 제목 생성 → 글 작성을 한 번에 실행합니다."
+    )
+    parser.add_argument("keywords_file", help="키워드 목록 파일 (.txt / .csv / .jsonl)")
+    parser.add_argument("-o", "--output", default="batch_output", help="결과 저장 폴더 (기본값: batch_output)")
+    parser.add_argument("--num-search", type=int, default=30, help="키워드별 검색할 블로그 수 (기본값: 30)")
+    parser.add_argument("--num-generate", type=int, default=10, help="키워드별 생성할 제목 수 (기본값: 10)")
+    parser.add_argument("--articles", type=int, default=None, help="키워드별 작성할 글 수 (기본값: 생성된 제목 전부)")
+    parser.add_argument("--model", default="gpt-4o-mini", help="글 작성 모델 (기본값: gpt-4o-mini)")
+    parser.add_argument("--min-chars", type=int, default=2000, help="최소 글자 수 (기본값: 2000)")
+    parser.add_argument("--max-chars", type=int, default=3000, help="최대 글자 수 (기본값: 3000)")
+    parser.add_argument("--keyword-workers", type=int, default=4, help="동시에 처리할 키워드 수 (기본값: 4)")
+    parser.add_argument("--article-workers", type=int, default=3, help="키워드별 동시 글 작성 수 (기본값: 3)")
+    parser.add_argument("--naver-concurrency", type=int, default=4, help="전체 네이버 API 동시 요청 수 (기본값: 4)")
+    parser.add_argument("--openai-concurrency", type=int, default=8, help="전체 OpenAI API 동시 요청 수 (기본값: 8)")
+    parser.add_argument("--batch-api", action="store_true", help="글 작성을 OpenAI Batch API 작업 하나로 제출 (최대 24시간, 비용 절감)")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL, help=f"Batch 작업 상태 확인 간격(초) (기본값: {POLL_INTERVAL:g})")
+    parser.add_argument("--replace-duplicates", action="store_true",
+                        help="기존 제목과 비슷해서 제외한 제목 수만큼 제목을 한 번 더 생성해 채움")
+    parser.add_argument("--expand-depth", type=int, default=0,
+                        help="검색 결과에서 연관 키워드를 뽑아 이 깊이까지 다시 검색하고 분석에 반영 (기본값: 0, 확장 안 함)")
+    parser.add_argument("--expand-keywords", type=int, default=EXPANSION_MAX_KEYWORDS,
+                        help=f"키워드별로 확장할 때 검색할 최대 검색어 수 (기본값: {EXPANSION_MAX_KEYWORDS})")
+    parser.add_argument("--reuse-analysis", type=float, default=REUSE_ANALYSIS_DAYS, metavar="DAYS",
+                        help="이 기간(일) 안에 같은 키워드를 분석한 기록이 자료 저장소에 있으면 다시 사용 (기본값: BLOGWRITER_REUSE_ANALYSIS_DAYS, 없으면 0)")
+    parser.add_argument("--similar-articles", choices=SIMILAR_MODES, default=SIMILAR_ARTICLE_MODE,
+                        help="제목이 비슷한 기존 글(자료 저장소)이 있을 때: write(그대로 작성), skip(건너뛰기), "
+                             "seed(기존 글을 참고해서 작성) (기본값: SIMILAR_ARTICLE_MODE, 없으면 write)")
+    parser.add_argument("--resume", action="store_true", help="이전 작업 기록이 있는 키워드는 완료되지 않은 글만 이어서 작성")
+    parser.add_argument("--budget", type=float, default=BUDGET_USD,
+                        help="이번 실행의 최대 비용(USD) - 넘을 요청은 보내지 않고 중단 (기본값: BLOGWRITER_BUDGET_USD, 없으면 제한 없음)")
+    return parser
+
+
+def main():
+    """메인 함수"""
+    args = build_parser().parse_args()
+    
+    if args.min_chars > args.max_chars:
+        print(f"오류: 최소 글자 수({args.min_chars}자)가 최대 글자 수({args.max_chars}자)보다 큽니다.")
+        sys.exit(1)
+    
+    if not os.getenv("OPEN_AI_API_KEY"):
+        print("오류: OpenAI API 키가 .env 파일에 없습니다.")
+        sys.exit(1)
+    
+    keywords = load_keywords(args.keywords_file)
+    if not keywords:
+        print("키워드 목록이 비어 있습니다.")
+        sys.exit(1)
+    
+    print("=" * 80)
+    print(f"🚀 배치 모드: 키워드 {len(keywords)}개 → {os.path.abspath(args.output)}")
+    print("=" * 80)
+    
+    os.makedirs(args.output, exist_ok=True)
+    runner = BatchRunner(args)
+    summaries = runner.run(keywords)
+    
+    with open(os.path.join(args.output, "batch_summary.json"), 'w', encoding='utf-8') as f:
+        json.dump(summaries, f, ensure_ascii=False, indent=2)
+    
+    done = sum(1 for summary in summaries if summary.get("status") == "done")
+    print("\n" + "=" * 80)
+    print(f"✅ 완료: {done}/{len(keywords)}개 키워드 (요약: batch_summary.json)")
+    if article_usage.requests:
+        print(f"📊 토큰 사용량 - {article_usage.describe()}")
+    print(f"{runner.meter.describe()} (자세히: python cost_ledger.py --run {runner.meter.run_id})")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
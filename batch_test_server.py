@@ -0,0 +1,259 @@
+"""
+Batch API 로컬 테스트 서버
+OpenAI의 파일 업로드/Batch 엔드포인트를 흉내 내어 API 비용 없이 Batch 모드를 시험합니다.
+각 요청에는 실제 글 대신 제목과 모델 정보를 담은 테스트 본문을 돌려줍니다.
+
+사용 예:
+    python batch_test_server.py --port 8765 --delay 5
+    OPEN_AI_BASE_URL=http://127.0.0.1:8765/v1 python batch_cli.py keywords.txt --batch-api
+"""
+import re
+import json
+import time
+import uuid
+import argparse
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class BatchStore:
+    """업로드한 파일과 Batch 작업을 메모리에 보관"""
+    
+    def __init__(self, delay=2.0, fail_every=0):
+        self.files = {}
+        self.batches = {}
+        self.delay = delay
+        self.fail_every = fail_every
+        self.lock = threading.RLock()
+    
+    def add_file(self, content, filename, purpose):
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        info = {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed"
+        }
+        with self.lock:
+            self.files[file_id] = (info, content)
+        return info
+    
+    def create_batch(self, input_file_id, endpoint, completion_window, metadata=None):
+        batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+        batch = {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": endpoint,
+            "input_file_id": input_file_id,
+            "completion_window": completion_window,
+            "status": "validating",
+            "created_at": int(time.time()),
+            "output_file_id": None,
+            "error_file_id": None,
+            "errors": None,
+            "metadata": metadata,
+            "request_counts": {"total": 0, "completed": 0, "failed": 0}
+        }
+        with self.lock:
+            self.batches[batch_id] = batch
+        
+        threading.Thread(target=self.process, args=(batch_id,), daemon=True).start()
+        return batch
+    
+    def process(self, batch_id):
+        """delay초 뒤 모든 요청에 테스트 응답을 만들어 작업을 완료"""
+        batch = self.batches[batch_id]
+        _, content = self.files[batch["input_file_id"]]
+        requests = [json.loads(line) for line in content.decode('utf-8').splitlines() if line.strip()]
+        
+        with self.lock:
+            batch["status"] = "in_progress"
+            batch["in_progress_at"] = int(time.time())
+            batch["request_counts"]["total"] = len(requests)
+        time.sleep(self.delay)
+        
+        outputs, errors = [], []
+        for no, request in enumerate(requests, 1):
+            if batch["status"] == "cancelling":
+                break
+            if self.fail_every and no % self.fail_every == 0:
+                errors.append(self.error_line(request))
+            else:
+                outputs.append(self.output_line(request))
+        
+        with self.lock:
+            if outputs:
+                batch["output_file_id"] = self.add_file(
+                    "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in outputs).encode('utf-8'),
+                    f"{batch_id}_output.jsonl", "batch_output"
+                )["id"]
+            if errors:
+                batch["error_file_id"] = self.add_file(
+                    "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in errors).encode('utf-8'),
+                    f"{batch_id}_error.jsonl", "batch_output"
+                )["id"]
+            batch["request_counts"]["completed"] = len(outputs)
+            batch["request_counts"]["failed"] = len(errors)
+            batch["status"] = "cancelled" if batch["status"] == "cancelling" else "completed"
+            batch["completed_at"] = int(time.time())
+    
+    def output_line(self, request):
+        body = request["body"]
+        prompt = body["messages"][-1]["content"]
+        title = re.search(r"#\s*블로그 제목\s*\n+([^\n]+)", prompt)
+        text = (
+            f"{title.group(1).strip() if title else '테스트 제목'}\n\n"
+            f"로컬 테스트 서버가 만든 **본문**입니다. (model={body['model']}, max_tokens={body.get('max_tokens')})\n"
+        )
+        return {
+            "id": f"batch_req_{uuid.uuid4().hex[:24]}",
+            "custom_id": request["custom_id"],
+            "response": {
+                "status_code": 200,
+                "request_id": uuid.uuid4().hex,
+                "body": {
+                    "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body["model"],
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": {"prompt_tokens": len(prompt) // 2, "completion_tokens": len(text) // 2,
+                              "total_tokens": (len(prompt) + len(text)) // 2}
+                }
+            },
+            "error": None
+        }
+    
+    def error_line(self, request):
+        return {
+            "id": f"batch_req_{uuid.uuid4().hex[:24]}",
+            "custom_id": request["custom_id"],
+            "response": {
+                "status_code": 500,
+                "request_id": uuid.uuid4().hex,
+                "body": {"error": {"message": "테스트 서버가 만든 오류입니다.", "type": "server_error"}}
+            },
+            "error": None
+        }
+
+
+class BatchHandler(BaseHTTPRequestHandler):
+    """/v1/files, /v1/batches 엔드포인트"""
+    
+    store = None
+    
+    def send_json(self, data, status=200):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def not_found(self):
+        self.send_json({"error": {"message": f"Not found: {self.path}", "type": "invalid_request_error"}}, 404)
+    
+    def read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+    
+    def do_POST(self):
+        path = self.path.split("?")[0]
+        
+        if path == "/v1/files":
+            # multipart/form-data: file, purpose
+            raw = b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + self.read_body()
+            message = BytesParser(policy=HTTP).parsebytes(raw)
+            fields = {}
+            for part in message.iter_parts():
+                name = part.get_param("name", header="content-disposition")
+                fields[name] = (part.get_filename(), part.get_payload(decode=True))
+            filename, content = fields["file"]
+            purpose = fields.get("purpose", (None, b"batch"))[1].decode()
+            self.send_json(self.store.add_file(content, filename or "upload.jsonl", purpose))
+            return
+        
+        if path == "/v1/batches":
+            data = json.loads(self.read_body() or b"{}")
+            if data.get("input_file_id") not in self.store.files:
+                self.send_json({"error": {"message": "input_file_id가 없습니다.", "type": "invalid_request_error"}}, 400)
+                return
+            self.send_json(self.store.create_batch(
+                data["input_file_id"], data["endpoint"], data["completion_window"], data.get("metadata")
+            ))
+            return
+        
+        match = re.fullmatch(r"/v1/batches/([^/]+)/cancel", path)
+        if match and match.group(1) in self.store.batches:
+            batch = self.store.batches[match.group(1)]
+            with self.store.lock:
+                if batch["status"] not in ("completed", "failed", "expired", "cancelled"):
+                    batch["status"] = "cancelling"
+            self.send_json(batch)
+            return
+        
+        self.not_found()
+    
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        
+        match = re.fullmatch(r"/v1/batches/([^/]+)", path)
+        if match and match.group(1) in self.store.batches:
+            with self.store.lock:
+                self.send_json(self.store.batches[match.group(1)])
+            return
+        
+        match = re.fullmatch(r"/v1/files/([^/]+)(/content)?", path)
+        if match and match.group(1) in self.store.files:
+            info, content = self.store.files[match.group(1)]
+            if match.group(2):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+            else:
+                self.send_json(info)
+            return
+        
+        self.not_found()
+    
+    def log_message(self, format, *args):
+        print(f"[batch-test-server] {format % args}", flush=True)
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="OpenAI Batch API 로컬 테스트 서버")
+    parser.add_argument("--host", default="127.0.0.1", help="주소 (기본값: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="포트 (기본값: 8765)")
+    parser.add_argument("--delay", type=float, default=2.0, help="작업 완료까지 걸리는 시간(초) (기본값: 2)")
+    parser.add_argument("--fail-every", type=int, default=0, help="N번째 요청마다 오류 응답 (기본값: 0 = 없음)")
+    args = parser.parse_args()
+    
+    BatchHandler.store = BatchStore(delay=args.delay, fail_every=args.fail_every)
+    server = ThreadingHTTPServer((args.host, args.port), BatchHandler)
+    
+    print("=" * 60)
+    print(f"🧪 Batch API 테스트 서버: http://{args.host}:{args.port}/v1")
+    print(f"   OPEN_AI_BASE_URL=http://{args.host}:{args.port}/v1")
+    print("=" * 60)
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n서버를 종료합니다.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,19 @@
 """
 블로그 글 내용 작성을 위한 프롬프트 관리 파일
 이 파일에서 블로그 본문 작성 관련 모든 프롬프트를 중앙 관리합니다.
-"""
-
-def get_blog_writing_prompt(title, keyword, min_chars=2000, max_chars=3000):
-    """
-    SEO 최적화된 블로그 글 작성 프롬프트
-    
-    Args:
-        title (str): 블로그 글 제목
-        keyword (str): 핵심 키워드
-        min_chars (int): 최소 글자 수
-        max_chars (int): 최대 글자 수
-    
-    Returns:
-        str: 블로그 글 작성 프롬프트
-    """
-    return f"""당신은 전문 블로그 작가이자 SEO 전문가입니다. 아래 제목으로 SEO와 독자 참여에 최적화된 블로그 글을 작성해주세요.
-
-# 블로그 제목
-{title}
 
-# 핵심 키워드
-{keyword}
+프롬프트는 모든 요청이 똑같이 쓰는 고정 지침(시스템 프롬프트)과
+제목/키워드/글자 수만 담은 짧은 요청(사용자 프롬프트)으로 나뉩니다.
+요청의 앞부분이 항상 같으므로 OpenAI의 프롬프트 캐시가 적용되어
+여러 글을 작성할 때 입력 토큰 비용과 첫 응답까지의 시간이 줄어듭니다.
+(캐시는 앞부분이 1024토큰 이상일 때 적용되므로 고정 지침에는 변하는 값을 넣지 않고,
+작성 규칙과 형식 예시를 함께 넣어 고정 지침만으로 1024토큰을 넘도록 유지합니다)
+"""
 
-# 글자 수 요구사항
-- 최소: {min_chars}자
-- 최대: {max_chars}자
+# 모든 글 작성 요청이 공유하는 고정 지침 (변하는 값을 넣지 말 것)
+# 약 2,700자 (gpt-4o 토크나이저 기준 1,400토큰 안팎) - 줄이면 1024토큰 아래로 내려가 캐시가 적용되지 않음
+BLOG_WRITING_INSTRUCTIONS = """당신은 전문 블로그 작가이자 SEO 전문가입니다. 검색 엔진 최적화와 독자 참여를 극대화하는 고품질 블로그 글을 작성합니다.
+사용자가 주는 제목, 핵심 키워드, 글자 수 요구사항에 맞춰 아래 지침에 따라 SEO와 독자 참여에 최적화된 블로그 글을 작성하세요.
 
 # 작성 요구사항
 
@@ -42,7 +29,7 @@ def get_blog_writing_prompt(title, keyword, min_chars=2000, max_chars=3000):
 - 명확한 구조 (서론-본론-결론)
 - 단락별로 명확한 소제목 사용
 - 불렛 포인트나 번호 목록 활용
-- 지정된 글자 수 범위 내에서 작성
+- 요청에 지정된 글자 수 범위 내에서 작성
 
 ## 3. 독자 참여 요소
 - 흥미로운 도입부로 시작
@@ -75,18 +62,154 @@ def get_blog_writing_prompt(title, keyword, min_chars=2000, max_chars=3000):
 - 이모지는 사용하지 않음
 - 자연스러운 한국어 사용
 - 전문적이면서도 친근한 톤
-- 반드시 {min_chars}자 이상, {max_chars}자 이하로 작성
+- 반드시 요청에 지정된 최소 글자 수 이상, 최대 글자 수 이하로 작성
+
+## 6. 문단과 문장
+- 한 문단은 2~4문장으로 작성하고 문단 사이에는 빈 줄을 하나 넣음
+- 한 문장은 60자 안팎으로 짧고 명확하게 작성
+- 같은 어미(~습니다, ~요)를 세 문장 이상 연속으로 반복하지 않음
+- 번역체 표현(~에 의해, ~하는 것이 가능하다, ~에 있어서)보다 자연스러운 능동형 표현 사용
+- 한 문단에는 하나의 주제만 담고, 첫 문장에서 그 문단의 요지를 먼저 말함
+- 접속사(그리고, 또한, 하지만)로 문장을 시작하는 횟수를 줄이고 문맥으로 자연스럽게 연결
+
+## 7. 소제목과 목록 표기 (일반 텍스트)
+- 마크다운 기호(#, **, >, |) 대신 줄바꿈과 번호로 구조를 표시
+- 소제목은 한 줄에 단독으로 쓰고 앞뒤에 빈 줄을 넣음
+- 큰 소제목은 "1.", "2."처럼 번호를 붙이고, 그 아래 작은 소제목은 "1-1.", "1-2."처럼 표시
+- 목록은 항목마다 새 줄에 쓰고 항목 앞에 "• " 기호를 붙임
+- 순서가 중요한 절차는 "①, ②, ③"처럼 번호를 붙여 단계별로 작성
+- 표로 정리할 내용은 "항목: 설명" 형식의 줄로 풀어서 작성
+
+## 8. 정보의 정확성과 신뢰도
+- 확인할 수 없는 통계, 가격, 날짜, 연구 결과를 지어내지 않음
+- 수치가 필요하면 "보통", "대략"처럼 범위와 조건을 함께 제시
+- 특정 브랜드나 제품을 단정적으로 추천하거나 비방하지 않음
+- 건강, 법률, 금융처럼 전문 판단이 필요한 내용은 일반적인 정보로만 다루고 전문가 상담을 권유
+- 가격, 정책, 운영 시간처럼 시기에 따라 달라지는 정보는 최신 내용을 확인하도록 안내
+- 독자가 바로 따라 할 수 있도록 순서, 준비물, 소요 시간, 주의사항을 구체적으로 제시
+
+## 9. 피해야 할 표현
+- "오늘은 ~에 대해 알아보겠습니다"처럼 상투적인 도입 문장
+- "결론적으로", "요약하자면"을 여러 번 반복하는 표현
+- 키워드를 쉼표로 나열하거나 문맥과 상관없이 반복하는 키워드 나열
+- "최고의", "완벽한", "무조건" 같은 과장 표현과 근거 없는 단정
+- 독자를 가르치려 하거나 훈계하는 말투
+- 다른 블로그나 사이트 언급, 링크, 해시태그
+- 작성 지침이나 요청 내용에 대한 언급
+
+## 10. 출력 형식
+- 블로그 본문만 출력하고 "다음은 블로그 글입니다" 같은 안내 문구는 쓰지 않음
+- 본문 끝에 글자 수, 키워드 횟수 같은 작성 정보나 메모를 덧붙이지 않음
+- 글을 끝까지 완성해서 출력 (중간에 끊거나 이어서 쓸지 묻지 않음)
+
+## 11. 형식 예시
+아래는 형식만 보여주는 예시입니다. 내용과 소제목은 요청한 제목과 키워드에 맞게 새로 작성하세요.
+(예시 제목: 초보자를 위한 홈트레이닝 루틴 총정리 / 핵심 키워드: 홈트레이닝)
+
+운동을 시작하기로 마음먹었지만 헬스장에 갈 시간이 없어 망설이고 있다면 홈트레이닝이 좋은 출발점이 됩니다. 장비 없이 거실 한쪽만 있으면 바로 시작할 수 있고, 내 생활 리듬에 맞춰 시간을 정할 수 있기 때문입니다. 이 글에서는 처음 시작하는 분이 부담 없이 따라 할 수 있는 준비 과정과 주간 루틴을 정리했습니다.
+
+1. 홈트레이닝을 시작하기 전에 준비할 것
+
+홈트레이닝은 준비물이 적지만 몇 가지만 갖추면 훨씬 편하게 운동할 수 있습니다.
+
+• 운동 매트: 바닥의 충격을 줄이고 미끄러짐을 막아 줍니다.
+• 물과 수건: 짧은 운동이라도 수분 보충을 잊지 않도록 가까이에 둡니다.
+
+2. 초보자를 위한 주간 홈트레이닝 루틴
+
+2-1. 하체 운동
+
+① 발을 어깨너비로 벌리고 섭니다.
+② 의자에 앉듯이 엉덩이를 뒤로 빼며 천천히 내려갑니다.
+③ 무릎이 발끝보다 너무 앞으로 나가지 않도록 주의하며 일어납니다.
+
+마무리하며
+
+처음부터 무리하게 시간을 늘리기보다 일주일에 세 번, 20분씩 꾸준히 하는 것이 중요합니다. 오늘 소개한 루틴 중 하나를 골라 이번 주에 바로 시작해 보세요."""
+
+
+def get_blog_writing_prompt(title, keyword, min_chars=2000, max_chars=3000, reference=None):
+    """
+    블로그 글 작성 요청 (글마다 달라지는 부분만 담은 짧은 사용자 프롬프트)
+    
+    Args:
+        title (str): 블로그 글 제목
+        keyword (str): 핵심 키워드
+        min_chars (int): 최소 글자 수
+        max_chars (int): 최대 글자 수
+        reference (str): 참고할 기존 글 (제목이 비슷해서 이전에 작성한 글)
+    
+    Returns:
+        str: 블로그 글 작성 프롬프트
+    """
+    prompt = f"""# 블로그 제목
+{title}
+
+# 핵심 키워드
+{keyword}
+
+# 글자 수 요구사항
+- 최소: {min_chars}자
+- 최대: {max_chars}자
+
+"""
+    if reference:
+        prompt += f"""# 참고할 기존 글
+{reference}
+
+위 기존 글은 비슷한 제목으로 이전에 작성한 글입니다. 구성과 정보는 참고하되 문장을 그대로 옮기지 말고,
+새 제목에 맞는 관점과 예시로 새로운 글을 작성해주세요.
 
-블로그 글을 작성해주세요."""
+"""
+    return prompt + "위 제목으로 블로그 글을 작성해주세요."
 
 
 def get_blog_writing_system_prompt():
     """
-    블로그 글 작성 시스템 프롬프트
+    블로그 글 작성 시스템 프롬프트 (모든 요청에 공통인 고정 지침)
     
     Returns:
         str: 시스템 프롬프트
     """
-    return "당신은 전문 블로그 작가이자 SEO 전문가입니다. 검색 엔진 최적화와 독자 참여를 극대화하는 고품질 블로그 글을 작성합니다."
+    return BLOG_WRITING_INSTRUCTIONS
+
+
+def get_continuation_prompt(current_chars, min_chars, max_chars):
+    """
+    최소 글자 수보다 짧게 작성된 글을 이어서 쓰는 요청
+    (지금까지 작성한 글은 assistant 메시지로 함께 보냄)
+    
+    Args:
+        current_chars (int): 지금까지 작성한 글자 수
+        min_chars (int): 최소 글자 수
+        max_chars (int): 최대 글자 수
+    
+    Returns:
+        str: 이어쓰기 프롬프트
+    """
+    return f"""지금까지 작성한 글은 {current_chars}자로, 요청한 최소 글자 수({min_chars}자)보다 짧습니다.
+위 글의 마지막 부분에 자연스럽게 이어질 내용을 {min_chars - current_chars}~{max_chars - current_chars}자 분량으로 작성해주세요.
+
+- 이미 작성한 내용은 반복하거나 요약하지 마세요
+- 새 문단부터 시작하고, 이어지는 내용만 출력하세요 (제목, 안내 문구 없이)
+- 글의 결론이 이미 있다면 결론 앞에 들어갈 만한 구체적인 예시, 팁, 주의사항을 보충하세요"""
+
 
+def get_trim_prompt(numbered_text, current_chars, max_chars):
+    """
+    최대 글자 수보다 길게 작성된 글에서 뺄 문단을 고르는 요청
+    (문단을 다시 쓰지 않고 번호만 받아서 줄임)
+    
+    Args:
+        numbered_text (str): 번호를 붙인 문단 텍스트
+        current_chars (int): 현재 글자 수
+        max_chars (int): 최대 글자 수
+    
+    Returns:
+        str: 문단 선택 프롬프트
+    """
+    return f"""아래 블로그 글은 {current_chars}자로, 최대 글자 수({max_chars}자)보다 {current_chars - max_chars}자 깁니다.
+글의 흐름과 핵심 정보를 해치지 않고 삭제해도 되는 문단 번호를 덜 중요한 것부터 순서대로 골라주세요.
+도입부와 결론 문단, 소제목만 있는 문단은 고르지 마세요.
 
+{numbered_text}"""
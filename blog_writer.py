@@ -1,10 +1,10 @@
 import customtkinter as ctk
-import os
 import re
-import threading
 from tkinter import messagebox, filedialog
 from dotenv import load_dotenv
-from openai import OpenAI
+from pipeline import BlogPipeline, PipelineError, save_article
+from ui_dispatch import UIDispatcher, ui_thread
+from async_runtime import get_runtime
 
 # .env 파일 로드
 load_dotenv()
@@ -14,76 +14,6 @@ ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
 
-def get_blog_writing_prompt(title, keyword):
-    """
-    SEO 최적화된 블로그 글 작성 프롬프트
-    
-    Args:
-        title (str): 블로그 글 제목
-        keyword (str): 핵심 키워드
-    
-    Returns:
-        str: 블로그 글 작성 프롬프트
-    """
-    return f"""당신은 전문 블로그 작가이자 SEO 전문가입니다. 아래 제목으로 SEO와 독자 참여에 최적화된 블로그 글을 작성해주세요.
-
-# 블로그 제목
-{title}
-
-# 핵심 키워드
-{keyword}
-
-# 작성 요구사항
-
-## 1. SEO 최적화
-- 제목에 핵심 키워드 포함
-- 본문에 핵심 키워드를 자연스럽게 5-8회 반복
-- 관련 키워드와 LSI 키워드 활용
-- 부제목(H2, H3)에 키워드 변형 포함
-- 메타 설명에 적합한 첫 문단 작성
-
-## 2. 구글 검색 최적화 (SEO)
-- 검색 의도에 맞는 구체적이고 실용적인 정보 제공
-- 명확한 구조 (서론-본론-결론)
-- 단락별로 명확한 소제목 사용
-- 불렛 포인트나 번호 목록 활용
-- 2,000-3,000자 분량
-
-## 3. 독자 참여 요소
-- 흥미로운 도입부로 시작
-- 실용적인 정보와 팁 제공
-- 구체적인 예시나 사례 포함
-- 행동 유도 문구(CTA) 포함
-- 친근하고 읽기 쉬운 문체
-
-## 4. 구조
-다음 구조로 작성해주세요:
-
-### 서론
-- 독자의 관심을 끄는 도입
-- 글의 목적과 가치 제시
-- 문제 상황이나 질문 제기
-
-### 본론
-- 소제목으로 구분된 여러 섹션
-- 각 섹션마다 구체적인 정보
-- 실용적인 팁과 방법
-- 예시와 사례
-
-### 결론
-- 핵심 내용 요약
-- 실천 방안 제시
-- 독자 행동 유도
-
-## 5. 추가 요구사항
-- 마크다운 형식으로 작성하지 말고 일반 텍스트로 작성
-- 이모지는 사용하지 않음
-- 자연스러운 한국어 사용
-- 전문적이면서도 친근한 톤
-
-블로그 글을 작성해주세요."""
-
-
 class BlogWriterApp(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -98,9 +28,17 @@ class BlogWriterApp(ctk.CTk):
         self.save_path = ""
         self.current_index = 0
         
+        # 작업 스레드의 화면 업데이트를 메인 루프에서 실행
+        self.ui = UIDispatcher(self)
+        self.ui.start()
+        
+        # 글 작성은 백그라운드 이벤트 루프에서 실행
+        self.runtime = get_runtime()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # UI 초기화
         self.create_widgets()
-        
+    
     def create_widgets(self):
         # 메인 컨테이너 (좌우 2분할)
         self.grid_columnconfigure(0, weight=3)
@@ -301,110 +239,88 @@ class BlogWriterApp(ctk.CTk):
         )
         
         if result:
-            # 스레드로 작성 실행
-            thread = threading.Thread(target=self.write_blogs)
-            thread.daemon = True
-            thread.start()
+            # 백그라운드 이벤트 루프에서 작성 실행
+            self.runtime.submit(self.write_blogs(self.keyword, self.titles, self.save_path))
         else:
             self.write_button.configure(state="normal")
     
-    def write_blogs(self):
-        """모든 블로그 글 작성"""
+    async def write_blogs(self, keyword, titles, save_path):
+        """
+        모든 블로그 글 작성 (백그라운드 이벤트 루프에서 한 편씩 차례로)
+        다른 화면과 같은 파이프라인을 사용하므로 예산 확인, 비용 기록, 글자 수 보정, 자료 저장소 기록이 함께 적용됩니다.
+        """
         try:
-            # OpenAI API 클라이언트 초기화
-            api_key = os.getenv("OPEN_AI_API_KEY")
-            if not api_key:
-                self.update_status("❌ OpenAI API 키가 없습니다.", 0)
-                messagebox.showerror("오류", "OpenAI API 키가 .env 파일에 없습니다.")
-                self.write_button.configure(state="normal")
-                return
+            pipeline = BlogPipeline()
+            # API 키가 없으면 작성 전에 중단
+            pipeline.require_api_key()
             
-            client = OpenAI(api_key=api_key)
+            total = len(titles)
             
-            total = len(self.titles)
-            
-            for idx, title in enumerate(self.titles, 1):
+            for idx, title in enumerate(titles, 1):
                 self.current_index = idx
                 progress = (idx - 1) / total
                 
                 # 상태 업데이트
                 self.update_status(f"📝 {idx}/{total}: '{title}' 작성 중...", progress)
-                self.current_title_label.configure(text=f"[{idx}/{total}] {title}")
+                self.ui.post(self.current_title_label.configure, text=f"[{idx}/{total}] {title}", key="current_title")
                 
-                # 블로그 글 작성
-                prompt = get_blog_writing_prompt(title, self.keyword)
+                # 블로그 글 작성 (스트리밍으로 미리보기에 바로 표시)
+                self.update_preview("")
                 
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "당신은 전문 블로그 작가이자 SEO 전문가입니다. 검색 엔진 최적화와 독자 참여를 극대화하는 고품질 블로그 글을 작성합니다."
-                        },
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=3000
+                blog_content, _ = await pipeline.awrite_article(
+                    keyword, title, "gpt-4o-mini", 2000, 3000, on_chunk=self.append_preview
                 )
                 
-                blog_content = response.choices[0].message.content
-                
-                # 미리보기 업데이트
-                self.update_preview(blog_content)
-                
                 # 파일 저장
-                safe_filename = self.sanitize_filename(title)
-                file_path = os.path.join(self.save_path, f"{idx:02d}_{safe_filename}.txt")
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(f"제목: {title}\n")
-                    f.write(f"키워드: {self.keyword}\n")
-                    f.write("=" * 80 + "\n\n")
-                    f.write(blog_content)
+                save_article(save_path, idx, title, keyword, blog_content)
                 
                 self.update_status(f"✅ {idx}/{total}: 저장 완료", idx / total)
             
             # 완료
             self.update_status("🎉 모든 블로그 글 작성 완료!", 1.0)
-            messagebox.showinfo(
+            self.ui.post(
+                messagebox.showinfo,
                 "완료",
-                f"{total}개의 블로그 글이 성공적으로 작성되었습니다!\n\n저장 위치: {self.save_path}"
+                f"{total}개의 블로그 글이 성공적으로 작성되었습니다!\n\n저장 위치: {save_path}"
             )
-            
+        
+        except PipelineError as e:
+            self.update_status(e.status, 0)
+            self.ui.post(messagebox.showerror, "오류", str(e))
+        
         except Exception as e:
             self.update_status("❌ 오류 발생", 0)
-            messagebox.showerror("오류", f"오류가 발생했습니다:\n{str(e)}")
+            self.ui.post(messagebox.showerror, "오류", f"오류가 발생했습니다:\n{str(e)}")
         
         finally:
-            self.write_button.configure(state="normal")
+            self.ui.post(self.write_button.configure, state="normal")
     
-    def sanitize_filename(self, filename):
-        """파일명에 사용할 수 없는 문자 제거"""
-        # Windows에서 사용할 수 없는 문자 제거
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '')
-        
-        # 공백을 언더스코어로 변경
-        filename = filename.replace(' ', '_')
-        
-        # 길이 제한 (50자)
-        if len(filename) > 50:
-            filename = filename[:50]
-        
-        return filename
+    def on_close(self):
+        """창을 닫으면 진행 중인 요청을 취소하고 이벤트 루프 종료"""
+        self.runtime.shutdown(timeout=2)
+        self.destroy()
     
+    @ui_thread(key="status")
     def update_status(self, text, progress):
         """상태 텍스트 및 프로그레스 바 업데이트"""
         self.status_label.configure(text=text)
         self.progress_bar.set(progress)
     
+    @ui_thread(key="preview")
     def update_preview(self, content):
         """미리보기 업데이트"""
         self.preview_textbox.configure(state="normal")
         self.preview_textbox.delete("1.0", "end")
         self.preview_textbox.insert("1.0", content)
         self.preview_textbox.configure(state="disabled")
+    
+    @ui_thread()
+    def append_preview(self, content):
+        """미리보기 끝에 내용 추가 (스트리밍 표시용)"""
+        self.preview_textbox.configure(state="normal")
+        self.preview_textbox.insert("end", content)
+        self.preview_textbox.see("end")
+        self.preview_textbox.configure(state="disabled")
 
 
 def main():
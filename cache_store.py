@@ -0,0 +1,143 @@
+"""
+로컬 캐시 저장소
+SQLite 파일 하나에 여러 캐시 테이블을 두고, 유효 시간(TTL)과 최대 개수(LRU)를 관리합니다.
+모든 실행 화면(BlogWriter, gui_app, app, blogtitle)이 같은 파일을 함께 사용합니다.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from dotenv import load_dotenv
+
+# .env 파일 로드
+load_dotenv()
+
+# 캐시 파일 위치 (BLOGWRITER_CACHE_DIR 환경 변수로 변경 가능)
+CACHE_DIR = os.getenv("BLOGWRITER_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".blogwriter")
+CACHE_FILE = os.path.join(CACHE_DIR, "cache.sqlite3")
+
+
+class SQLiteCache:
+    """
+    SQLite 기반 키-값 캐시
+    값은 JSON으로 저장하며, 오래된 항목은 TTL로 만료되고 개수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제됩니다.
+    """
+    
+    def __init__(self, table, path=CACHE_FILE, ttl=None, max_entries=5000):
+        """
+        Args:
+            table (str): 캐시 테이블 이름
+            path (str): SQLite 파일 경로
+            ttl (float): 유효 시간 (초, None이면 만료되지 않음)
+            max_entries (int): 최대 항목 수 (초과 시 LRU 삭제)
+        """
+        self.table = table
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        # 여러 프로그램이 동시에 읽고 쓸 수 있도록 WAL 모드 사용
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)"
+        )
+        self._conn.commit()
+    
+    def get(self, key):
+        """
+        캐시된 값을 가져옵니다.
+        
+        Args:
+            key (str): 캐시 키
+        
+        Returns:
+            캐시된 값 (없거나 만료되었으면 None)
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?",
+                (key,)
+            ).fetchone()
+            
+            if row is None:
+                return None
+            
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?",
+                (now, key)
+            )
+            self._conn.commit()
+        
+        return json.loads(value)
+    
+    def set(self, key, value):
+        """
+        값을 캐시에 저장합니다.
+        
+        Args:
+            key (str): 캐시 키
+            value: JSON으로 저장 가능한 값
+        """
+        now = time.time()
+        data = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, data, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+    
+    def delete(self, key):
+        """항목 삭제"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+    
+    def clear(self):
+        """모든 항목 삭제"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+    
+    def _evict(self):
+        """만료된 항목과 최대 개수를 넘는 오래된 항목 삭제 (잠금 상태에서 호출)"""
+        if self.ttl is not None:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?",
+                (time.time() - self.ttl,)
+            )
+        
+        if self.max_entries:
+            self._conn.execute(
+                f"""DELETE FROM {self.table} WHERE key IN (
+                    SELECT key FROM {self.table}
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            )
+    
+    def close(self):
+        """연결 종료"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,395 @@
+"""
+로컬 자료 저장소 (SQLite + FTS5)
+검색한 블로그 글(제목/요약/링크/작성일), 분석 결과, 생성한 제목, 작성한 글을
+키워드/시각과 함께 자동으로 기록하고 전문 검색 색인을 만들어 둡니다.
+
+수백 개 키워드의 결과 폴더를 뒤지지 않고 "X가 들어간 제목"을 바로 찾을 수 있고,
+같은 키워드를 다시 실행할 때 이전 분석 결과를 다시 사용할 수 있습니다.
+
+한국어는 띄어쓰기 단위로 나누면 조사가 붙어 검색되지 않으므로 글자 3-gram(trigram)으로 색인합니다.
+3글자보다 짧은 검색어나 FTS5를 쓸 수 없는 SQLite에서는 LIKE 검색으로 대신합니다.
+
+사용 예:
+    python corpus_store.py 캠핑장                # 모든 자료에서 검색
+    python corpus_store.py 캠핑장 --kind search  # 검색한 블로그 제목/요약에서만
+    python corpus_store.py --stats               # 종류별/키워드별 개수
+"""
+import os
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from dotenv import load_dotenv
+from cache_store import CACHE_DIR
+
+# .env 파일 로드
+load_dotenv()
+
+# 저장소 파일 위치 (캐시를 지워도 남도록 캐시 파일과 분리)
+CORPUS_FILE = os.getenv("BLOGWRITER_CORPUS_FILE") or os.path.join(CACHE_DIR, "corpus.sqlite3")
+
+# 이전 분석 결과를 다시 사용할 기간 (일, 0이면 사용하지 않음)
+REUSE_ANALYSIS_DAYS = float(os.getenv("BLOGWRITER_REUSE_ANALYSIS_DAYS") or 0)
+
+# 자료 종류
+KIND_SEARCH = "search"
+KIND_ANALYSIS = "analysis"
+KIND_TITLE = "title"
+KIND_ARTICLE = "article"
+KINDS = (KIND_SEARCH, KIND_ANALYSIS, KIND_TITLE, KIND_ARTICLE)
+
+KIND_LABELS = {
+    KIND_SEARCH: "검색 결과",
+    KIND_ANALYSIS: "분석",
+    KIND_TITLE: "생성 제목",
+    KIND_ARTICLE: "작성한 글"
+}
+
+# trigram 색인으로 찾을 수 있는 최소 검색어 길이
+MIN_MATCH_CHARS = 3
+
+
+class CorpusStore:
+    """검색 결과/분석/생성 제목/작성한 글 저장소 (SQLite, FTS5 전문 검색)"""
+    
+    def __init__(self, path=CORPUS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        # 여러 프로그램이 동시에 기록할 수 있도록 WAL 모드 사용
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # 같은 자료(키워드 + 종류 + 키)는 한 행으로 유지하고 다시 기록하면 내용과 시각만 갱신
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                doc_key TEXT NOT NULL,
+                title TEXT NOT NULL DEFAULT '',
+                body TEXT NOT NULL DEFAULT '',
+                link TEXT NOT NULL DEFAULT '',
+                postdate TEXT NOT NULL DEFAULT '',
+                meta TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                UNIQUE (kind, keyword, doc_key)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS documents_keyword ON documents (keyword, kind, updated_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS documents_kind ON documents (kind, updated_at)")
+        self.fts = self._create_fts()
+        self._conn.commit()
+    
+    def _create_fts(self):
+        """전문 검색 색인과 동기화 트리거 생성 (FTS5/trigram을 쓸 수 없으면 False)"""
+        try:
+            self._conn.execute(
+                """CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                    title, body, content='documents', content_rowid='id', tokenize='trigram'
+                )"""
+            )
+        except sqlite3.OperationalError:
+            return False
+        
+        self._conn.executescript(
+            """CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+                INSERT INTO documents_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+                INSERT INTO documents_fts (documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+                INSERT INTO documents_fts (documents_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+                INSERT INTO documents_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+            END;"""
+        )
+        return True
+    
+    def add_many(self, kind, keyword, rows):
+        """
+        자료 여러 개를 한 트랜잭션으로 기록합니다. (같은 키는 내용 갱신)
+        
+        Args:
+            kind (str): 자료 종류 (KINDS)
+            keyword (str): 키워드
+            rows (list): dict(key, title, body, link, postdate, meta) 리스트 (key 외에는 생략 가능)
+        
+        Returns:
+            int: 기록한 개수
+        """
+        if kind not in KINDS:
+            raise ValueError(f"알 수 없는 자료 종류입니다: {kind}")
+        
+        now = time.time()
+        params = [
+            (
+                kind, keyword, row["key"], row.get("title") or "", row.get("body") or "",
+                row.get("link") or "", row.get("postdate") or "",
+                json.dumps(row["meta"], ensure_ascii=False) if row.get("meta") is not None else None,
+                now, now
+            )
+            for row in rows
+        ]
+        if not params:
+            return 0
+        
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    """INSERT INTO documents (
+                        kind, keyword, doc_key, title, body, link, postdate, meta, created_at, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (kind, keyword, doc_key) DO UPDATE SET
+                        title = excluded.title, body = excluded.body, link = excluded.link,
+                        postdate = excluded.postdate, meta = excluded.meta, updated_at = excluded.updated_at""",
+                    params
+                )
+        return len(params)
+    
+    def add_search_results(self, keyword, results):
+        """검색 결과 기록 (SearchResult 리스트, link 기준으로 한 행)"""
+        return self.add_many(KIND_SEARCH, keyword, [
+            {
+                "key": result.link or result.title,
+                "title": result.title,
+                "body": result.description,
+                "link": result.link,
+                "postdate": result.postdate,
+                "meta": {"bloggername": result.bloggername, "bloggerlink": result.bloggerlink}
+            }
+            for result in results
+        ])
+    
+    def add_analysis(self, keyword, analysis):
+        """
+        분석 결과 기록 (키워드마다 마지막 분석만 유지)
+        
+        Args:
+            keyword (str): 키워드
+            analysis (dict): TitleAnalysis.to_dict()
+        """
+        return self.add_many(KIND_ANALYSIS, keyword, [
+            {
+                "key": "latest",
+                "title": analysis.get("summary", ""),
+                "body": json.dumps(analysis, ensure_ascii=False),
+                "meta": {"analysis": analysis}
+            }
+        ])
+    
+    def add_titles(self, keyword, titles):
+        """생성한 제목 기록"""
+        return self.add_many(KIND_TITLE, keyword, [{"key": title, "title": title} for title in titles])
+    
+    def add_article(self, keyword, title, content, partial=False, path=None):
+        """작성한 글 기록 (같은 키워드/제목이면 마지막 글로 갱신)"""
+        return self.add_many(KIND_ARTICLE, keyword, [
+            {
+                "key": title,
+                "title": title,
+                "body": content,
+                "meta": {"chars": len(content), "partial": partial, "path": path}
+            }
+        ])
+    
+    def latest_analysis(self, keyword, max_age=None):
+        """
+        키워드의 마지막 분석 결과
+        
+        Args:
+            keyword (str): 키워드
+            max_age (float): 이 시간(초)보다 오래된 분석은 사용하지 않음 (None이면 제한 없음)
+        
+        Returns:
+            dict: TitleAnalysis.to_dict() 형식 (없으면 None)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT meta, updated_at FROM documents WHERE kind = ? AND keyword = ? AND doc_key = 'latest'",
+                (KIND_ANALYSIS, keyword)
+            ).fetchone()
+        if row is None or (max_age is not None and time.time() - row[1] > max_age):
+            return None
+        return json.loads(row[0])["analysis"]
+    
+    def search(self, text, kind=None, keyword=None, limit=50):
+        """
+        제목/본문에 글자가 들어간 자료를 최근 순으로 찾습니다.
+        
+        Args:
+            text (str): 찾을 글자
+            kind (str): 이 종류에서만 (None이면 전체)
+            keyword (str): 이 키워드에서만 (None이면 전체)
+            limit (int): 최대 개수
+        
+        Returns:
+            list: dict(kind, keyword, title, body, link, postdate, updated_at) 리스트
+        """
+        text = text.strip()
+        clauses, params = [], []
+        if kind is not None:
+            clauses.append("d.kind = ?")
+            params.append(kind)
+        if keyword is not None:
+            clauses.append("d.keyword = ?")
+            params.append(keyword)
+        
+        if self.fts and len(text) >= MIN_MATCH_CHARS:
+            # 큰따옴표로 감싸 검색어를 그대로 찾음 (FTS 문법 문자 무시)
+            source = "documents_fts JOIN documents d ON d.id = documents_fts.rowid"
+            clauses.insert(0, "documents_fts MATCH ?")
+            params.insert(0, '"' + text.replace('"', '""') + '"')
+        else:
+            source = "documents d"
+            pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            clauses.insert(0, "(d.title LIKE ? ESCAPE '\\' OR d.body LIKE ? ESCAPE '\\')")
+            params[0:0] = [pattern, pattern]
+        
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT d.kind, d.keyword, d.title, d.body, d.link, d.postdate, d.updated_at
+                    FROM {source} WHERE {' AND '.join(clauses)}
+                    ORDER BY d.updated_at DESC LIMIT ?""",
+                params + [int(limit)]
+            ).fetchall()
+        
+        return [
+            {
+                "kind": kind, "keyword": keyword, "title": title, "body": body,
+                "link": link, "postdate": postdate, "updated_at": updated_at
+            }
+            for kind, keyword, title, body, link, postdate, updated_at in rows
+        ]
+    
+    def version(self, kind):
+        """
+        종류별 자료 수와 마지막 기록 시각 (색인을 다시 만들어야 하는지 확인할 때 사용)
+        
+        Returns:
+            tuple: (개수, 마지막 기록 시각)
+        """
+        with self._lock:
+            count, updated_at = self._conn.execute(
+                "SELECT COUNT(*), MAX(updated_at) FROM documents WHERE kind = ?", (kind,)
+            ).fetchone()
+        return count, updated_at or 0
+    
+    def articles(self, after_id=None, updated_since=None):
+        """
+        작성한 글 목록 (본문 제외, 작성 중단으로 일부만 저장된 글 제외)
+        
+        Args:
+            after_id (int): 이 번호보다 뒤에 기록된 글만 (None이면 전체)
+            updated_since (float): after_id와 함께 주면 이 시각 이후에 갱신된 글도 포함
+        
+        Returns:
+            list: dict(id, keyword, title, chars, path, updated_at) 리스트
+        """
+        query = "SELECT id, keyword, title, meta, updated_at FROM documents WHERE kind = ?"
+        params = [KIND_ARTICLE]
+        if after_id is not None:
+            if updated_since is not None:
+                query += " AND (id > ? OR updated_at >= ?)"
+                params += [after_id, updated_since]
+            else:
+                query += " AND id > ?"
+                params.append(after_id)
+        
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id", params).fetchall()
+        
+        articles = []
+        for doc_id, keyword, title, meta, updated_at in rows:
+            meta = json.loads(meta) if meta else {}
+            if meta.get("partial"):
+                continue
+            articles.append({
+                "id": doc_id, "keyword": keyword, "title": title,
+                "chars": meta.get("chars"), "path": meta.get("path"), "updated_at": updated_at
+            })
+        return articles
+    
+    def body(self, doc_id):
+        """자료 하나의 본문 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM documents WHERE id = ?", (doc_id,)).fetchone()
+        return row[0] if row else None
+    
+    def stats(self):
+        """
+        종류별/키워드별 자료 수
+        
+        Returns:
+            dict: kinds({종류: 개수}), keywords(키워드 수)
+        """
+        with self._lock:
+            kinds = dict(self._conn.execute("SELECT kind, COUNT(*) FROM documents GROUP BY kind").fetchall())
+            keywords = self._conn.execute("SELECT COUNT(DISTINCT keyword) FROM documents").fetchone()[0]
+        return {"kinds": kinds, "keywords": keywords}
+    
+    def close(self):
+        """연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+
+_default_corpus = None
+_default_corpus_lock = threading.Lock()
+
+
+def get_corpus():
+    """
+    공유 저장소를 반환합니다. (BLOGWRITER_CORPUS_DISABLED=1이면 None)
+    
+    Returns:
+        CorpusStore: 저장소
+    """
+    global _default_corpus
+    if os.getenv("BLOGWRITER_CORPUS_DISABLED") == "1":
+        return None
+    if _default_corpus is None:
+        with _default_corpus_lock:
+            if _default_corpus is None:
+                _default_corpus = CorpusStore()
+    return _default_corpus
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="저장한 검색 결과/분석/제목/글 검색")
+    parser.add_argument("text", nargs="?", help="찾을 글자")
+    parser.add_argument("--kind", choices=KINDS, help="이 종류에서만 찾기")
+    parser.add_argument("--keyword", help="이 키워드에서만 찾기")
+    parser.add_argument("--limit", type=int, default=30, help="최대 개수 (기본값: 30)")
+    parser.add_argument("--stats", action="store_true", help="종류별 자료 수 출력")
+    args = parser.parse_args()
+    
+    corpus = CorpusStore()
+    
+    if args.stats or not args.text:
+        stats = corpus.stats()
+        print(f"키워드 {stats['keywords']}개")
+        for kind in KINDS:
+            print(f"- {KIND_LABELS[kind]}: {stats['kinds'].get(kind, 0)}개")
+        return
+    
+    started = time.perf_counter()
+    rows = corpus.search(args.text, kind=args.kind, keyword=args.keyword, limit=args.limit)
+    elapsed = (time.perf_counter() - started) * 1000
+    
+    print("=" * 80)
+    print(f"🔎 '{args.text}' 검색 결과 {len(rows)}개 ({elapsed:.1f}ms)")
+    print("=" * 80)
+    for row in rows:
+        when = time.strftime("%Y-%m-%d", time.localtime(row["updated_at"]))
+        print(f"[{KIND_LABELS[row['kind']]}] [{row['keyword']}] {row['title'][:60]} ({when})")
+        if row["link"]:
+            print(f"    {row['link']}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""
+API 비용/토큰 기록
+분석, 제목 생성, 글 작성 요청마다 모델, 입력/캐시/출력 토큰 수, 걸린 시간, 비용을
+로컬 SQLite 파일에 기록하고 키워드별/글별/단계별로 집계합니다.
+
+실행(run) 하나에 예산(USD)을 정하면 요청을 보내기 전에 예상 비용을 더해 보고
+예산을 넘을 요청은 보내지 않습니다. (파이프라인이 BudgetExceeded 오류로 중단)
+
+사용 예:
+    python cost_ledger.py              # 최근 7일 집계
+    python cost_ledger.py --last       # 마지막 실행 집계
+    python cost_ledger.py --run <실행 ID> --days 30
+"""
+import os
+import time
+import uuid
+import sqlite3
+import argparse
+import threading
+from dotenv import load_dotenv
+from cache_store import CACHE_DIR
+from rate_limit import estimate_tokens
+from article_engine import usage_tokens
+
+# .env 파일 로드
+load_dotenv()
+
+# 기록 파일 위치 (캐시를 지워도 남도록 캐시 파일과 분리)
+LEDGER_FILE = os.path.join(CACHE_DIR, "ledger.sqlite3")
+
+# 모델별 가격 (USD / 100만 토큰: 입력, 캐시된 입력, 출력) - 가격이 바뀌면 여기를 수정
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4-turbo": (10.00, 10.00, 30.00)
+}
+
+# 가격을 모르는 모델은 비싼 쪽으로 계산
+DEFAULT_PRICE = MODEL_PRICES["gpt-4-turbo"]
+
+# Batch API 할인율
+BATCH_DISCOUNT = 0.5
+
+# 실행 하나의 기본 예산 (USD, 비어 있으면 제한 없음)
+BUDGET_USD = float(os.getenv("BLOGWRITER_BUDGET_USD") or 0) or None
+
+# 단계 표시 이름
+STAGE_LABELS = {
+    "analysis": "분석",
+    "generation": "제목 생성",
+    "article": "글 작성",
+    "continuation": "이어 쓰기",
+    "trim": "분량 줄이기"
+}
+
+# 글 하나에 드는 단계 (글별 보고서에서 합산)
+ARTICLE_STAGES = ("article", "continuation", "trim")
+
+
+def price_for(model):
+    """
+    모델 가격 (날짜가 붙은 모델 이름은 가장 길게 일치하는 이름의 가격 사용)
+    
+    Returns:
+        tuple: (입력, 캐시된 입력, 출력) USD / 100만 토큰
+    """
+    matches = [name for name in MODEL_PRICES if model == name or model.startswith(name + "-")]
+    return MODEL_PRICES[max(matches, key=len)] if matches else DEFAULT_PRICE
+
+
+def token_cost(model, prompt_tokens, cached_tokens, completion_tokens, batch=False):
+    """
+    토큰 수로 비용(USD)을 계산합니다.
+    
+    Args:
+        model (str): 모델 이름
+        prompt_tokens (int): 입력 토큰 수 (캐시된 토큰 포함)
+        cached_tokens (int): 그중 캐시된 입력 토큰 수
+        completion_tokens (int): 출력 토큰 수
+        batch (bool): Batch API 요청 여부 (할인 적용)
+    
+    Returns:
+        float: 비용 (USD)
+    """
+    input_price, cached_price, output_price = price_for(model)
+    cost = (
+        (prompt_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + completion_tokens * output_price
+    ) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
+
+
+def estimate_cost(model, messages, max_tokens, batch=False):
+    """요청을 보내기 전 최대 예상 비용 (입력 글자 수 기준 + 최대 출력 토큰)"""
+    prompt_tokens = estimate_tokens(messages)
+    return token_cost(model, prompt_tokens, 0, max_tokens or 0, batch=batch)
+
+
+def new_run_id():
+    """실행 ID (예: 20250101-093000-ab12cd)"""
+    return time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+
+class CostLedger:
+    """요청별 토큰/비용 기록 (SQLite)"""
+    
+    def __init__(self, path=LEDGER_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        # 여러 프로그램이 동시에 기록할 수 있도록 WAL 모드 사용
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS usage_ledger (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                stage TEXT NOT NULL,
+                keyword TEXT NOT NULL DEFAULT '',
+                title TEXT NOT NULL DEFAULT '',
+                model TEXT NOT NULL,
+                prompt_tokens INTEGER NOT NULL,
+                cached_tokens INTEGER NOT NULL,
+                completion_tokens INTEGER NOT NULL,
+                latency REAL,
+                cost REAL NOT NULL,
+                batch INTEGER NOT NULL DEFAULT 0
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS usage_ledger_run ON usage_ledger (run_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS usage_ledger_created ON usage_ledger (created_at)")
+        self._conn.commit()
+    
+    def record(self, run_id, stage, model, usage, latency=None, keyword="", title="", batch=False):
+        """
+        요청 하나의 사용량을 기록합니다.
+        
+        Args:
+            run_id (str): 실행 ID
+            stage (str): 단계 (STAGE_LABELS의 키)
+            model (str): 모델 이름
+            usage: 응답의 usage (객체 또는 Batch API 결과의 dict)
+            latency (float): 걸린 시간 (초, Batch API는 None)
+            keyword (str): 키워드
+            title (str): 글 제목 (글 작성 단계)
+            batch (bool): Batch API 요청 여부
+        
+        Returns:
+            float: 비용 (USD)
+        """
+        prompt_tokens, cached_tokens, completion_tokens = usage_tokens(usage)
+        cost = token_cost(model, prompt_tokens, cached_tokens, completion_tokens, batch=batch)
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO usage_ledger (
+                    run_id, created_at, stage, keyword, title, model,
+                    prompt_tokens, cached_tokens, completion_tokens, latency, cost, batch
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (run_id, time.time(), stage, keyword or "", title or "", model,
+                 prompt_tokens, cached_tokens, completion_tokens, latency, cost, int(batch))
+            )
+            self._conn.commit()
+        return cost
+    
+    def _where(self, run_id=None, since=None):
+        clauses, params = [], []
+        if run_id is not None:
+            clauses.append("run_id = ?")
+            params.append(run_id)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+    
+    def summarize(self, group_by="keyword", run_id=None, since=None, limit=None):
+        """
+        사용량을 묶어서 집계합니다.
+        
+        Args:
+            group_by (str): 묶을 기준 (keyword, stage, model, run_id, title)
+            run_id (str): 이 실행만 집계 (None이면 전체)
+            since (float): 이 시각(time.time()) 이후만 집계
+            limit (int): 비용이 큰 순으로 최대 개수
+        
+        Returns:
+            list: dict(name, requests, prompt_tokens, cached_tokens, completion_tokens, cost, tokens_per_sec) 리스트
+        """
+        if group_by not in ("keyword", "stage", "model", "run_id", "title"):
+            raise ValueError(f"알 수 없는 집계 기준입니다: {group_by}")
+        
+        where, params = self._where(run_id, since)
+        query = f"""SELECT {group_by}, COUNT(*), SUM(prompt_tokens), SUM(cached_tokens), SUM(completion_tokens),
+                    SUM(cost), SUM(CASE WHEN latency IS NOT NULL THEN completion_tokens END), SUM(latency)
+                    FROM usage_ledger{where} GROUP BY {group_by} ORDER BY SUM(cost) DESC"""
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        
+        return [
+            {
+                "name": name,
+                "requests": requests,
+                "prompt_tokens": prompt_tokens,
+                "cached_tokens": cached_tokens,
+                "completion_tokens": completion_tokens,
+                "cost": cost,
+                "tokens_per_sec": timed_tokens / latency if latency else None
+            }
+            for name, requests, prompt_tokens, cached_tokens, completion_tokens, cost, timed_tokens, latency in rows
+        ]
+    
+    def articles(self, run_id=None, since=None, limit=20):
+        """
+        글별 사용량 (작성 + 이어 쓰기 + 분량 줄이기 요청을 키워드/제목별로 합산, 비용이 큰 순)
+        
+        Returns:
+            list: (키워드, 제목, 요청 수, 비용, 출력 토큰, 속도를 잰 출력 토큰, 걸린 시간) 튜플 리스트
+        """
+        where, params = self._where(run_id, since)
+        where += (" AND " if where else " WHERE ") + f"stage IN ({', '.join('?' for _ in ARTICLE_STAGES)})"
+        with self._lock:
+            return self._conn.execute(
+                f"""SELECT keyword, title, COUNT(*), SUM(cost), SUM(completion_tokens),
+                    SUM(CASE WHEN latency IS NOT NULL THEN completion_tokens END), SUM(latency)
+                    FROM usage_ledger{where} GROUP BY keyword, title ORDER BY SUM(cost) DESC LIMIT ?""",
+                params + list(ARTICLE_STAGES) + [int(limit)]
+            ).fetchall()
+    
+    def last_run_id(self):
+        """가장 최근 실행 ID (기록이 없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id FROM usage_ledger ORDER BY created_at DESC LIMIT 1"
+            ).fetchone()
+        return row[0] if row else None
+    
+    def close(self):
+        """연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+
+_default_ledger = None
+_default_ledger_lock = threading.Lock()
+
+
+def get_ledger():
+    """
+    공유 비용 기록을 반환합니다.
+    
+    Returns:
+        CostLedger: 비용 기록
+    """
+    global _default_ledger
+    if _default_ledger is None:
+        with _default_ledger_lock:
+            if _default_ledger is None:
+                _default_ledger = CostLedger()
+    return _default_ledger
+
+
+class UsageMeter:
+    """
+    실행 하나의 사용량 기록과 예산 관리
+    요청 전에 예상 비용을 예약(reserve)하고, 응답 후 실제 비용을 기록(record)하며 예약을 풉니다(release).
+    """
+    
+    def __init__(self, ledger=None, run_id=None, budget_usd=BUDGET_USD):
+        """
+        Args:
+            ledger (CostLedger): 비용 기록 (기본값: 공유 기록)
+            run_id (str): 실행 ID (기본값: 새로 생성)
+            budget_usd (float): 예산 (USD, None이면 제한 없음)
+        """
+        self._ledger = ledger
+        self.run_id = run_id or new_run_id()
+        self.budget_usd = budget_usd
+        self.spent = 0.0
+        self.reserved = 0.0
+        self._lock = threading.Lock()
+    
+    @property
+    def ledger(self):
+        if self._ledger is None:
+            self._ledger = get_ledger()
+        return self._ledger
+    
+    def reserve(self, cost):
+        """
+        예상 비용을 예약합니다.
+        
+        Returns:
+            bool: 예약 성공 여부 (예산을 넘으면 False)
+        """
+        with self._lock:
+            if self.budget_usd is not None and self.spent + self.reserved + cost > self.budget_usd:
+                return False
+            self.reserved += cost
+            return True
+    
+    def release(self, cost):
+        """예약한 예상 비용 해제"""
+        with self._lock:
+            self.reserved = max(0.0, self.reserved - cost)
+    
+    def record(self, stage, model, usage, latency=None, keyword="", title="", batch=False):
+        """요청 하나의 사용량을 기록하고 비용을 반환"""
+        cost = self.ledger.record(self.run_id, stage, model, usage, latency, keyword, title, batch)
+        with self._lock:
+            self.spent += cost
+        return cost
+    
+    def remaining(self):
+        """남은 예산 (USD, 제한이 없으면 None)"""
+        if self.budget_usd is None:
+            return None
+        with self._lock:
+            return max(0.0, self.budget_usd - self.spent - self.reserved)
+    
+    def describe(self):
+        """실행 비용 요약 문구 (예: '💰 $0.0123 (분석 $0.0010, 글 작성 $0.0113)')"""
+        stages = self.ledger.summarize("stage", run_id=self.run_id)
+        detail = ", ".join(f"{STAGE_LABELS.get(row['name'], row['name'])} ${row['cost']:.4f}" for row in stages)
+        message = f"💰 ${self.spent:.4f}" + (f" ({detail})" if detail else "")
+        if self.budget_usd is not None:
+            message += f" / 예산 ${self.budget_usd:g}"
+        return message
+
+
+_default_meter = None
+_default_meter_lock = threading.Lock()
+
+
+def get_meter():
+    """
+    프로그램 실행 하나에 공유하는 기본 사용량 기록기 (예산: BLOGWRITER_BUDGET_USD)
+    
+    Returns:
+        UsageMeter: 사용량 기록기
+    """
+    global _default_meter
+    if _default_meter is None:
+        with _default_meter_lock:
+            if _default_meter is None:
+                _default_meter = UsageMeter()
+    return _default_meter
+
+
+def _format_rows(title, rows, name_label=None):
+    lines = [f"[{title}]"]
+    if not rows:
+        return lines + ["  (기록 없음)"]
+    
+    for row in rows:
+        name = row["name"] or "(없음)"
+        if name_label:
+            name = name_label.get(name, name)
+        speed = f", {row['tokens_per_sec']:.0f} 토큰/초" if row["tokens_per_sec"] else ""
+        lines.append(
+            f"  {name[:40]}: ${row['cost']:.4f} | 요청 {row['requests']}개, "
+            f"입력 {row['prompt_tokens']} (캐시 {row['cached_tokens']}), 출력 {row['completion_tokens']}{speed}"
+        )
+    return lines
+
+
+def format_report(ledger, run_id=None, since=None, article_limit=20):
+    """
+    키워드별/단계별/글별 비용 보고서 텍스트
+    
+    Args:
+        ledger (CostLedger): 비용 기록
+        run_id (str): 이 실행만 (None이면 전체)
+        since (float): 이 시각 이후만
+        article_limit (int): 글별 항목 최대 개수 (비용이 큰 순)
+    
+    Returns:
+        str: 보고서 텍스트
+    """
+    total = ledger.summarize("run_id", run_id=run_id, since=since)
+    cost = sum(row["cost"] for row in total)
+    requests = sum(row["requests"] for row in total)
+    
+    lines = [f"총 비용: ${cost:.4f} (요청 {requests}개, 실행 {len(total)}개)", ""]
+    lines += _format_rows("단계별", ledger.summarize("stage", run_id=run_id, since=since), STAGE_LABELS)
+    lines.append("")
+    lines += _format_rows("모델별", ledger.summarize("model", run_id=run_id, since=since))
+    lines.append("")
+    lines += _format_rows("키워드별", ledger.summarize("keyword", run_id=run_id, since=since))
+    lines.append("")
+    
+    rows = ledger.articles(run_id=run_id, since=since, limit=article_limit)
+    lines.append(f"[글별 (비용 상위 {article_limit}개)]")
+    if not rows:
+        lines.append("  (기록 없음)")
+    for keyword, title, requests, article_cost, completion_tokens, timed_tokens, latency in rows:
+        speed = f", {timed_tokens / latency:.0f} 토큰/초" if latency else " (Batch)"
+        lines.append(
+            f"  [{keyword}] {title[:40]}: ${article_cost:.4f} | 요청 {requests}개, 출력 {completion_tokens}{speed}"
+        )
+    
+    return "\n".join(lines)
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="API 비용/토큰 사용량 보고서")
+    parser.add_argument("--run", help="이 실행 ID만 집계")
+    parser.add_argument("--last", action="store_true", help="마지막 실행만 집계")
+    parser.add_argument("--days", type=float, default=7, help="최근 N일만 집계 (기본값: 7, 0 = 전체)")
+    args = parser.parse_args()
+    
+    ledger = get_ledger()
+    run_id = ledger.last_run_id() if args.last else args.run
+    since = time.time() - args.days * 86400 if args.days and run_id is None else None
+    
+    print("=" * 80)
+    print(f"💰 비용 보고서 ({f'실행 {run_id}' if run_id else f'최근 {args.days:g}일' if since else '전체'})")
+    print("=" * 80)
+    print(format_report(ledger, run_id=run_id, since=since))
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,11 @@
 import customtkinter as ctk
-import os
 import json
-import threading
 from tkinter import messagebox, filedialog
 from dotenv import load_dotenv
-from openai import OpenAI
-from naversearch import search_naver_blog
-from prompt import (
-    get_analysis_prompt,
-    get_analysis_system_prompt,
-    get_generation_prompt,
-    get_generation_system_prompt
-)
+from pipeline import BlogPipeline, PipelineError
+from title_dedupe import format_duplicates
+from ui_dispatch import UIDispatcher, ui_thread
+from async_runtime import get_runtime
 
 # .env 파일 로드
 load_dotenv()
@@ -32,9 +26,13 @@ class BlogTitleAnalyzerApp(ctk.CTk):
         # 결과 데이터 저장
         self.results = None
         
+        # 작업 스레드의 화면 업데이트를 메인 루프에서 실행
+        self.ui = UIDispatcher(self)
+        self.ui.start()
+        
         # UI 초기화
         self.create_widgets()
-        
+    
     def create_widgets(self):
         # 메인 컨테이너 (좌우 2분할)
         self.grid_columnconfigure(0, weight=3)
@@ -239,118 +237,74 @@ class BlogTitleAnalyzerApp(ctk.CTk):
         self.progress_bar.set(0)
         self.status_label.configure(text="분석 준비 중...")
         
-        # 스레드로 분석 실행 (UI 블로킹 방지)
+        # 백그라운드 이벤트 루프에서 분석 실행 (UI 블로킹 방지)
         num_search = int(self.search_slider.get())
         num_generate = int(self.generate_slider.get())
         
-        thread = threading.Thread(
-            target=self.analyze_and_generate,
-            args=(keyword, num_search, num_generate)
-        )
-        thread.daemon = True
-        thread.start()
+        get_runtime().submit(self.analyze_and_generate(keyword, num_search, num_generate))
     
-    def analyze_and_generate(self, keyword, num_search, num_generate):
+    async def analyze_and_generate(self, keyword, num_search, num_generate):
         """블로그 제목 분석 및 생성"""
+        pipeline = None
         try:
-            # OpenAI API 클라이언트 초기화
-            api_key = os.getenv("OPEN_AI_API_KEY")
-            if not api_key:
-                self.update_status("❌ OpenAI API 키가 없습니다.", 0)
-                messagebox.showerror("오류", "OpenAI API 키가 .env 파일에 없습니다.")
-                self.analyze_button.configure(state="normal")
-                return
-            
-            client = OpenAI(api_key=api_key)
-            
-            # 1단계: 네이버 블로그 검색
-            self.update_status("🔍 네이버 블로그 검색 중...", 0.1)
-            blog_titles = search_naver_blog(keyword, display=num_search)
-            
-            if not blog_titles:
-                self.update_status("❌ 검색 결과 없음", 0)
-                messagebox.showerror("오류", "검색 결과가 없습니다.")
-                self.analyze_button.configure(state="normal")
-                return
-            
-            self.update_status(f"✅ {len(blog_titles)}개 블로그 제목 수집 완료", 0.3)
-            
-            # 검색 결과 표시
-            search_result = f"'{keyword}' 검색 결과 ({len(blog_titles)}개)\n\n"
-            search_result += "=" * 50 + "\n\n"
-            for idx, title in enumerate(blog_titles, 1):
-                search_result += f"{idx}. {title}\n\n"
-            
-            self.update_textbox(self.search_textbox, search_result)
-            
-            # 2단계: GPT 분석
-            self.update_status("🤖 ChatGPT로 제목 분석 중...", 0.4)
-            
-            titles_text = "\n".join([f"{i+1}. {title}" for i, title in enumerate(blog_titles)])
-            analysis_prompt = get_analysis_prompt(titles_text, keyword)
-            
-            analysis_response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": get_analysis_system_prompt()},
-                    {"role": "user", "content": analysis_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2500
+            pipeline = BlogPipeline(
+                on_progress=lambda stage, message, progress: self.update_status(message, progress)
             )
-            
-            analysis_result = analysis_response.choices[0].message.content
-            self.update_status("✅ 분석 완료!", 0.6)
-            
-            # 분석 결과 표시
-            self.update_textbox(self.analysis_textbox, analysis_result)
-            
-            # 3단계: 새로운 제목 생성
-            self.update_status(f"✨ 새로운 제목 {num_generate}개 생성 중...", 0.7)
-            
-            generation_prompt = get_generation_prompt(analysis_result, titles_text, keyword, num_generate)
-            
-            generation_response = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": get_generation_system_prompt()},
-                    {"role": "user", "content": generation_prompt}
-                ],
-                temperature=0.8,
-                max_tokens=1500
+            pipeline.add_hook("after_search", self.show_search_results)
+            pipeline.add_hook(
+                "after_analysis",
+                lambda keyword, analysis: self.update_textbox(self.analysis_textbox, analysis.to_display())
+            )
+            pipeline.add_hook(
+                "after_generation",
+                lambda keyword, generated_titles, titles: self.update_textbox(self.generated_textbox, generated_titles)
             )
-            
-            generated_titles = generation_response.choices[0].message.content
-            self.update_status("✅ 제목 생성 완료!", 0.9)
-            
-            # 생성된 제목 표시
-            self.update_textbox(self.generated_textbox, generated_titles)
             
             # 결과 저장
-            self.results = {
-                "keyword": keyword,
-                "original_titles": blog_titles,
-                "analysis": analysis_result,
-                "generated_titles": generated_titles
-            }
+            self.results = await pipeline.arun_titles(keyword, num_search, num_generate)
+            
+            if self.results["duplicates"]:
+                self.update_textbox(
+                    self.generated_textbox,
+                    f"{self.results['generated_titles']}\n\n"
+                    f"♻️ 기존 제목과 비슷한 제목 {len(self.results['duplicates'])}개\n"
+                    f"{format_duplicates(self.results['duplicates'])}"
+                )
             
             # 완료
             self.update_status("🎉 모든 작업 완료!", 1.0)
-            self.save_button.configure(state="normal")
-            messagebox.showinfo("완료", "분석이 완료되었습니다!\n각 탭에서 결과를 확인하세요.")
-            
+            self.ui.post(self.save_button.configure, state="normal")
+            self.ui.post(messagebox.showinfo, "완료", "분석이 완료되었습니다!\n각 탭에서 결과를 확인하세요.")
+        
+        except PipelineError as e:
+            self.update_status(e.status, 0)
+            self.ui.post(messagebox.showerror, "오류", str(e))
+        
         except Exception as e:
             self.update_status(f"❌ 오류 발생", 0)
-            messagebox.showerror("오류", f"오류가 발생했습니다:\n{str(e)}")
+            self.ui.post(messagebox.showerror, "오류", f"오류가 발생했습니다:\n{str(e)}")
         
         finally:
-            self.analyze_button.configure(state="normal")
+            if pipeline is not None:
+                await pipeline.aclose()
+            self.ui.post(self.analyze_button.configure, state="normal")
+    
+    def show_search_results(self, keyword, titles):
+        """검색 결과 탭 표시"""
+        search_result = f"'{keyword}' 검색 결과 ({len(titles)}개)\n\n"
+        search_result += "=" * 50 + "\n\n"
+        for idx, title in enumerate(titles, 1):
+            search_result += f"{idx}. {title}\n\n"
+        
+        self.update_textbox(self.search_textbox, search_result)
     
+    @ui_thread(key="status")
     def update_status(self, text, progress):
         """상태 텍스트 및 프로그레스 바 업데이트"""
         self.status_label.configure(text=text)
         self.progress_bar.set(progress)
     
+    @ui_thread(key=lambda textbox, content: id(textbox))
     def update_textbox(self, textbox, content):
         """텍스트박스 내용 업데이트"""
         textbox.configure(state="normal")
@@ -0,0 +1,197 @@
+"""
+블로그 글 작성 작업 기록 (매니페스트)
+작성할 제목, 키워드, 모델, 글자 수 범위와 제목별 진행 상태를 저장 폴더에 기록하여
+중간에 종료되어도 완료된 글은 건너뛰고 나머지만 이어서 작성할 수 있습니다.
+"""
+import os
+import json
+import time
+import tempfile
+import threading
+
+# 저장 폴더 안의 매니페스트 파일 이름
+MANIFEST_FILE = "_job_manifest.json"
+
+# 제목별 상태
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+STATUS_PARTIAL = "partial"
+STATUS_FAILED = "failed"
+# 비슷한 기존 글이 있어 작성하지 않음 (output에 기존 글 위치)
+STATUS_SKIPPED = "skipped"
+
+
+class JobManifest:
+    """제목별 진행 상태를 기록하는 작업 매니페스트"""
+    
+    def __init__(self, path, data):
+        self.path = path
+        self.data = data
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def create(cls, save_dir, titles, keyword, model, min_chars, max_chars):
+        """
+        새 작업 매니페스트를 만들고 저장합니다.
+        
+        Args:
+            save_dir (str): 글을 저장할 폴더
+            titles (list): 작성할 제목 리스트 (순서대로 1번부터 번호 부여)
+            keyword (str): 핵심 키워드
+            model (str): 글 작성 모델
+            min_chars (int): 최소 글자 수
+            max_chars (int): 최대 글자 수
+        
+        Returns:
+            JobManifest: 생성된 매니페스트
+        """
+        now = time.time()
+        data = {
+            "keyword": keyword,
+            "model": model,
+            "min_chars": min_chars,
+            "max_chars": max_chars,
+            "created_at": now,
+            "updated_at": now,
+            "items": [
+                {"idx": idx, "title": title, "status": STATUS_PENDING, "output": None, "error": None}
+                for idx, title in enumerate(titles, 1)
+            ]
+        }
+        manifest = cls(os.path.join(save_dir, MANIFEST_FILE), data)
+        manifest.save()
+        return manifest
+    
+    @classmethod
+    def load(cls, save_dir):
+        """
+        저장 폴더의 매니페스트를 불러옵니다.
+        
+        Args:
+            save_dir (str): 글을 저장한 폴더
+        
+        Returns:
+            JobManifest: 매니페스트 (없으면 None)
+        """
+        path = os.path.join(save_dir, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return None
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(path, json.load(f))
+    
+    @property
+    def keyword(self):
+        return self.data["keyword"]
+    
+    @property
+    def model(self):
+        return self.data["model"]
+    
+    @property
+    def min_chars(self):
+        return self.data["min_chars"]
+    
+    @property
+    def max_chars(self):
+        return self.data["max_chars"]
+    
+    @property
+    def items(self):
+        return self.data["items"]
+    
+    @property
+    def save_dir(self):
+        """글을 저장하는 폴더 (매니페스트가 있는 폴더)"""
+        return os.path.dirname(os.path.abspath(self.path))
+    
+    @property
+    def batch_id(self):
+        """진행 중인 Batch API 작업 ID (없으면 None)"""
+        return self.data.get("batch_id")
+    
+    @property
+    def batch_job(self):
+        """Batch API 작업 안에서 이 매니페스트의 번호 (요청 ID 접두어)"""
+        return self.data.get("batch_job")
+    
+    def set_batch(self, batch_id, job_no=None):
+        """Batch API 작업 ID와 작업 번호를 기록하고 바로 저장 (None이면 기록 삭제)"""
+        with self._lock:
+            self.data["batch_id"] = batch_id
+            self.data["batch_job"] = job_no
+            self.data["updated_at"] = time.time()
+            self._write()
+    
+    def add(self, title):
+        """
+        대기 상태의 제목을 하나 추가하고 바로 저장합니다. (제목이 생성되는 대로 추가할 때 사용)
+        
+        Returns:
+            int: 새 항목의 글 번호
+        """
+        with self._lock:
+            idx = len(self.items) + 1
+            self.items.append({"idx": idx, "title": title, "status": STATUS_PENDING, "output": None, "error": None})
+            self.data["updated_at"] = time.time()
+            self._write()
+            return idx
+    
+    def remaining(self):
+        """
+        아직 완료되지 않은 항목 (대기/실패/일부 저장, 건너뛴 글 제외)
+        
+        Returns:
+            list: (idx, title) 튜플 리스트
+        """
+        with self._lock:
+            return [
+                (item["idx"], item["title"])
+                for item in self.items
+                if item["status"] not in (STATUS_DONE, STATUS_SKIPPED)
+            ]
+    
+    def count(self, status):
+        """상태별 항목 수"""
+        with self._lock:
+            return sum(1 for item in self.items if item["status"] == status)
+    
+    def update(self, idx, status, output=None, error=None):
+        """
+        제목 하나의 상태를 갱신하고 바로 저장합니다.
+        
+        Args:
+            idx (int): 글 번호
+            status (str): 새 상태
+            output (str): 저장된 파일 이름
+            error (str): 실패 사유
+        """
+        with self._lock:
+            for item in self.items:
+                if item["idx"] == idx:
+                    item["status"] = status
+                    item["output"] = output
+                    item["error"] = error
+                    break
+            self.data["updated_at"] = time.time()
+            self._write()
+    
+    def save(self):
+        """매니페스트 저장"""
+        with self._lock:
+            self._write()
+    
+    def _write(self):
+        """임시 파일에 쓴 뒤 교체하여 중간에 종료되어도 파일이 깨지지 않도록 저장 (잠금 상태에서 호출)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".manifest_", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,317 @@
+"""
+연관 키워드 확장 (너비 우선 탐색)
+키워드 하나의 검색 결과(제목/요약)에서 자주 나오는 단어와 연달아 쓰인 단어 쌍을 후보로 뽑아
+다시 검색하는 과정을 깊이/검색 수 한도 안에서 반복하고, 빈도 가중치가 붙은 키워드 그래프를 만듭니다.
+
+후보는 가중치가 큰 순서로 꺼내는 우선순위 대기열(heap)에 넣고, 이미 검색한 검색어는 다시 넣지 않습니다.
+검색은 여러 개를 동시에 요청하며 네이버 검색 캐시를 거치므로 같은 검색어를 다시 실행해도 API를 부르지 않습니다.
+만든 그래프는 분석 프롬프트에 연관 키워드로 들어갑니다.
+"""
+import os
+import re
+import heapq
+import asyncio
+import itertools
+from collections import Counter
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from naversearch import search_naver_results, asearch_naver_results
+from title_stats import tokenize
+
+# 확장 깊이 (1이면 처음 키워드의 검색 결과에서 뽑은 키워드까지만 검색)
+EXPANSION_DEPTH = int(os.getenv("KEYWORD_EXPANSION_DEPTH", 2))
+
+# 처음 키워드를 포함해 검색할 최대 검색어 수
+EXPANSION_MAX_KEYWORDS = int(os.getenv("KEYWORD_EXPANSION_MAX_KEYWORDS", 20))
+
+# 검색어 하나에서 다음 단계로 넘길 후보 수
+EXPANSION_PER_KEYWORD = 5
+
+# 동시에 검색할 검색어 수
+EXPANSION_WORKERS = 4
+
+# 검색어마다 가져올 검색 결과 수
+EXPANSION_DISPLAY = 30
+
+# 후보로 삼을 최소 등장 횟수 (등장한 검색 결과 수)
+MIN_TERM_COUNT = 2
+
+# 분석 프롬프트에 넣을 연관 키워드 수
+PROMPT_KEYWORDS = 15
+
+_SPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_query(query):
+    """방문 여부 확인용 검색어 (소문자, 공백 하나로)"""
+    return _SPACE_PATTERN.sub(" ", query).strip().lower()
+
+
+def mine_terms(keyword, results, top_n=EXPANSION_PER_KEYWORD, min_count=MIN_TERM_COUNT):
+    """
+    검색 결과의 제목/요약에서 자주 나오는 단어와 연달아 쓰인 두 단어를 뽑습니다.
+    한 검색 결과 안에서 여러 번 나와도 한 번으로 셉니다. (검색어에 들어 있는 단어는 제외)
+    
+    Args:
+        keyword (str): 검색어
+        results (list): SearchResult 리스트
+        top_n (int): 뽑을 후보 수
+        min_count (int): 후보로 삼을 최소 등장 횟수
+    
+    Returns:
+        list: (단어, 등장한 검색 결과 수) 튜플 리스트 (많은 순)
+    """
+    exclude = set(tokenize(keyword))
+    counts = Counter()
+    
+    for result in results:
+        terms = set()
+        for text in (result.title, result.description):
+            tokens = [token for token in tokenize(text) if token not in exclude]
+            terms.update(tokens)
+            terms.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        counts.update(terms)
+    
+    return [(term, count) for term, count in counts.most_common(top_n) if count >= min_count]
+
+
+def expansion_query(root, term):
+    """후보 단어로 검색할 검색어 (주제가 벗어나지 않도록 처음 키워드를 붙임)"""
+    if root.replace(" ", "") in term.replace(" ", ""):
+        return term
+    return f"{root} {term}"
+
+
+@dataclass
+class KeywordNode:
+    """그래프의 검색어 하나"""
+    query: str
+    depth: int
+    weight: int = 0
+    results: int = 0
+    parent: str = None
+    searched: bool = False
+    
+    def to_dict(self):
+        return {
+            "query": self.query,
+            "depth": self.depth,
+            "weight": self.weight,
+            "results": self.results,
+            "parent": self.parent,
+            "searched": self.searched
+        }
+
+
+@dataclass
+class KeywordGraph:
+    """연관 키워드 그래프 (노드: 검색어, 간선: 검색어 → 그 검색 결과에서 뽑은 검색어, 가중치: 등장 횟수)"""
+    root: str
+    nodes: dict = field(default_factory=dict)
+    edges: dict = field(default_factory=dict)
+    
+    def add_node(self, query, depth, parent=None):
+        """노드 추가 (이미 있으면 기존 노드)"""
+        key = normalize_query(query)
+        if key not in self.nodes:
+            self.nodes[key] = KeywordNode(query, depth, parent=parent)
+        return self.nodes[key]
+    
+    def add_edge(self, source, target, weight):
+        """간선 추가 (같은 간선이면 가중치를 더함)"""
+        key = (normalize_query(source), normalize_query(target))
+        self.edges[key] = self.edges.get(key, 0) + weight
+        self.nodes[key[1]].weight += weight
+    
+    def related(self, limit=None):
+        """
+        처음 키워드를 뺀 연관 키워드 (가중치가 큰 순)
+        
+        Returns:
+            list: KeywordNode 리스트
+        """
+        root = normalize_query(self.root)
+        nodes = sorted(
+            (node for key, node in self.nodes.items() if key != root),
+            key=lambda node: (-node.weight, node.depth, node.query)
+        )
+        return nodes[:limit] if limit else nodes
+    
+    def to_prompt(self, limit=PROMPT_KEYWORDS):
+        """
+        분석 프롬프트에 넣을 연관 키워드 텍스트
+        
+        Returns:
+            str: 한 줄에 하나씩 '검색어 (가중치 N, M단계)' 형식 (연관 키워드가 없으면 빈 문자열)
+        """
+        return "\n".join(
+            f"- {node.query} (가중치 {node.weight}, {node.depth}단계)" for node in self.related(limit)
+        )
+    
+    def to_dict(self):
+        return {
+            "root": self.root,
+            "nodes": [node.to_dict() for node in self.nodes.values()],
+            "edges": [
+                {"source": self.nodes[source].query, "target": self.nodes[target].query, "weight": weight}
+                for (source, target), weight in self.edges.items()
+            ]
+        }
+
+
+class KeywordExpander:
+    """
+    연관 키워드 확장기 (우선순위 대기열 + 방문 집합)
+    
+    사용 예:
+        graph = KeywordExpander("캠핑", max_depth=2, max_keywords=20).run()
+        print(graph.to_prompt())
+    """
+    
+    def __init__(self, keyword, max_depth=EXPANSION_DEPTH, max_keywords=EXPANSION_MAX_KEYWORDS,
+                 per_keyword=EXPANSION_PER_KEYWORD, workers=EXPANSION_WORKERS, display=EXPANSION_DISPLAY,
+                 refresh=False, search=None, asearch=None, should_stop=None, on_search=None):
+        """
+        Args:
+            keyword (str): 처음 키워드
+            max_depth (int): 확장 깊이
+            max_keywords (int): 처음 키워드를 포함해 검색할 최대 검색어 수
+            per_keyword (int): 검색어 하나에서 뽑을 후보 수
+            workers (int): 동시에 검색할 검색어 수
+            display (int): 검색어마다 가져올 검색 결과 수
+            refresh (bool): True면 검색 캐시를 무시하고 새로 검색
+            search (callable): search(query, display, refresh) → SearchResult 리스트 (기본값: search_naver_results)
+            asearch (callable): search의 asyncio 버전 (기본값: asearch_naver_results)
+            should_stop (callable): 중단 여부를 반환하는 함수
+            on_search (callable): on_search(query, depth, searched, max_keywords) - 검색이 끝날 때마다 호출
+        """
+        self.keyword = keyword
+        self.max_depth = max_depth
+        self.max_keywords = max(1, max_keywords)
+        self.per_keyword = per_keyword
+        self.workers = max(1, workers)
+        self.display = display
+        self.refresh = refresh
+        self.search = search or search_naver_results
+        self.asearch = asearch or asearch_naver_results
+        self.should_stop = should_stop
+        self.on_search = on_search
+        
+        self.graph = KeywordGraph(keyword)
+        self.graph.add_node(keyword, 0)
+        # (-가중치, 깊이, 순번, 검색어) - 가중치가 크고 얕은 후보부터 꺼냄
+        self.frontier = [(0, 0, 0, keyword)]
+        self.visited = set()
+        self.searched = 0
+        self._order = itertools.count(1)
+    
+    def stopped(self):
+        return self.should_stop is not None and self.should_stop()
+    
+    def next_query(self):
+        """
+        대기열에서 아직 검색하지 않은 검색어를 꺼냅니다. (검색어 한도를 넘으면 None)
+        
+        Returns:
+            tuple: (검색어, 깊이) 또는 None
+        """
+        while self.frontier and len(self.visited) < self.max_keywords:
+            _, depth, _, query = heapq.heappop(self.frontier)
+            key = normalize_query(query)
+            if key in self.visited:
+                continue
+            self.visited.add(key)
+            return query, depth
+        return None
+    
+    def handle(self, query, depth, results):
+        """검색 결과에서 후보를 뽑아 그래프와 대기열에 추가"""
+        node = self.graph.nodes[normalize_query(query)]
+        node.searched = True
+        node.results = len(results)
+        self.searched += 1
+        
+        if depth < self.max_depth:
+            for term, count in mine_terms(query, results, self.per_keyword):
+                child = expansion_query(self.keyword, term)
+                key = normalize_query(child)
+                if key == normalize_query(query):
+                    continue
+                self.graph.add_node(child, depth + 1, parent=query)
+                self.graph.add_edge(query, child, count)
+                if key not in self.visited:
+                    heapq.heappush(self.frontier, (-self.graph.nodes[key].weight, depth + 1, next(self._order), child))
+        
+        if self.on_search:
+            self.on_search(query, depth, self.searched, self.max_keywords)
+    
+    def run(self):
+        """
+        스레드 풀로 동시에 검색하며 확장합니다.
+        
+        Returns:
+            KeywordGraph: 연관 키워드 그래프
+        """
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="keyword-expand") as executor:
+            running = {}
+            while True:
+                while len(running) < self.workers and not self.stopped():
+                    item = self.next_query()
+                    if item is None:
+                        break
+                    query, depth = item
+                    running[executor.submit(self.search, query, self.display, self.refresh)] = item
+                
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    query, depth = running.pop(future)
+                    self.handle(query, depth, future.result())
+        
+        return self.graph
+    
+    async def arun(self):
+        """run의 asyncio 버전"""
+        running = {}
+        try:
+            while True:
+                while len(running) < self.workers and not self.stopped():
+                    item = self.next_query()
+                    if item is None:
+                        break
+                    query, depth = item
+                    running[asyncio.ensure_future(self.asearch(query, self.display, self.refresh))] = item
+                
+                if not running:
+                    break
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    query, depth = running.pop(task)
+                    self.handle(query, depth, task.result())
+        finally:
+            for task in running:
+                task.cancel()
+        
+        return self.graph
+
+
+def expand_keywords(keyword, **kwargs):
+    """
+    연관 키워드 그래프를 만듭니다.
+    
+    Args:
+        keyword (str): 처음 키워드
+        **kwargs: KeywordExpander 인자 (max_depth, max_keywords 등)
+    
+    Returns:
+        KeywordGraph: 연관 키워드 그래프
+    """
+    return KeywordExpander(keyword, **kwargs).run()
+
+
+async def aexpand_keywords(keyword, **kwargs):
+    """expand_keywords의 asyncio 버전"""
+    return await KeywordExpander(keyword, **kwargs).arun()
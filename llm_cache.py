@@ -0,0 +1,250 @@
+"""
+ChatGPT 응답 캐시
+(model, messages, temperature, max_tokens)의 해시를 키로 응답 텍스트를 저장하여
+같은 입력의 분석/제목 생성 요청은 API를 다시 호출하지 않습니다.
+"""
+import os
+import json
+import hashlib
+import threading
+from dotenv import load_dotenv
+from cache_store import SQLiteCache
+from rate_limit import chat_completion, achat_completion
+from article_engine import stream_completion, astream_completion
+
+# .env 파일 로드
+load_dotenv()
+
+# 캐시 모드
+# - on: 캐시에 있으면 재사용하고, 없으면 호출 후 저장 (기본값)
+# - off: 캐시를 사용하지 않음
+# - replay: 캐시된 응답만 재생 (없으면 LLMCacheMiss 발생, API를 호출하지 않음)
+CACHE_MODES = ("on", "off", "replay")
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "on")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 2000))
+
+
+class LLMCacheMiss(Exception):
+    """replay 모드에서 캐시된 응답이 없을 때 발생"""
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """
+    공유 응답 캐시를 반환합니다.
+    
+    Returns:
+        SQLiteCache: 응답 캐시
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = SQLiteCache("llm_responses", max_entries=LLM_CACHE_MAX_ENTRIES)
+    return _default_cache
+
+
+def make_cache_key(model, messages, temperature, max_tokens, response_format=None):
+    """
+    요청 내용으로 캐시 키(SHA-256)를 만듭니다.
+    
+    Args:
+        model (str): 모델 이름
+        messages (list): 메시지 리스트
+        temperature (float): 온도
+        max_tokens (int): 최대 토큰 수
+        response_format (dict): 응답 형식 (JSON 스키마 등)
+    
+    Returns:
+        str: 16진수 해시 문자열
+    """
+    request = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    # 응답 형식을 지정하지 않은 요청은 기존 캐시 키를 그대로 사용
+    if response_format is not None:
+        request["response_format"] = response_format
+    
+    payload = json.dumps(request, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _request(model, messages, temperature, max_tokens, response_format=None):
+    """chat.completions.create에 전달할 인자"""
+    request = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    }
+    if response_format is not None:
+        request["response_format"] = response_format
+    return request
+
+
+def _store_nothing(content):
+    pass
+
+
+def lookup(model, messages, temperature, max_tokens, response_format=None, mode=None, refresh=False):
+    """
+    캐시 모드에 따라 캐시된 응답을 찾고, 새 응답을 저장할 함수를 함께 반환합니다.
+    (요청을 보내는 부분만 다른 cached_completion/cached_stream_completion/acached_completion이 함께 사용)
+    
+    Args:
+        mode (str): 캐시 모드 ('on', 'off', 'replay', 기본값: LLM_CACHE_MODE 환경 변수)
+        refresh (bool): True면 캐시된 응답을 무시 (새 응답으로 캐시를 갱신)
+    
+    Returns:
+        tuple: (캐시된 응답 텍스트 또는 None, store(content) - 새 응답을 캐시에 저장하는 함수)
+    
+    Raises:
+        ValueError: 알 수 없는 캐시 모드일 때
+        LLMCacheMiss: replay 모드에서 캐시된 응답이 없을 때
+    """
+    mode = mode or LLM_CACHE_MODE
+    if mode not in CACHE_MODES:
+        raise ValueError(f"알 수 없는 캐시 모드입니다: {mode}")
+    if mode == "off":
+        return None, _store_nothing
+    
+    cache = get_llm_cache()
+    key = make_cache_key(model, messages, temperature, max_tokens, response_format)
+    
+    if mode == "replay" or not refresh:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, _store_nothing
+        if mode == "replay":
+            raise LLMCacheMiss(f"캐시된 응답이 없습니다 (model={model}, key={key[:12]})")
+    
+    return None, lambda content: cache.set(key, content)
+
+
+def _response_text(response, on_usage=None):
+    """응답 텍스트 (토큰 사용량은 on_usage로 전달)"""
+    if on_usage and response.usage is not None:
+        on_usage(response.usage)
+    return response.choices[0].message.content
+
+
+def cached_completion(client, model, messages, temperature, max_tokens, mode=None, refresh=False,
+                      response_format=None, on_usage=None):
+    """
+    캐시를 거쳐 채팅 완성 요청을 보내고 응답 텍스트를 반환합니다.
+    
+    Args:
+        client (OpenAI): OpenAI 클라이언트
+        model (str): 모델 이름
+        messages (list): 메시지 리스트
+        temperature (float): 온도
+        max_tokens (int): 최대 토큰 수
+        mode (str): 캐시 모드 ('on', 'off', 'replay', 기본값: LLM_CACHE_MODE 환경 변수)
+        refresh (bool): True면 캐시를 무시하고 새로 요청한 뒤 캐시를 갱신
+        response_format (dict): 응답 형식 (예: JSON 스키마로 형식을 고정한 출력)
+        on_usage (callable): on_usage(usage) - API를 실제로 호출했을 때 토큰 사용량을 받는 함수
+    
+    Returns:
+        str: 응답 텍스트
+    
+    Raises:
+        LLMCacheMiss: replay 모드에서 캐시된 응답이 없을 때
+    """
+    cached, store = lookup(model, messages, temperature, max_tokens, response_format, mode, refresh)
+    if cached is not None:
+        return cached
+    
+    request = _request(model, messages, temperature, max_tokens, response_format)
+    content = _response_text(chat_completion(client, **request), on_usage)
+    store(content)
+    return content
+
+
+def cached_stream_completion(client, model, messages, temperature, max_tokens, on_chunk, mode=None,
+                             refresh=False, on_usage=None):
+    """
+    캐시를 거쳐 채팅 완성 요청을 스트리밍으로 보내고 응답 텍스트를 반환합니다.
+    캐시에 있으면 저장된 응답을 on_chunk로 한 번에 전달하고, 없으면 받는 대로 전달한 뒤 캐시에 저장합니다.
+    (같은 요청은 cached_completion과 같은 캐시 키를 사용)
+    
+    Args:
+        client (OpenAI): OpenAI 클라이언트
+        model (str): 모델 이름
+        messages (list): 메시지 리스트
+        temperature (float): 온도
+        max_tokens (int): 최대 토큰 수
+        on_chunk (callable): on_chunk(text) - 도착한 텍스트를 전달받는 함수
+        mode (str): 캐시 모드 ('on', 'off', 'replay', 기본값: LLM_CACHE_MODE 환경 변수)
+        refresh (bool): True면 캐시를 무시하고 새로 요청한 뒤 캐시를 갱신
+        on_usage (callable): on_usage(usage) - API를 실제로 호출했을 때 토큰 사용량을 받는 함수
+    
+    Returns:
+        str: 응답 텍스트
+    
+    Raises:
+        LLMCacheMiss: replay 모드에서 캐시된 응답이 없을 때
+    """
+    cached, store = lookup(model, messages, temperature, max_tokens, mode=mode, refresh=refresh)
+    if cached is not None:
+        on_chunk(cached)
+        return cached
+    
+    request = _request(model, messages, temperature, max_tokens)
+    content, _ = stream_completion(client, on_chunk=on_chunk, on_usage=on_usage, **request)
+    store(content)
+    return content
+
+
+async def acached_completion(client, model, messages, temperature, max_tokens, mode=None, refresh=False,
+                             response_format=None, on_usage=None):
+    """
+    cached_completion의 asyncio 버전 (캐시 조회/저장은 로컬 SQLite라 그대로 호출)
+    
+    Args:
+        client (AsyncOpenAI): 비동기 OpenAI 클라이언트
+    
+    Returns:
+        str: 응답 텍스트
+    
+    Raises:
+        LLMCacheMiss: replay 모드에서 캐시된 응답이 없을 때
+    """
+    cached, store = lookup(model, messages, temperature, max_tokens, response_format, mode, refresh)
+    if cached is not None:
+        return cached
+    
+    request = _request(model, messages, temperature, max_tokens, response_format)
+    content = _response_text(await achat_completion(client, **request), on_usage)
+    store(content)
+    return content
+
+
+async def acached_stream_completion(client, model, messages, temperature, max_tokens, on_chunk, mode=None,
+                                    refresh=False, on_usage=None):
+    """
+    cached_stream_completion의 asyncio 버전
+    
+    Args:
+        client (AsyncOpenAI): 비동기 OpenAI 클라이언트
+    
+    Returns:
+        str: 응답 텍스트
+    
+    Raises:
+        LLMCacheMiss: replay 모드에서 캐시된 응답이 없을 때
+    """
+    cached, store = lookup(model, messages, temperature, max_tokens, mode=mode, refresh=refresh)
+    if cached is not None:
+        on_chunk(cached)
+        return cached
+    
+    request = _request(model, messages, temperature, max_tokens)
+    content, _ = await astream_completion(client, on_chunk=on_chunk, on_usage=on_usage, **request)
+    store(content)
+    return content
@@ -1,67 +1,540 @@
 import os
-import urllib.request
-import urllib.parse
+import re
 import json
+import asyncio
+import threading
+from datetime import datetime
+from dataclasses import dataclass, asdict
+from html.entities import html5
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 from dotenv import load_dotenv
+from cache_store import SQLiteCache
+from rate_limit import get_limiter, call_with_retry, acall_with_retry
 
 # .env 파일 로드
 load_dotenv()
 
-def search_naver_blog(keyword, display=20):
+# 네이버 블로그 검색 API 주소
+NAVER_BLOG_SEARCH_URL = "https://openapi.naver.com/v1/search/blog.json"
+
+# 연결/응답 대기 시간 (초)
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 10.0
+
+# 한 번의 요청으로 가져올 수 있는 최대 결과 수
+MAX_DISPLAY = 100
+
+# start 파라미터 한도로 가져올 수 있는 최대 결과 수
+MAX_RESULTS = 1000
+
+# 페이지를 동시에 요청할 개수
+PAGE_WORKERS = 4
+
+# 검색 결과 캐시 유효 시간 (초, 기본 6시간) / 최대 항목 수
+SEARCH_CACHE_TTL = float(os.getenv("NAVER_CACHE_TTL", 6 * 60 * 60))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("NAVER_CACHE_MAX_ENTRIES", 5000))
+
+# 검색 결과의 HTML 태그(<b> 등)와 엔티티(&quot;, &#39;, &#x27; 등)를 한 번에 찾는 패턴
+_MARKUP_PATTERN = re.compile(r"<[^<>]*>|&(?:#([0-9]{1,7})|#[xX]([0-9a-fA-F]{1,6})|([A-Za-z][A-Za-z0-9]{1,31}));")
+
+
+def _decode_markup(match):
+    decimal, hexadecimal, name = match.groups()
+    if name is not None:
+        return html5.get(name + ";", match.group(0))
+    if decimal is None and hexadecimal is None:
+        # 태그는 지움
+        return ""
+    
+    codepoint = int(decimal) if decimal is not None else int(hexadecimal, 16)
+    if codepoint == 0 or codepoint > 0x10FFFF or 0xD800 <= codepoint <= 0xDFFF:
+        return "\ufffd"
+    return chr(codepoint)
+
+
+def strip_html(text):
     """
-    네이버 블로그 검색 API를 사용하여 검색 결과를 가져옵니다.
+    HTML 태그를 지우고 엔티티를 문자로 바꿉니다. (한 번의 패턴 검색으로 처리)
+    엔티티를 바꿔서 생긴 '<'는 다시 태그로 보지 않습니다.
+    
+    예: '<b>캠핑</b> &quot;필수템&quot; &amp; 팁' → '캠핑 "필수템" & 팁'
+    """
+    if not text:
+        return ""
+    return _MARKUP_PATTERN.sub(_decode_markup, text).strip()
+
+
+@dataclass(slots=True)
+class SearchResult:
+    """
+    블로그 검색 결과 한 건 (태그/엔티티를 변환한 값)
+    슬롯을 사용하여 여러 키워드의 검색 결과 수천 개를 들고 있어도 메모리를 적게 씁니다.
+    """
+    title: str
+    link: str = ""
+    description: str = ""
+    bloggername: str = ""
+    bloggerlink: str = ""
+    postdate: str = ""
+    
+    @classmethod
+    def from_item(cls, item):
+        """
+        API 응답 항목으로 결과 생성
+        
+        Args:
+            item (dict): 검색 API의 items 항목
+        
+        Returns:
+            SearchResult: 검색 결과
+        """
+        return cls(
+            title=strip_html(item.get('title')),
+            link=item.get('link') or "",
+            description=strip_html(item.get('description')),
+            bloggername=strip_html(item.get('bloggername')),
+            bloggerlink=item.get('bloggerlink') or "",
+            postdate=item.get('postdate') or ""
+        )
+    
+    @property
+    def date(self):
+        """작성일 (postdate 'YYYYMMDD', 없거나 형식이 다르면 None)"""
+        try:
+            return datetime.strptime(self.postdate, "%Y%m%d").date()
+        except ValueError:
+            return None
+    
+    def to_dict(self):
+        return asdict(self)
+
+
+def page_ranges(total):
+    """
+    가져올 결과 수를 (start, display) 페이지 목록으로 나눕니다.
+    
+    Args:
+        total (int): 가져올 결과 수 (최대: 1000)
+    
+    Returns:
+        list: (start, display) 튜플 리스트
+    """
+    total = max(1, min(int(total), MAX_RESULTS))
+    return [
+        (start, min(MAX_DISPLAY, total - start + 1))
+        for start in range(1, total + 1, MAX_DISPLAY)
+    ]
+
+
+class NaverSearchClient:
+    """
+    네이버 블로그 검색 API 클라이언트
+    keep-alive 연결 풀을 재사용하여 매 요청마다 TCP/TLS 연결을 새로 맺지 않습니다.
+    동기(search_items)와 asyncio(asearch_items) 호출을 모두 지원합니다.
+    """
+    
+    def __init__(self, client_id=None, client_secret=None,
+                 connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 max_connections=10, cache=None):
+        """
+        Args:
+            client_id (str): 네이버 클라이언트 ID (기본값: NAVER_CLIENT_ID 환경 변수)
+            client_secret (str): 네이버 클라이언트 시크릿 (기본값: NAVER_CLIENT_SECRET_KEY 환경 변수)
+            connect_timeout (float): 연결 대기 시간 (초)
+            read_timeout (float): 응답 대기 시간 (초)
+            max_connections (int): 연결 풀의 최대 연결 수
+            cache (SQLiteCache): 검색 결과 캐시 (None이면 캐시 사용 안 함)
+        """
+        self.cache = cache
+        self.client_id = client_id or os.getenv("NAVER_CLIENT_ID")
+        self.client_secret = client_secret or os.getenv("NAVER_CLIENT_SECRET_KEY")
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections
+        )
+        self._client = None
+        self._async_client = None
+        self._lock = threading.Lock()
+    
+    @property
+    def has_credentials(self):
+        """인증 정보가 설정되어 있는지 여부"""
+        return bool(self.client_id and self.client_secret)
+    
+    def _headers(self):
+        return {
+            "X-Naver-Client-Id": self.client_id,
+            "X-Naver-Client-Secret": self.client_secret
+        }
+    
+    def _params(self, keyword, display, sort, start):
+        return {
+            "query": keyword,
+            "display": max(1, min(int(display), MAX_DISPLAY)),
+            "sort": sort,
+            "start": start
+        }
+    
+    def _get_client(self):
+        """동기 HTTP 클라이언트 (처음 호출 시 생성 후 재사용)"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        headers=self._headers(),
+                        timeout=self.timeout,
+                        limits=self.limits
+                    )
+        return self._client
+    
+    def _get_async_client(self):
+        """비동기 HTTP 클라이언트 (처음 호출 시 생성 후 재사용)"""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                headers=self._headers(),
+                timeout=self.timeout,
+                limits=self.limits
+            )
+        return self._async_client
+    
+    def _cache_key(self, params):
+        return json.dumps(
+            [params["query"], params["display"], params["sort"], params["start"]],
+            ensure_ascii=False
+        )
+    
+    def _cached(self, params, refresh):
+        """캐시된 결과 조회 (refresh=True면 조회하지 않음)"""
+        if self.cache is None or refresh:
+            return None
+        return self.cache.get(self._cache_key(params))
+    
+    def _store(self, params, items):
+        if self.cache is not None:
+            self.cache.set(self._cache_key(params), items)
+    
+    def search_items(self, keyword, display=20, sort="sim", start=1, refresh=False):
+        """
+        블로그 검색 결과 원본 항목을 가져옵니다.
+        
+        Args:
+            keyword (str): 검색할 키워드
+            display (int): 가져올 검색 결과 개수 (최대: 100)
+            sort (str): 정렬 방식 ('sim': 정확도순, 'date': 날짜순)
+            start (int): 검색 시작 위치 (1부터 시작)
+            refresh (bool): True면 캐시를 무시하고 새로 검색한 뒤 캐시를 갱신
+        
+        Returns:
+            list: 검색 결과 항목(dict) 리스트
+        
+        Raises:
+            httpx.HTTPError: 연결 실패, 시간 초과, 오류 응답 코드 (재시도 후에도 실패한 경우)
+        """
+        params = self._params(keyword, display, sort, start)
+        cached = self._cached(params, refresh)
+        if cached is not None:
+            return cached
+        
+        def fetch():
+            response = self._get_client().get(NAVER_BLOG_SEARCH_URL, params=params)
+            response.raise_for_status()
+            return response
+        
+        # 속도 제한을 지키며 429/5xx/연결 오류는 다시 시도
+        response = call_with_retry(fetch, get_limiter("naver"))
+        items = response.json().get('items', [])
+        self._store(params, items)
+        return items
+    
+    async def asearch_items(self, keyword, display=20, sort="sim", start=1, refresh=False):
+        """search_items의 asyncio 버전"""
+        params = self._params(keyword, display, sort, start)
+        cached = self._cached(params, refresh)
+        if cached is not None:
+            return cached
+        
+        async def fetch():
+            response = await self._get_async_client().get(NAVER_BLOG_SEARCH_URL, params=params)
+            response.raise_for_status()
+            return response
+        
+        response = await acall_with_retry(fetch, get_limiter("naver"))
+        items = response.json().get('items', [])
+        self._store(params, items)
+        return items
+    
+    def iter_search_pages(self, keyword, total=MAX_RESULTS, sort="sim", max_workers=PAGE_WORKERS, refresh=False):
+        """
+        여러 페이지를 동시에 요청하고, 중복(link 기준)을 제거해 항목을 하나씩 반환합니다.
+        
+        항목은 항상 검색 순위(페이지 start) 순서로 반환합니다. 앞 페이지가 도착하는 대로 바로 반환하고,
+        먼저 도착한 뒤 페이지는 앞 페이지를 모두 반환할 때까지 기다렸다가 반환합니다.
+        
+        Args:
+            keyword (str): 검색할 키워드
+            total (int): 가져올 결과 수 (최대: 1000)
+            sort (str): 정렬 방식 ('sim': 정확도순, 'date': 날짜순)
+            max_workers (int): 동시에 요청할 페이지 수
+            refresh (bool): True면 캐시를 무시하고 새로 검색
+        
+        Yields:
+            dict: 검색 결과 항목
+        """
+        seen = set()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="naver-page") as executor:
+            futures = [
+                executor.submit(self.search_items, keyword, display, sort, start, refresh)
+                for start, display in page_ranges(total)
+            ]
+            try:
+                # 먼저 끝난 뒤 페이지는 그대로 두고 앞 페이지부터 순서대로 반환
+                for future in futures:
+                    for item in future.result():
+                        link = item.get('link')
+                        if link in seen:
+                            continue
+                        seen.add(link)
+                        yield item
+            finally:
+                # 소비를 중단한 경우 아직 시작하지 않은 페이지 요청 취소
+                for future in futures:
+                    future.cancel()
+    
+    async def aiter_search_pages(self, keyword, total=MAX_RESULTS, sort="sim", refresh=False):
+        """iter_search_pages의 asyncio 버전"""
+        seen = set()
+        tasks = [
+            asyncio.ensure_future(self.asearch_items(keyword, display, sort, start, refresh))
+            for start, display in page_ranges(total)
+        ]
+        try:
+            for task in tasks:
+                for item in await task:
+                    link = item.get('link')
+                    if link in seen:
+                        continue
+                    seen.add(link)
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def close(self):
+        """동기 연결 풀 종료"""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+    
+    async def aclose(self):
+        """비동기 연결 풀 종료"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_search_cache():
+    """
+    검색 결과 캐시를 생성합니다. (NAVER_CACHE_DISABLED=1이면 None)
+    
+    Returns:
+        SQLiteCache: 검색 결과 캐시
+    """
+    if os.getenv("NAVER_CACHE_DISABLED") == "1":
+        return None
+    return SQLiteCache(
+        "naver_search",
+        ttl=SEARCH_CACHE_TTL,
+        max_entries=SEARCH_CACHE_MAX_ENTRIES
+    )
+
+
+def get_default_client():
+    """
+    모든 화면에서 함께 쓰는 기본 검색 클라이언트를 반환합니다.
+    
+    Returns:
+        NaverSearchClient: 공유 클라이언트
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = NaverSearchClient(cache=get_search_cache())
+    return _default_client
+
+
+def extract_titles(items):
+    """
+    검색 결과 항목에서 제목만 추출합니다.
+    
+    Args:
+        items (list): 검색 결과 항목 리스트
+    
+    Returns:
+        list: 블로그 제목 리스트 (태그/엔티티 변환)
+    """
+    return [strip_html(item['title']) for item in items]
+
+
+def extract_results(items):
+    """
+    검색 결과 항목을 SearchResult로 변환합니다.
+    
+    Args:
+        items (list): 검색 결과 항목 리스트
+    
+    Returns:
+        list: SearchResult 리스트
+    """
+    return [SearchResult.from_item(item) for item in items]
+
+
+def iter_naver_results(keyword, total=MAX_RESULTS, sort="sim", refresh=False):
+    """
+    여러 페이지를 동시에 검색하여 검색 결과를 순위 순서로 하나씩 반환합니다.
     
     Args:
         keyword (str): 검색할 키워드
-        display (int): 가져올 검색 결과 개수 (기본값: 20, 최대: 100)
+        total (int): 가져올 결과 수 (기본값/최대: 1000)
+        sort (str): 정렬 방식 ('sim': 정확도순, 'date': 날짜순)
+        refresh (bool): True면 캐시를 무시하고 새로 검색
+    
+    Yields:
+        SearchResult: 검색 결과 (link 기준 중복 제거)
+    """
+    client = get_default_client()
+    
+    if not client.has_credentials:
+        print("오류: 네이버 API 인증 정보가 .env 파일에 없습니다.")
+        return
+    
+    for item in client.iter_search_pages(keyword, total=total, sort=sort, refresh=refresh):
+        yield SearchResult.from_item(item)
+
+
+def iter_naver_blog(keyword, total=MAX_RESULTS, sort="sim", refresh=False):
+    """
+    여러 페이지를 동시에 검색하여 블로그 제목을 순위 순서로 하나씩 반환합니다.
+    
+    Yields:
+        str: 블로그 제목 (link 기준 중복 제거)
+    """
+    for result in iter_naver_results(keyword, total=total, sort=sort, refresh=refresh):
+        yield result.title
+
+
+def search_naver_blog(keyword, display=20, refresh=False):
+    """
+    네이버 블로그 검색 API를 사용하여 블로그 제목을 가져옵니다.
+    (제목 외의 링크/요약/작성일이 필요하면 search_naver_results 사용)
+    
+    Args:
+        keyword (str): 검색할 키워드
+        display (int): 가져올 검색 결과 개수 (기본값: 20, 최대: 1000)
+        refresh (bool): True면 캐시를 무시하고 새로 검색한 뒤 캐시를 갱신
     
     Returns:
         list: 블로그 제목 리스트
     """
-    # 환경 변수에서 클라이언트 ID와 시크릿 가져오기
-    client_id = os.getenv("NAVER_CLIENT_ID")
-    client_secret = os.getenv("NAVER_CLIENT_SECRET_KEY")
+    return [result.title for result in search_naver_results(keyword, display, refresh)]
+
+
+def search_naver_results(keyword, display=20, refresh=False):
+    """
+    네이버 블로그 검색 API를 사용하여 검색 결과를 가져옵니다.
+    display가 100보다 크면 여러 페이지를 동시에 요청하여 합칩니다.
+    
+    Args:
+        keyword (str): 검색할 키워드
+        display (int): 가져올 검색 결과 개수 (기본값: 20, 최대: 1000)
+        refresh (bool): True면 캐시를 무시하고 새로 검색한 뒤 캐시를 갱신
+    
+    Returns:
+        list: SearchResult 리스트
+    """
+    client = get_default_client()
     
-    if not client_id or not client_secret:
+    if not client.has_credentials:
         print("오류: 네이버 API 인증 정보가 .env 파일에 없습니다.")
         return []
     
-    # 검색어 URL 인코딩
-    encText = urllib.parse.quote(keyword)
+    if display > MAX_DISPLAY:
+        results = []
+        try:
+            for result in iter_naver_results(keyword, total=display, refresh=refresh):
+                results.append(result)
+        except httpx.HTTPStatusError as e:
+            print(f"오류 코드: {e.response.status_code}")
+        except Exception as e:
+            print(f"API 호출 중 오류 발생: {e}")
+        return results
+    
+    try:
+        items = client.search_items(keyword, display=display, refresh=refresh)
+    except httpx.HTTPStatusError as e:
+        print(f"오류 코드: {e.response.status_code}")
+        return []
+    except Exception as e:
+        print(f"API 호출 중 오류 발생: {e}")
+        return []
+    
+    return extract_results(items)
+
+
+async def asearch_naver_blog(keyword, display=20, refresh=False):
+    """search_naver_blog의 asyncio 버전"""
+    return [result.title for result in await asearch_naver_results(keyword, display, refresh)]
+
+
+async def asearch_naver_results(keyword, display=20, refresh=False):
+    """
+    search_naver_results의 asyncio 버전
+    
+    Args:
+        keyword (str): 검색할 키워드
+        display (int): 가져올 검색 결과 개수 (기본값: 20, 최대: 1000)
+        refresh (bool): True면 캐시를 무시하고 새로 검색한 뒤 캐시를 갱신
     
-    # API URL 생성
-    url = f"https://openapi.naver.com/v1/search/blog.json?query={encText}&display={display}&sort=sim"
+    Returns:
+        list: SearchResult 리스트
+    """
+    client = get_default_client()
     
-    # 요청 생성
-    request = urllib.request.Request(url)
-    request.add_header("X-Naver-Client-Id", client_id)
-    request.add_header("X-Naver-Client-Secret", client_secret)
+    if not client.has_credentials:
+        print("오류: 네이버 API 인증 정보가 .env 파일에 없습니다.")
+        return []
     
     try:
-        # API 호출
-        response = urllib.request.urlopen(request)
-        rescode = response.getcode()
-        
-        if rescode == 200:
-            response_body = response.read()
-            data = json.loads(response_body.decode('utf-8'))
-            
-            # 검색 결과에서 제목만 추출
-            titles = []
-            for item in data.get('items', []):
-                # HTML 태그 제거 (간단한 방법)
-                title = item['title']
-                title = title.replace('<b>', '').replace('</b>', '')
-                titles.append(title)
-            
-            return titles
+        if display > MAX_DISPLAY:
+            items = [item async for item in client.aiter_search_pages(keyword, total=display, refresh=refresh)]
         else:
-            print(f"오류 코드: {rescode}")
-            return []
-            
+            items = await client.asearch_items(keyword, display=display, refresh=refresh)
+    except httpx.HTTPStatusError as e:
+        print(f"오류 코드: {e.response.status_code}")
+        return []
     except Exception as e:
         print(f"API 호출 중 오류 발생: {e}")
         return []
+    
+    return extract_results(items)
 
 
 def main():
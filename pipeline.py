@@ -0,0 +1,1013 @@
+"""
+블로그 파이프라인 엔진
+검색 → 분석 → 제목 생성 → 글 작성 로직을 UI와 분리하여
+CustomTkinter, Streamlit, CLI 화면이 모두 같은 엔진을 사용합니다.
+
+화면은 진행 상황 콜백(on_progress)과 단계별 훅(before_*/after_*)으로 결과를 표시합니다.
+"""
+import os
+import re
+import json
+import asyncio
+import time
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager, asynccontextmanager, nullcontext
+from dotenv import load_dotenv
+from openai import OpenAI, AsyncOpenAI
+from async_runtime import get_runtime
+from naversearch import asearch_naver_results
+from llm_cache import acached_completion, acached_stream_completion
+from article_engine import astream_completion, article_usage
+from cost_ledger import get_meter, estimate_cost
+from title_stats import compute_title_stats
+from title_analysis import TitleAnalysis, ANALYSIS_RESPONSE_FORMAT
+from title_dedupe import TitleIndex, dedupe_titles, SOURCE_SEARCH
+from keyword_expansion import KeywordExpander, EXPANSION_MAX_KEYWORDS
+from corpus_store import get_corpus, REUSE_ANALYSIS_DAYS
+from article_index import ArticleIndex, get_article_index
+from article_length import (
+    MAX_CONTINUATIONS,
+    TRIM_RESPONSE_FORMAT,
+    count_chars,
+    max_tokens_for,
+    length_status,
+    join_continuation,
+    split_paragraphs,
+    number_paragraphs,
+    remove_paragraphs
+)
+from title_prompt import (
+    get_analysis_prompt,
+    get_analysis_system_prompt,
+    get_generation_prompt,
+    get_generation_system_prompt,
+    get_replacement_prompt
+)
+from blog_content_prompt import (
+    get_blog_writing_prompt,
+    get_blog_writing_system_prompt,
+    get_continuation_prompt,
+    get_trim_prompt
+)
+
+# .env 파일 로드
+load_dotenv()
+
+# 분석/제목 생성에 사용하는 모델
+TITLE_MODEL = "gpt-4o-mini"
+
+# 분석 프롬프트에 넣을 최대 제목 수 (통계는 전체 제목으로 계산)
+ANALYSIS_TITLE_LIMIT = 100
+
+# 파이프라인 단계 (훅 이름: before_<단계>, after_<단계>)
+STAGES = ("search", "analysis", "generation", "article")
+
+# 스레드 세마포어(naver_slots, openai_slots) 자리를 기다릴 때 다시 확인하는 간격(초)
+SLOT_POLL_INTERVAL = 0.05
+
+
+class PipelineError(Exception):
+    """
+    파이프라인을 계속할 수 없을 때 발생하는 오류
+    (str(e)는 사용자에게 보여줄 메시지, e.status는 상태 표시줄용 짧은 문구)
+    """
+    
+    def __init__(self, message, status="❌ 오류 발생"):
+        super().__init__(message)
+        self.status = status
+
+
+class BudgetExceeded(PipelineError):
+    """다음 요청을 보내면 실행 예산(USD)을 넘을 때 발생하는 오류"""
+    
+    def __init__(self, message):
+        super().__init__(message, status="❌ 예산 초과")
+
+
+_client = None
+_async_clients = weakref.WeakKeyDictionary()
+_client_lock = threading.Lock()
+
+
+def get_openai_client():
+    """
+    모든 화면에서 함께 쓰는 OpenAI 클라이언트를 반환합니다. (처음 호출 시 한 번만 생성)
+    
+    Returns:
+        OpenAI: 공유 클라이언트
+    
+    Raises:
+        PipelineError: OpenAI API 키가 없을 때
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(**_client_options())
+    return _client
+
+
+def get_async_openai_client():
+    """
+    현재 이벤트 루프에서 함께 쓰는 비동기 OpenAI 클라이언트를 반환합니다. (루프마다 처음 호출 시 한 번만 생성)
+    (연결 풀이 이벤트 루프에 묶이므로 루프마다 하나씩 사용, 코루틴 안에서 호출)
+    
+    Returns:
+        AsyncOpenAI: 공유 비동기 클라이언트
+    
+    Raises:
+        PipelineError: OpenAI API 키가 없을 때
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        with _client_lock:
+            client = _async_clients.get(loop)
+            if client is None:
+                client = _async_clients[loop] = AsyncOpenAI(**_client_options())
+    return client
+
+
+def _client_options():
+    """OpenAI 클라이언트 생성 인자 (API 키가 없으면 PipelineError)"""
+    api_key = os.getenv("OPEN_AI_API_KEY")
+    if not api_key:
+        raise PipelineError(
+            "OpenAI API 키가 .env 파일에 없습니다.",
+            status="❌ OpenAI API 키가 없습니다."
+        )
+    # 재시도는 rate_limit 모듈이 속도 제한과 함께 처리
+    # OPEN_AI_BASE_URL로 호환 서버(예: 로컬 테스트 서버)를 사용할 수 있음
+    return {
+        "api_key": api_key,
+        "base_url": os.getenv("OPEN_AI_BASE_URL") or None,
+        "max_retries": 0
+    }
+
+
+def format_titles(titles):
+    """제목 리스트를 "1. 제목" 형식의 텍스트로 변환"""
+    return "\n".join([f"{i+1}. {title}" for i, title in enumerate(titles)])
+
+
+def parse_titles(text, limit=None):
+    """
+    생성된 제목 텍스트에서 제목만 추출합니다.
+    
+    Args:
+        text (str): 제목 생성 응답 텍스트 ("1. 제목 - 설명" 형식)
+        limit (int): 최대 개수 (None이면 전부)
+    
+    Returns:
+        list: 제목 리스트
+    """
+    titles = [title for title in map(parse_title_line, text.strip().split('\n')) if title]
+    return titles if limit is None else titles[:limit]
+
+
+def parse_title_line(line):
+    """
+    제목 생성 응답의 한 줄에서 제목만 추출합니다.
+    
+    Returns:
+        str: 제목 (제목 줄이 아니면 None)
+    """
+    line = line.strip()
+    if not line:
+        return None
+    
+    # "1. 제목 - 설명" 형식에서 제목만 추출
+    line = re.sub(r'^\d+\.\s*', '', line)
+    if ' - ' in line:
+        line = line.split(' - ')[0].strip()
+    line = line.replace('**', '').strip()
+    
+    return line if len(line) > 5 else None
+
+
+class TitleLineParser:
+    """
+    스트리밍으로 받은 제목 생성 응답을 줄 단위로 나눠
+    줄이 끝날 때마다 제목을 바로 전달합니다. (전체 응답을 기다리지 않고 글 작성 시작)
+    """
+    
+    def __init__(self, on_title, limit=None):
+        self.on_title = on_title
+        self.limit = limit
+        self.pending = ""
+        self.count = 0
+    
+    def feed(self, text):
+        """청크 추가 (완성된 줄만 처리하고 나머지는 다음 청크와 이어 붙임)"""
+        *lines, self.pending = (self.pending + text).split('\n')
+        for line in lines:
+            self._emit(line)
+    
+    def close(self):
+        """스트림이 끝났을 때 마지막 줄 처리"""
+        line, self.pending = self.pending, ""
+        self._emit(line)
+    
+    def _emit(self, line):
+        if self.limit is not None and self.count >= self.limit:
+            return
+        title = parse_title_line(line)
+        if title:
+            self.count += 1
+            self.on_title(title)
+
+
+def sanitize_filename(filename):
+    """파일명에 사용할 수 없는 문자 제거"""
+    invalid_chars = '<>:"/\\|?*'
+    for char in invalid_chars:
+        filename = filename.replace(char, '')
+    filename = filename.replace(' ', '_')
+    if len(filename) > 50:
+        filename = filename[:50]
+    return filename
+
+
+def clean_article(text):
+    """마크다운 볼드체 제거 (**내용** -> 내용)"""
+    return re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+
+
+def save_article(save_dir, idx, title, keyword, content, partial=False):
+    """
+    블로그 글을 "01_제목.txt" 형식의 파일로 저장합니다.
+    
+    Args:
+        save_dir (str): 저장 폴더
+        idx (int): 글 번호 (파일명 접두어)
+        title (str): 블로그 제목
+        keyword (str): 핵심 키워드
+        content (str): 본문
+        partial (bool): 작성 중단으로 일부만 저장되는 글인지 여부
+    
+    Returns:
+        str: 저장된 파일 이름
+    """
+    file_name = f"{idx:02d}_{sanitize_filename(title)}.txt"
+    
+    with open(os.path.join(save_dir, file_name), 'w', encoding='utf-8') as f:
+        f.write(f"제목: {title}\n")
+        f.write(f"키워드: {keyword}\n")
+        f.write(f"글자 수: {len(content)}자\n")
+        if partial:
+            f.write("상태: 작성 중단 (일부만 저장됨)\n")
+        f.write("=" * 80 + "\n\n")
+        f.write(content)
+    
+    # 자료 저장소에도 기록 (Batch API로 받은 글 포함)
+    record_corpus("add_article", keyword, title, content, partial=partial, path=os.path.join(save_dir, file_name))
+    return file_name
+
+
+def record_corpus(method, *args, corpus=None, **kwargs):
+    """
+    자료 저장소에 기록합니다. (저장소를 끄거나 기록에 실패해도 작업은 계속)
+    
+    Args:
+        method (str): CorpusStore 메서드 이름 (add_search_results, add_analysis 등)
+        corpus (CorpusStore): 기록할 저장소 (기본값: 공유 저장소)
+    """
+    corpus = corpus or get_corpus()
+    if corpus is None:
+        return
+    try:
+        getattr(corpus, method)(*args, **kwargs)
+    except sqlite3.Error as e:
+        print(f"자료 저장소 기록 실패: {e}")
+
+
+@asynccontextmanager
+async def thread_slot(slots):
+    """
+    스레드 세마포어(threading.Semaphore) 자리를 이벤트 루프를 막지 않고 기다립니다.
+    (여러 스레드의 파이프라인이 같은 세마포어로 동시 요청 수를 나눌 때 사용, 취소하면 자리를 잡지 않음)
+    
+    Args:
+        slots: acquire/release가 있는 세마포어 (nullcontext처럼 없으면 제한 없음)
+    """
+    if not hasattr(slots, "acquire"):
+        yield
+        return
+    while not slots.acquire(blocking=False):
+        await asyncio.sleep(SLOT_POLL_INTERVAL)
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+def article_request(keyword, title, model="gpt-4o-mini", min_chars=2000, max_chars=3000, reference=None):
+    """
+    블로그 글 작성 요청 인자 (스트리밍 작성과 Batch API 작성이 함께 사용)
+    고정 지침(시스템 프롬프트)을 앞에 두어 모든 요청이 같은 앞부분을 공유하므로 프롬프트 캐시가 적용됩니다.
+    출력 토큰 한도(max_tokens)는 최대 글자 수로 정합니다.
+    reference(참고할 기존 글)를 주면 사용자 프롬프트에 함께 넣습니다.
+    
+    Returns:
+        dict: chat.completions.create에 전달할 인자 (model, messages, temperature, max_tokens)
+    """
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": get_blog_writing_system_prompt()},
+            {"role": "user", "content": get_blog_writing_prompt(title, keyword, min_chars, max_chars, reference)}
+        ],
+        "temperature": 0.7,
+        "max_tokens": max_tokens_for(max_chars, model)
+    }
+
+
+class BlogPipeline:
+    """
+    검색 → 분석 → 제목 생성 → 글 작성 파이프라인
+    
+    사용 예:
+        pipeline = BlogPipeline(on_progress=lambda stage, message, progress: print(message))
+        pipeline.add_hook("after_search", lambda keyword, titles: ...)
+        results = pipeline.run_titles("파이썬 웹 크롤링")
+    
+    각 단계는 이름이 a로 시작하는 코루틴(arun_titles, awrite_article 등)으로 한 번만 구현되어 있고,
+    같은 이름의 동기 메서드(run_titles, write_article 등)는 그 코루틴을 공유 이벤트 루프(async_runtime)에서
+    실행하고 끝날 때까지 기다립니다. (동기 메서드를 이벤트 루프 스레드에서 호출하면 RuntimeError)
+    훅과 콜백(on_progress, on_chunk, on_title, should_stop)은 이벤트 루프 스레드에서 호출됩니다.
+    """
+    
+    def __init__(self, client=None, on_progress=None, naver_slots=None, openai_slots=None, meter=None,
+                 async_slots=None, corpus=None, reuse_analysis_days=REUSE_ANALYSIS_DAYS, article_index=None):
+        """
+        Args:
+            client (OpenAI): 동기 OpenAI 클라이언트 (Batch API용, 기본값: 공유 클라이언트)
+            on_progress (callable): on_progress(stage, message, progress) - 진행 상황 콜백 (progress는 0~1)
+            naver_slots: 네이버 API 동시 요청 수를 제한하는 스레드 세마포어 (기본값: 제한 없음)
+            openai_slots: OpenAI API 동시 요청 수를 제한하는 스레드 세마포어 (기본값: 제한 없음)
+            meter (UsageMeter): 토큰/비용 기록과 예산 (기본값: 프로그램 공용 기록기)
+            async_slots (asyncio.Semaphore): 한 이벤트 루프 안의 OpenAI 동시 요청 수 제한 (기본값: 제한 없음)
+            corpus (CorpusStore): 검색 결과/분석/제목을 기록할 저장소 (기본값: 공유 저장소)
+            reuse_analysis_days (float): 이 기간(일) 안에 같은 키워드를 분석한 기록이 있으면 다시 사용 (0이면 항상 분석)
+            article_index (ArticleIndex): 비슷한 기존 글을 찾을 색인 (기본값: 공유 저장소의 색인)
+        """
+        self._client = client
+        self.on_progress = on_progress
+        self.naver_slots = naver_slots or nullcontext()
+        self.openai_slots = openai_slots or nullcontext()
+        self.async_slots = async_slots or nullcontext()
+        self.meter = meter or get_meter()
+        self.corpus = corpus or get_corpus()
+        self.reuse_analysis_days = reuse_analysis_days
+        if article_index is None and self.corpus is not None:
+            article_index = get_article_index() if corpus is None else ArticleIndex(self.corpus)
+        self.article_index = article_index
+        self.hooks = {}
+    
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_openai_client()
+        return self._client
+    
+    @property
+    def async_client(self):
+        """현재 이벤트 루프의 공유 비동기 클라이언트 (코루틴 안에서 사용)"""
+        return get_async_openai_client()
+    
+    def require_api_key(self):
+        """
+        OpenAI API 키가 있는지 확인합니다. (요청을 보내기 전에 중단할 수 있도록, 클라이언트는 만들지 않음)
+        
+        Raises:
+            PipelineError: OpenAI API 키가 없을 때
+        """
+        _client_options()
+    
+    async def aclose(self):
+        """이전 버전과의 호환용 (비동기 클라이언트는 루프마다 공유하므로 연결 풀을 닫지 않음)"""
+    
+    def _run(self, coro):
+        """코루틴을 공유 이벤트 루프에서 실행하고 결과를 기다림 (동기 메서드용)"""
+        return get_runtime().run(coro)
+    
+    @asynccontextmanager
+    async def _openai_slot(self):
+        """OpenAI 요청 하나의 동시 요청 수 제한 (이벤트 루프 안의 async_slots와 스레드 사이의 openai_slots)"""
+        async with self.async_slots, thread_slot(self.openai_slots):
+            yield
+    
+    def add_hook(self, event, fn):
+        """
+        단계별 훅 등록
+        
+        Args:
+            event (str): 'before_<단계>' 또는 'after_<단계>' (단계: search, expansion, analysis, generation, article)
+            fn (callable): 키워드 인자로 호출되는 함수
+        """
+        self.hooks.setdefault(event, []).append(fn)
+        return self
+    
+    def emit(self, event, **data):
+        """등록된 훅 호출"""
+        for fn in self.hooks.get(event, []):
+            fn(**data)
+    
+    def progress(self, stage, message, progress):
+        """진행 상황 콜백 호출"""
+        if self.on_progress:
+            self.on_progress(stage, message, progress)
+    
+    def check_budget(self, cost):
+        """
+        예상 비용을 예산에서 예약합니다. (응답 후 meter.release로 해제)
+        
+        Raises:
+            BudgetExceeded: 예약하면 예산을 넘을 때
+        """
+        if not self.meter.reserve(cost):
+            raise BudgetExceeded(
+                f"예산을 넘지 않도록 요청을 보내지 않았습니다.\n\n"
+                f"- 예산: ${self.meter.budget_usd:g}\n"
+                f"- 사용한 비용: ${self.meter.spent:.4f}\n"
+                f"- 다음 요청 예상 비용: 최대 ${cost:.4f}"
+            )
+    
+    @contextmanager
+    def metered(self, stage, model, messages, max_tokens, keyword="", title=""):
+        """
+        요청 하나의 토큰/비용/걸린 시간을 기록합니다. (예산을 넘을 요청이면 보내기 전에 중단)
+        
+        사용 예:
+            with self.metered("analysis", model, messages, 2500, keyword) as usages:
+                await acached_completion(..., on_usage=usages.append)
+        
+        Yields:
+            list: 응답의 usage를 넣을 리스트 (API를 호출하지 않은 캐시 응답이면 비어 있음)
+        
+        Raises:
+            BudgetExceeded: 예산을 넘을 때
+        """
+        estimate = estimate_cost(model, messages, max_tokens)
+        self.check_budget(estimate)
+        usages = []
+        started = time.monotonic()
+        try:
+            yield usages
+        finally:
+            self.meter.release(estimate)
+            if usages:
+                self.meter.record(stage, model, usages[0], time.monotonic() - started, keyword, title)
+    
+    def search(self, keyword, num_search=30, refresh=False):
+        """asearch의 동기 버전"""
+        return self._run(self.asearch(keyword, num_search, refresh))
+    
+    async def asearch(self, keyword, num_search=30, refresh=False):
+        """
+        1단계: 네이버 블로그 검색
+        
+        Returns:
+            list: 블로그 제목 리스트
+        
+        Raises:
+            PipelineError: 검색 결과가 없을 때
+        """
+        return [result.title for result in await self.asearch_results(keyword, num_search, refresh)]
+    
+    def search_results(self, keyword, num_search=30, refresh=False):
+        """asearch_results의 동기 버전"""
+        return self._run(self.asearch_results(keyword, num_search, refresh))
+    
+    async def asearch_results(self, keyword, num_search=30, refresh=False):
+        """
+        1단계: 네이버 블로그 검색 (제목과 함께 링크/요약/블로거/작성일을 담은 결과)
+        after_search 훅에는 제목 리스트가 전달됩니다.
+        
+        Returns:
+            list: SearchResult 리스트
+        
+        Raises:
+            PipelineError: 검색 결과가 없을 때
+        """
+        self.emit("before_search", keyword=keyword)
+        results = await self._asearch_naver(keyword, num_search, refresh)
+        if not results:
+            raise PipelineError("검색 결과가 없습니다.", status="❌ 검색 결과 없음")
+        
+        self.emit("after_search", keyword=keyword, titles=[result.title for result in results])
+        return results
+    
+    async def _asearch_naver(self, query, display, refresh):
+        """네이버 검색 한 번 (동시 요청 수 제한, 자료 저장소 기록)"""
+        async with thread_slot(self.naver_slots):
+            results = await asearch_naver_results(query, display=display, refresh=refresh)
+        if results:
+            record_corpus("add_search_results", query, results, corpus=self.corpus)
+        return results
+    
+    def expand_keywords(self, keyword, depth, max_keywords=EXPANSION_MAX_KEYWORDS, refresh=False):
+        """aexpand_keywords의 동기 버전"""
+        return self._run(self.aexpand_keywords(keyword, depth, max_keywords, refresh))
+    
+    async def aexpand_keywords(self, keyword, depth, max_keywords=EXPANSION_MAX_KEYWORDS, refresh=False):
+        """
+        검색 결과의 제목/요약에서 연관 키워드를 뽑아 다시 검색하며 키워드 그래프를 만듭니다.
+        (처음 키워드의 검색은 검색 캐시에 있으므로 다시 요청하지 않음)
+        
+        Args:
+            keyword (str): 처음 키워드
+            depth (int): 확장 깊이
+            max_keywords (int): 처음 키워드를 포함해 검색할 최대 검색어 수
+            refresh (bool): True면 검색 캐시를 무시하고 새로 검색
+        
+        Returns:
+            KeywordGraph: 연관 키워드 그래프
+        """
+        self.emit("before_expansion", keyword=keyword)
+        
+        def on_search(query, depth, searched, limit):
+            self.progress(
+                "expansion", f"🌐 연관 키워드 검색 중... ({searched}/{limit}) {query}", 0.3 + 0.1 * searched / limit
+            )
+        
+        expander = KeywordExpander(
+            keyword, max_depth=depth, max_keywords=max_keywords, refresh=refresh,
+            asearch=self._asearch_naver, on_search=on_search
+        )
+        graph = await expander.arun()
+        self.emit("after_expansion", keyword=keyword, graph=graph)
+        return graph
+    
+    def analyze(self, keyword, blog_titles, refresh=False, graph=None):
+        """aanalyze의 동기 버전"""
+        return self._run(self.aanalyze(keyword, blog_titles, refresh, graph))
+    
+    async def aanalyze(self, keyword, blog_titles, refresh=False, graph=None):
+        """
+        2단계: 수집한 제목 분석 (JSON 스키마로 형식을 고정한 응답)
+        길이/키워드 빈도 같은 통계는 직접 계산해 프롬프트에 넣고, LLM은 정성적 분석만 합니다.
+        graph(연관 키워드 그래프)를 넘기면 연관 키워드도 프롬프트에 넣습니다.
+        reuse_analysis_days 안에 같은 키워드를 분석한 기록이 자료 저장소에 있으면 요청하지 않고 다시 사용합니다.
+        (통계 항목은 이번 검색 결과로 다시 계산, refresh나 graph를 주면 새로 분석)
+        
+        Returns:
+            TitleAnalysis: 분석 결과
+        
+        Raises:
+            PipelineError: 분석 응답을 해석할 수 없을 때
+        """
+        past = self._past_analysis(keyword, blog_titles, refresh, graph)
+        if past is not None:
+            return past
+        
+        self.emit("before_analysis", keyword=keyword, titles=blog_titles)
+        
+        stats = compute_title_stats(blog_titles)
+        analysis_prompt = get_analysis_prompt(
+            format_titles(blog_titles[:ANALYSIS_TITLE_LIMIT]), keyword, stats.to_prompt(),
+            graph.to_prompt() if graph is not None else ""
+        )
+        messages = [
+            {"role": "system", "content": get_analysis_system_prompt()},
+            {"role": "user", "content": analysis_prompt}
+        ]
+        
+        async with self._openai_slot():
+            with self.metered("analysis", TITLE_MODEL, messages, 2500, keyword) as usages:
+                response_text = await acached_completion(
+                    self.async_client,
+                    model=TITLE_MODEL,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=2500,
+                    refresh=refresh,
+                    response_format=ANALYSIS_RESPONSE_FORMAT,
+                    on_usage=usages.append
+                )
+        
+        try:
+            analysis_result = TitleAnalysis.from_json(response_text, stats.to_analysis_fields())
+        except ValueError as e:
+            raise PipelineError(str(e), status="❌ 분석 결과 오류")
+        
+        record_corpus("add_analysis", keyword, analysis_result.to_dict(), corpus=self.corpus)
+        self.emit("after_analysis", keyword=keyword, analysis=analysis_result)
+        return analysis_result
+    
+    def _past_analysis(self, keyword, blog_titles, refresh, graph):
+        """다시 사용할 이전 분석 결과 (없거나 사용하지 않으면 None)"""
+        if refresh or graph is not None or not self.reuse_analysis_days or self.corpus is None:
+            return None
+        
+        try:
+            data = self.corpus.latest_analysis(keyword, max_age=self.reuse_analysis_days * 86400)
+        except sqlite3.Error:
+            return None
+        if data is None:
+            return None
+        
+        self.emit("before_analysis", keyword=keyword, titles=blog_titles)
+        self.progress("analysis", "♻️ 이전 분석 결과를 다시 사용합니다.", 0.5)
+        stats = compute_title_stats(blog_titles)
+        analysis_result = TitleAnalysis.from_dict({**data, **stats.to_analysis_fields()})
+        self.emit("after_analysis", keyword=keyword, analysis=analysis_result)
+        return analysis_result
+    
+    def generate_titles(self, keyword, blog_titles, analysis_result, num_generate=10, refresh=False,
+                        on_title=None):
+        """agenerate_titles의 동기 버전"""
+        return self._run(self.agenerate_titles(keyword, blog_titles, analysis_result, num_generate, refresh, on_title))
+    
+    async def agenerate_titles(self, keyword, blog_titles, analysis_result, num_generate=10, refresh=False,
+                               on_title=None):
+        """
+        3단계: 분석 결과를 바탕으로 새로운 제목 생성
+        (분석 결과는 원문 대신 짧은 요약만 프롬프트에 넣음)
+        
+        Args:
+            analysis_result (TitleAnalysis): 분석 결과
+            on_title (callable): on_title(title) - 지정하면 응답을 스트리밍으로 받아
+                제목 한 줄이 완성될 때마다 바로 전달 (최대 num_generate개)
+        
+        Returns:
+            str: 제목 생성 응답 텍스트 (parse_titles로 제목만 추출)
+        """
+        self.emit("before_generation", keyword=keyword)
+        
+        generation_prompt = get_generation_prompt(
+            analysis_result.to_compact(), format_titles(blog_titles), keyword, num_generate
+        )
+        messages = [
+            {"role": "system", "content": get_generation_system_prompt()},
+            {"role": "user", "content": generation_prompt}
+        ]
+        
+        async with self._openai_slot():
+            with self.metered("generation", TITLE_MODEL, messages, 1500, keyword) as usages:
+                if on_title is None:
+                    generated_titles = await acached_completion(
+                        self.async_client,
+                        model=TITLE_MODEL,
+                        messages=messages,
+                        temperature=0.8,
+                        max_tokens=1500,
+                        refresh=refresh,
+                        on_usage=usages.append
+                    )
+                else:
+                    parser = TitleLineParser(on_title, num_generate)
+                    generated_titles = await acached_stream_completion(
+                        self.async_client,
+                        model=TITLE_MODEL,
+                        messages=messages,
+                        temperature=0.8,
+                        max_tokens=1500,
+                        refresh=refresh,
+                        on_chunk=parser.feed,
+                        on_usage=usages.append
+                    )
+                    parser.close()
+        
+        titles = parse_titles(generated_titles, num_generate)
+        record_corpus("add_titles", keyword, titles, corpus=self.corpus)
+        self.emit("after_generation", keyword=keyword, generated_titles=generated_titles, titles=titles)
+        return generated_titles
+    
+    def title_index(self, blog_titles):
+        """검색한 블로그 제목을 넣은 유사도 색인 (생성된 제목을 이어서 추가하며 확인)"""
+        index = TitleIndex()
+        index.add_all(blog_titles, SOURCE_SEARCH)
+        return index
+    
+    def replace_titles(self, keyword, analysis_result, kept_titles, rejected_titles, num_generate, refresh=False):
+        """areplace_titles의 동기 버전"""
+        return self._run(
+            self.areplace_titles(keyword, analysis_result, kept_titles, rejected_titles, num_generate, refresh)
+        )
+    
+    async def areplace_titles(self, keyword, analysis_result, kept_titles, rejected_titles, num_generate,
+                              refresh=False):
+        """
+        비슷한 제목으로 걸러낸 자리를 채울 제목을 다시 생성합니다.
+        
+        Returns:
+            list: 새 제목 리스트 (유사도 확인 전)
+        """
+        messages = [
+            {"role": "system", "content": get_generation_system_prompt()},
+            {"role": "user", "content": get_replacement_prompt(
+                analysis_result.to_compact(), keyword, kept_titles, rejected_titles, num_generate
+            )}
+        ]
+        
+        async with self._openai_slot():
+            with self.metered("generation", TITLE_MODEL, messages, 800, keyword) as usages:
+                text = await acached_completion(
+                    self.async_client,
+                    model=TITLE_MODEL,
+                    messages=messages,
+                    temperature=0.9,
+                    max_tokens=800,
+                    refresh=refresh,
+                    on_usage=usages.append
+                )
+        
+        titles = parse_titles(text, num_generate)
+        record_corpus("add_titles", keyword, titles, corpus=self.corpus)
+        return titles
+    
+    def filter_titles(self, keyword, titles, blog_titles, analysis_result, num_generate=10, replace=False,
+                      refresh=False):
+        """afilter_titles의 동기 버전"""
+        return self._run(
+            self.afilter_titles(keyword, titles, blog_titles, analysis_result, num_generate, replace, refresh)
+        )
+    
+    async def afilter_titles(self, keyword, titles, blog_titles, analysis_result, num_generate=10, replace=False,
+                             refresh=False):
+        """
+        생성된 제목 중 서로 비슷하거나 검색한 블로그 제목과 비슷한 제목을 걸러냅니다.
+        (비슷한 제목에 글을 작성하는 비용을 줄이고 선택 목록을 깔끔하게 유지)
+        
+        Args:
+            titles (list): 생성된 제목 리스트
+            blog_titles (list): 검색한 블로그 제목 리스트
+            analysis_result (TitleAnalysis): 분석 결과 (대체 제목 생성용)
+            num_generate (int): 남길 최대 제목 수
+            replace (bool): True면 걸러낸 만큼 한 번 더 생성해 채움 (새 제목도 같은 기준으로 확인)
+        
+        Returns:
+            DedupeResult: 남긴 제목(kept, 최대 num_generate개)과 걸러낸 제목(duplicates)
+        """
+        index = self.title_index(blog_titles)
+        result = dedupe_titles(titles, index=index)
+        
+        missing = num_generate - len(result.kept) if replace and result.duplicates else 0
+        if missing > 0:
+            self.progress("generation", f"♻️ 비슷한 제목 {len(result.duplicates)}개를 대신할 제목 생성 중...", 0.85)
+            replacements = await self.areplace_titles(
+                keyword, analysis_result, result.kept, [d.title for d in result.duplicates], missing, refresh=refresh
+            )
+            more = dedupe_titles(replacements, index=index)
+            result.kept += more.kept
+            result.duplicates += more.duplicates
+        
+        result.kept = result.kept[:num_generate]
+        return result
+    
+    def run_titles(self, keyword, num_search=30, num_generate=10, refresh=False, replace_duplicates=False,
+                   expand_depth=0, expand_keywords=EXPANSION_MAX_KEYWORDS):
+        """arun_titles의 동기 버전"""
+        return self._run(
+            self.arun_titles(keyword, num_search, num_generate, refresh, replace_duplicates, expand_depth,
+                             expand_keywords)
+        )
+    
+    async def arun_titles(self, keyword, num_search=30, num_generate=10, refresh=False, replace_duplicates=False,
+                          expand_depth=0, expand_keywords=EXPANSION_MAX_KEYWORDS):
+        """
+        검색 → 분석 → 제목 생성을 차례로 실행합니다.
+        생성된 제목 중 서로 비슷하거나 검색 결과와 비슷한 제목은 titles에서 빠지고 duplicates에 기록됩니다.
+        태스크를 취소하면 진행 중인 요청을 바로 중단합니다.
+        
+        Args:
+            keyword (str): 검색할 키워드
+            num_search (int): 검색할 블로그 수
+            num_generate (int): 생성할 제목 수
+            refresh (bool): True면 검색/응답 캐시를 무시하고 새로 실행
+            replace_duplicates (bool): True면 걸러낸 제목 수만큼 한 번 더 생성해 채움
+            expand_depth (int): 0보다 크면 그 깊이까지 연관 키워드를 확장해 분석에 사용
+            expand_keywords (int): 연관 키워드를 확장할 때 검색할 최대 검색어 수
+        
+        Returns:
+            dict: keyword, original_titles, search_results(검색 결과 dict 리스트: 제목/링크/요약/블로거/작성일),
+                analysis(분석 결과 dict), generated_titles(응답 원문),
+                titles(글을 작성할 제목 리스트), duplicates(걸러낸 제목 dict 리스트),
+                keyword_graph(연관 키워드 그래프 dict, 확장하지 않으면 None)
+        
+        Raises:
+            PipelineError: API 키가 없거나 검색 결과가 없을 때
+        """
+        # API 키가 없으면 검색 전에 중단
+        self.require_api_key()
+        
+        self.progress("search", "🔍 네이버 블로그 검색 중...", 0.1)
+        search_results = await self.asearch_results(keyword, num_search, refresh=refresh)
+        blog_titles = [result.title for result in search_results]
+        self.progress("search", f"✅ {len(blog_titles)}개 블로그 제목 수집 완료", 0.3)
+        
+        graph = None
+        if expand_depth > 0:
+            graph = await self.aexpand_keywords(keyword, expand_depth, expand_keywords, refresh=refresh)
+        
+        self.progress("analysis", "🤖 ChatGPT로 제목 분석 중...", 0.4)
+        analysis_result = await self.aanalyze(keyword, blog_titles, refresh=refresh, graph=graph)
+        self.progress("analysis", "✅ 분석 완료!", 0.6)
+        
+        self.progress("generation", f"✨ 새로운 제목 {num_generate}개 생성 중...", 0.7)
+        generated_titles = await self.agenerate_titles(
+            keyword, blog_titles, analysis_result, num_generate, refresh=refresh
+        )
+        
+        filtered = await self.afilter_titles(
+            keyword, parse_titles(generated_titles), blog_titles, analysis_result, num_generate,
+            replace=replace_duplicates, refresh=refresh
+        )
+        if filtered.duplicates:
+            self.progress("generation", f"✅ 제목 생성 완료! (비슷한 제목 {len(filtered.duplicates)}개 제외)", 0.9)
+        else:
+            self.progress("generation", "✅ 제목 생성 완료!", 0.9)
+        
+        return {
+            "keyword": keyword,
+            "original_titles": blog_titles,
+            "search_results": [result.to_dict() for result in search_results],
+            "analysis": analysis_result.to_dict(),
+            "generated_titles": generated_titles,
+            "titles": filtered.kept,
+            "duplicates": [duplicate.to_dict() for duplicate in filtered.duplicates],
+            "keyword_graph": graph.to_dict() if graph is not None else None
+        }
+    
+    def write_article(self, keyword, title, model="gpt-4o-mini", min_chars=2000, max_chars=3000,
+                      should_stop=None, on_chunk=None, reference=None):
+        """awrite_article의 동기 버전"""
+        return self._run(
+            self.awrite_article(keyword, title, model, min_chars, max_chars, should_stop, on_chunk, reference)
+        )
+    
+    async def awrite_article(self, keyword, title, model="gpt-4o-mini", min_chars=2000, max_chars=3000,
+                             should_stop=None, on_chunk=None, reference=None):
+        """
+        4단계: 블로그 글 작성 (스트리밍)
+        글자 수가 범위를 벗어나면 afit_length로 보정합니다.
+        after_article 훅의 usage에는 첫 작성 요청의 토큰 사용량(캐시된 입력 토큰 포함)이 전달됩니다. (중단 시 None)
+        should_stop이 True가 되면 지금까지 받은 내용을 반환하고(중단 여부 True),
+        태스크를 취소하면 스트림을 닫고 CancelledError를 그대로 전달합니다.
+        
+        Args:
+            keyword (str): 핵심 키워드
+            title (str): 블로그 제목
+            model (str): 글 작성 모델
+            min_chars (int): 최소 글자 수
+            max_chars (int): 최대 글자 수
+            should_stop (callable): 중단 여부를 반환하는 함수
+            on_chunk (callable): 스트리밍 텍스트를 전달받는 함수
+            reference (str): 참고할 기존 글 (find_similar_article로 찾은 글의 seed_text())
+        
+        Returns:
+            tuple: (본문, 중단 여부)
+        """
+        self.emit("before_article", keyword=keyword, title=title)
+        request = article_request(keyword, title, model, min_chars, max_chars, reference)
+        
+        async with self._openai_slot():
+            with self.metered(
+                "article", model, request["messages"], request["max_tokens"], keyword, title
+            ) as usages:
+                blog_content, stopped = await astream_completion(
+                    self.async_client,
+                    should_stop=should_stop,
+                    on_chunk=on_chunk,
+                    on_usage=usages.append,
+                    **request
+                )
+        
+        # 첫 작성 요청의 토큰 사용량 (캐시 적중률 집계에 추가)
+        usage = usages[0] if usages else None
+        if usage is not None:
+            article_usage.add(usage)
+        
+        blog_content = clean_article(blog_content)
+        if not stopped:
+            blog_content, stopped = await self.afit_length(
+                keyword, title, request, blog_content, min_chars, max_chars, should_stop, on_chunk
+            )
+        
+        self.emit(
+            "after_article", keyword=keyword, title=title, content=blog_content, stopped=stopped, usage=usage
+        )
+        return blog_content, stopped
+    
+    def find_similar_article(self, title):
+        """
+        글을 작성하기 전에 제목이 비슷한 기존 글이 있는지 확인합니다. (자료 저장소에 기록된 글 기준)
+        
+        Returns:
+            ArticleMatch: 비슷한 기존 글 (없거나 저장소를 쓰지 않으면 None)
+        """
+        if self.article_index is None:
+            return None
+        try:
+            return self.article_index.find_similar(title)
+        except sqlite3.Error as e:
+            print(f"비슷한 글 확인 실패: {e}")
+            return None
+    
+    async def afind_similar_article(self, title):
+        """find_similar_article의 asyncio 버전 (색인을 다시 만드는 동안 이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.find_similar_article, title)
+    
+    def fit_length(self, keyword, title, request, content, min_chars, max_chars, should_stop=None, on_chunk=None):
+        """afit_length의 동기 버전"""
+        return self._run(
+            self.afit_length(keyword, title, request, content, min_chars, max_chars, should_stop, on_chunk)
+        )
+    
+    async def afit_length(self, keyword, title, request, content, min_chars, max_chars, should_stop=None,
+                          on_chunk=None):
+        """
+        작성된 글이 글자 수 범위를 벗어나면 전체를 다시 작성하지 않고 보정합니다.
+        
+        - 짧으면: 지금까지의 글을 assistant 메시지로 넘기고 모자란 분량만 이어서 작성 (최대 MAX_CONTINUATIONS번)
+        - 길면: 뺄 문단 번호만 JSON으로 받아 해당 문단을 빼서 줄임 (본문을 다시 출력하지 않음)
+        
+        Args:
+            request (dict): 처음 작성할 때 보낸 요청 인자 (article_request)
+            content (str): 작성된 본문
+        
+        Returns:
+            tuple: (본문, 중단 여부)
+        """
+        model = request["model"]
+        for _ in range(MAX_CONTINUATIONS):
+            if length_status(content, min_chars, max_chars) != "short":
+                break
+            
+            current = count_chars(content)
+            messages = request["messages"] + [
+                {"role": "assistant", "content": content},
+                {"role": "user", "content": get_continuation_prompt(current, min_chars, max_chars)}
+            ]
+            max_tokens = max_tokens_for(max_chars - current, model)
+            if on_chunk:
+                on_chunk("\n\n")
+            
+            async with self._openai_slot():
+                with self.metered("continuation", model, messages, max_tokens, keyword, title) as usages:
+                    continuation, stopped = await astream_completion(
+                        self.async_client,
+                        should_stop=should_stop,
+                        on_chunk=on_chunk,
+                        on_usage=usages.append,
+                        model=model,
+                        messages=messages,
+                        temperature=request["temperature"],
+                        max_tokens=max_tokens
+                    )
+            
+            content = join_continuation(content, clean_article(continuation))
+            if stopped:
+                return content, True
+        
+        if length_status(content, min_chars, max_chars) == "long":
+            content = await self.atrim_article(keyword, title, model, content, min_chars, max_chars, on_chunk)
+        
+        return content, False
+    
+    def trim_article(self, keyword, title, model, content, min_chars, max_chars, on_chunk=None):
+        """atrim_article의 동기 버전"""
+        return self._run(self.atrim_article(keyword, title, model, content, min_chars, max_chars, on_chunk))
+    
+    async def atrim_article(self, keyword, title, model, content, min_chars, max_chars, on_chunk=None):
+        """
+        최대 글자 수보다 긴 글에서 덜 중요한 문단을 빼서 줄입니다.
+        (뺄 문단을 고르지 못하거나 빼면 최소 글자 수보다 짧아지면 그대로 둠)
+        
+        Returns:
+            str: 줄인 본문
+        """
+        paragraphs = split_paragraphs(content)
+        if len(paragraphs) < 3:
+            return content
+        
+        messages = [
+            {"role": "user", "content": get_trim_prompt(number_paragraphs(paragraphs), count_chars(content), max_chars)}
+        ]
+        async with self._openai_slot():
+            with self.metered("trim", model, messages, 200, keyword, title) as usages:
+                response = await acached_completion(
+                    self.async_client,
+                    model=model,
+                    messages=messages,
+                    temperature=0,
+                    max_tokens=200,
+                    response_format=TRIM_RESPONSE_FORMAT,
+                    on_usage=usages.append
+                )
+        
+        try:
+            order = json.loads(response)["remove"]
+        except (ValueError, KeyError, TypeError):
+            return content
+        
+        trimmed, removed = remove_paragraphs(paragraphs, order, min_chars, max_chars)
+        if not removed:
+            return content
+        
+        if on_chunk:
+            on_chunk(f"\n\n✂️ 문단 {removed}개를 빼서 {count_chars(trimmed)}자로 줄여 저장합니다.")
+        return trimmed
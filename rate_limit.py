@@ -0,0 +1,358 @@
+"""
+API 요청 속도 제한 및 재시도
+모델별(gpt-4o-mini, gpt-4o, gpt-4-turbo)과 네이버 API에 각각 분당 요청 수/토큰 수 버킷을 두고,
+429/5xx 오류나 연결 오류는 Retry-After를 따르거나 지수 백오프(+지터)로 다시 시도합니다.
+
+429 응답을 받으면 해당 API의 요청 속도를 잠시 낮췄다가 성공할 때마다 조금씩 되돌려
+여러 배치를 동시에 실행해도 계정 한도 근처에서 안정적으로 요청합니다.
+"""
+import os
+import re
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+import httpx
+import openai
+from dotenv import load_dotenv
+
+# .env 파일 로드
+load_dotenv()
+
+# 기본 한도 (분당 요청 수, 분당 토큰 수 - None이면 토큰 제한 없음)
+# 환경 변수 RATE_LIMIT_<이름>_RPM / RATE_LIMIT_<이름>_TPM 으로 변경 (예: RATE_LIMIT_GPT_4O_MINI_TPM=400000)
+DEFAULT_LIMITS = {
+    "gpt-4o-mini": (500, 200000),
+    "gpt-4o": (500, 30000),
+    "gpt-4-turbo": (500, 30000),
+    "naver": (600, None),
+    "default": (500, 30000)
+}
+
+# 재시도 설정
+MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", 5))
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+
+# 다시 시도할 HTTP 상태 코드
+RETRY_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# 다시 시도할 연결 오류
+RETRY_ERRORS = (openai.APIConnectionError, httpx.TransportError)
+
+# 429 응답 시 요청 속도를 낮추는 비율 / 성공 시 되돌리는 양 / 최저 비율
+BACKOFF_FACTOR = 0.7
+RECOVERY_STEP = 0.05
+MIN_SCALE = 0.1
+
+# 토큰 수 추정용 (한글 위주 텍스트 기준 대략 2자당 1토큰)
+CHARS_PER_TOKEN = 2
+
+
+class TokenBucket:
+    """
+    분당 rate_per_min만큼 채워지는 토큰 버킷
+    reserve()는 먼저 차감한 뒤 기다려야 할 시간을 돌려주므로 스레드/asyncio 모두에서 사용할 수 있습니다.
+    """
+    
+    def __init__(self, rate_per_min, capacity=None):
+        self.capacity = capacity or rate_per_min
+        self.rate = rate_per_min / 60
+        self.available = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now):
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def reserve(self, amount=1):
+        """
+        amount만큼 예약하고 사용 가능해질 때까지 기다려야 하는 시간(초)을 반환합니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.available -= amount
+            if self.available >= 0:
+                return 0.0
+            return -self.available / self.rate
+    
+    def refund(self, amount):
+        """사용하지 않은 양 반환"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.available = min(self.capacity, self.available + amount)
+    
+    def set_rate(self, rate_per_min):
+        """채워지는 속도 변경 (용량은 유지)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate_per_min / 60
+
+
+class RateLimiter:
+    """API 하나(모델 또는 네이버)의 분당 요청 수/토큰 수 제한"""
+    
+    def __init__(self, name, rpm, tpm=None):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm) if tpm else None
+        # 429 응답 후 요청 속도 비율 (1.0 = 설정한 한도)
+        self.scale = 1.0
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def reserve(self, tokens=0):
+        """요청 1개와 토큰을 예약하고 기다려야 하는 시간(초)을 반환"""
+        wait = self.requests.reserve(1)
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        with self._lock:
+            wait = max(wait, self.blocked_until - time.monotonic())
+        return max(0.0, wait)
+    
+    def acquire(self, tokens=0):
+        """요청을 보낼 수 있을 때까지 대기"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def aacquire(self, tokens=0):
+        """acquire의 asyncio 버전"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def refund_tokens(self, tokens):
+        """추정보다 적게 사용한 토큰 반환"""
+        if self.tokens is not None and tokens > 0:
+            self.tokens.refund(tokens)
+    
+    def on_success(self):
+        """성공 시 낮춰 둔 요청 속도를 조금씩 되돌림"""
+        if self.scale < 1.0:
+            with self._lock:
+                self.scale = min(1.0, self.scale + RECOVERY_STEP)
+                self._apply_scale()
+    
+    def on_rate_limited(self, delay):
+        """429 응답 시 delay초 동안 모든 요청을 멈추고 요청 속도를 낮춤"""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self.scale = max(MIN_SCALE, self.scale * BACKOFF_FACTOR)
+            self._apply_scale()
+    
+    def _apply_scale(self):
+        self.requests.set_rate(self.rpm * self.scale)
+        if self.tokens is not None:
+            self.tokens.set_rate(self.tpm * self.scale)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def _env_limit(name, suffix, default):
+    value = os.getenv(f"RATE_LIMIT_{re.sub(r'[^A-Z0-9]', '_', name.upper())}_{suffix}")
+    return int(value) if value else default
+
+
+def get_limiter(name):
+    """
+    이름별 공유 속도 제한기를 반환합니다. (처음 호출 시 생성)
+    
+    Args:
+        name (str): 모델 이름 또는 'naver' (한도가 정해지지 않은 모델은 'default' 한도 사용)
+    
+    Returns:
+        RateLimiter: 속도 제한기
+    """
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(name)
+            if limiter is None:
+                rpm, tpm = DEFAULT_LIMITS.get(name, DEFAULT_LIMITS["default"])
+                limiter = RateLimiter(
+                    name,
+                    _env_limit(name, "RPM", rpm),
+                    _env_limit(name, "TPM", tpm)
+                )
+                _limiters[name] = limiter
+    return limiter
+
+
+def get_status_code(error):
+    """오류의 HTTP 상태 코드 (없으면 None)"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def get_retry_after(error):
+    """
+    오류 응답의 Retry-After(-ms) 헤더 값(초)을 반환합니다.
+    
+    Returns:
+        float: 기다릴 시간 (헤더가 없으면 None)
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    
+    try:
+        value = headers.get("retry-after-ms")
+        if value:
+            return float(value) / 1000
+        
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        if re.fullmatch(r"\s*\d+(\.\d+)?\s*", value):
+            return float(value)
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error):
+    """다시 시도할 수 있는 오류인지 여부 (연결 오류, 429, 5xx)"""
+    if isinstance(error, RETRY_ERRORS):
+        return True
+    return get_status_code(error) in RETRY_STATUS_CODES
+
+
+def backoff_delay(attempt):
+    """지수 백오프 대기 시간 (full jitter)"""
+    return random.uniform(0, min(MAX_DELAY, BASE_DELAY * (2 ** attempt)))
+
+
+def _retry_delay(limiter, error, attempt):
+    """재시도 전 대기 시간 계산 (429면 속도 제한기 전체를 멈춤)"""
+    retry_after = get_retry_after(error)
+    if retry_after is not None:
+        # 여러 요청이 동시에 다시 시작하지 않도록 약간의 지터 추가
+        delay = min(MAX_DELAY, retry_after) + random.uniform(0, BASE_DELAY)
+    else:
+        delay = backoff_delay(attempt)
+    
+    if get_status_code(error) == 429:
+        limiter.on_rate_limited(delay)
+    return delay
+
+
+def call_with_retry(fn, limiter, tokens=0, max_retries=MAX_RETRIES):
+    """
+    속도 제한을 지키며 fn()을 호출하고, 일시적인 오류는 다시 시도합니다.
+    
+    Args:
+        fn (callable): 인자 없는 호출 함수
+        limiter (RateLimiter): 속도 제한기
+        tokens (int): 요청 하나에 사용할 것으로 추정한 토큰 수
+        max_retries (int): 최대 재시도 횟수
+    
+    Returns:
+        fn()의 반환값
+    
+    Raises:
+        Exception: 다시 시도할 수 없는 오류이거나 재시도 횟수를 넘었을 때 마지막 오류
+    """
+    attempt = 0
+    while True:
+        limiter.acquire(tokens)
+        try:
+            result = fn()
+        except Exception as e:
+            limiter.refund_tokens(tokens)
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            time.sleep(_retry_delay(limiter, e, attempt))
+            attempt += 1
+            continue
+        
+        limiter.on_success()
+        return result
+
+
+async def acall_with_retry(fn, limiter, tokens=0, max_retries=MAX_RETRIES):
+    """call_with_retry의 asyncio 버전 (fn()은 awaitable을 반환)"""
+    attempt = 0
+    while True:
+        await limiter.aacquire(tokens)
+        try:
+            result = await fn()
+        except Exception as e:
+            limiter.refund_tokens(tokens)
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            await asyncio.sleep(_retry_delay(limiter, e, attempt))
+            attempt += 1
+            continue
+        
+        limiter.on_success()
+        return result
+
+
+def estimate_tokens(messages, max_tokens=None):
+    """
+    채팅 완성 요청이 사용할 토큰 수를 대략 추정합니다. (입력 글자 수 기준 + 최대 출력 토큰)
+    
+    Args:
+        messages (list): 메시지 리스트
+        max_tokens (int): 최대 출력 토큰 수
+    
+    Returns:
+        int: 추정 토큰 수
+    """
+    chars = sum(len(str(message.get("content") or "")) for message in messages)
+    return chars // CHARS_PER_TOKEN + 4 * len(messages) + (max_tokens or 0)
+
+
+def chat_completion(client, **kwargs):
+    """
+    모델별 속도 제한과 재시도를 거쳐 chat.completions.create를 호출합니다.
+    (stream=True면 스트림을 여는 요청까지만 다시 시도)
+    
+    Args:
+        client (OpenAI): OpenAI 클라이언트
+        **kwargs: chat.completions.create에 전달할 인자 (model, messages 등)
+    
+    Returns:
+        응답 객체 (stream=True면 스트림)
+    """
+    limiter = get_limiter(kwargs["model"])
+    tokens = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens"))
+    response = call_with_retry(lambda: client.chat.completions.create(**kwargs), limiter, tokens)
+    
+    # 실제 사용량이 추정보다 적으면 남은 토큰 반환
+    usage = getattr(response, "usage", None)
+    if usage is not None and not kwargs.get("stream"):
+        limiter.refund_tokens(tokens - usage.total_tokens)
+    return response
+
+
+async def achat_completion(client, **kwargs):
+    """
+    chat_completion의 asyncio 버전
+    
+    Args:
+        client (AsyncOpenAI): 비동기 OpenAI 클라이언트
+        **kwargs: chat.completions.create에 전달할 인자 (model, messages 등)
+    
+    Returns:
+        응답 객체 (stream=True면 비동기 스트림)
+    """
+    limiter = get_limiter(kwargs["model"])
+    tokens = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens"))
+    response = await acall_with_retry(lambda: client.chat.completions.create(**kwargs), limiter, tokens)
+    
+    usage = getattr(response, "usage", None)
+    if usage is not None and not kwargs.get("stream"):
+        limiter.refund_tokens(tokens - usage.total_tokens)
+    return response
@@ -0,0 +1,15 @@
+"""
+테스트 공통 설정
+모듈을 불러오기 전에 캐시/자료 저장소/응답 캐시가 사용자 폴더(~/.blogwriter)를 건드리지 않도록 환경 변수를 정합니다.
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("BLOGWRITER_CACHE_DIR", tempfile.mkdtemp(prefix="blogwriter_test_"))
+os.environ.setdefault("BLOGWRITER_CORPUS_DISABLED", "1")
+os.environ.setdefault("NAVER_CACHE_DISABLED", "1")
+os.environ.setdefault("LLM_CACHE_MODE", "off")
@@ -0,0 +1,65 @@
+from article_length import (
+    MIN_OUTPUT_TOKENS,
+    DEFAULT_OUTPUT_TOKENS,
+    max_tokens_for,
+    output_token_limit,
+    remove_paragraphs,
+    split_paragraphs
+)
+
+
+def test_max_tokens_for_scales_with_chars():
+    assert max_tokens_for(3000, "gpt-4o-mini") == 3600
+    assert max_tokens_for(1001, "gpt-4o-mini") == 1202
+
+
+def test_max_tokens_for_clamps():
+    assert max_tokens_for(0, "gpt-4o-mini") == MIN_OUTPUT_TOKENS
+    assert max_tokens_for(-500, "gpt-4o") == MIN_OUTPUT_TOKENS
+    assert max_tokens_for(100000, "gpt-4o-mini") == 16384
+    assert max_tokens_for(100000, "gpt-4-turbo") == 4096
+    assert max_tokens_for(100000, "unknown-model") == DEFAULT_OUTPUT_TOKENS
+
+
+def test_output_token_limit_matches_dated_models():
+    assert output_token_limit("gpt-4o-mini-2024-07-18") == 16384
+    assert output_token_limit("gpt-4-turbo-2024-04-09") == 4096
+    assert output_token_limit("gpt-4omni") == DEFAULT_OUTPUT_TOKENS
+
+
+def paragraphs(*sizes):
+    return ["가" * size for size in sizes]
+
+
+def test_remove_paragraphs_in_given_order_until_short_enough():
+    parts = paragraphs(100, 100, 100, 100)
+    
+    text, removed = remove_paragraphs(parts, [4, 2, 1], 150, 250)
+    
+    assert removed == 2
+    assert split_paragraphs(text) == [parts[0], parts[2]]
+
+
+def test_remove_paragraphs_skips_removals_below_min():
+    parts = paragraphs(300, 50, 100)
+    
+    # 1번을 빼면 최소 글자 수보다 짧아지므로 건너뛰고 3번을 뺌
+    text, removed = remove_paragraphs(parts, [1, 3, 2], 300, 400)
+    
+    assert removed == 1
+    assert split_paragraphs(text) == [parts[0], parts[1]]
+
+
+def test_remove_paragraphs_ignores_invalid_numbers():
+    parts = paragraphs(100, 100, 100)
+    
+    text, removed = remove_paragraphs(parts, [0, 7, 3, 3], 100, 250)
+    
+    assert removed == 1
+    assert split_paragraphs(text) == parts[:2]
+
+
+def test_remove_paragraphs_keeps_text_already_within_max():
+    parts = paragraphs(100, 100)
+    
+    assert remove_paragraphs(parts, [1, 2], 100, 500) == ("\n\n".join(parts), 0)
@@ -0,0 +1,50 @@
+import json
+from types import SimpleNamespace
+
+from batch_api import parse_batch_results
+
+
+class FakeFiles:
+    def __init__(self, files):
+        self.files = files
+    
+    def content(self, file_id):
+        return SimpleNamespace(text="\n".join(json.dumps(line) for line in self.files[file_id]) + "\n")
+
+
+def fake_client(**files):
+    return SimpleNamespace(files=FakeFiles(files))
+
+
+def success(custom_id, content):
+    usage = {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150}
+    body = {"choices": [{"message": {"role": "assistant", "content": content}}], "usage": usage}
+    return {"custom_id": custom_id, "response": {"status_code": 200, "body": body}, "error": None}
+
+
+def test_mixed_success_and_errors():
+    client = fake_client(
+        out=[
+            success("job1-1", "첫 번째 글"),
+            {"custom_id": "job1-2", "response": {"status_code": 400, "body": {"error": {"message": "too long"}}}},
+            {"custom_id": "job1-3", "response": {"status_code": 500, "body": {}}},
+        ],
+        err=[
+            {"custom_id": "job1-4", "response": None, "error": {"code": "expired", "message": "batch expired"}},
+        ]
+    )
+    batch = SimpleNamespace(output_file_id="out", error_file_id="err")
+    
+    results = parse_batch_results(client, batch)
+    
+    assert results["job1-1"] == ("첫 번째 글", None, {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150})
+    assert results["job1-2"] == (None, "too long", None)
+    assert results["job1-3"] == (None, "HTTP 500", None)
+    assert results["job1-4"] == (None, "batch expired", None)
+
+
+def test_missing_files():
+    client = fake_client(out=[success("job1-1", "글")])
+    
+    assert parse_batch_results(client, SimpleNamespace(output_file_id=None, error_file_id=None)) == {}
+    assert list(parse_batch_results(client, SimpleNamespace(output_file_id="out"))) == ["job1-1"]
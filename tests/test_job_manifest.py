@@ -0,0 +1,79 @@
+from job_manifest import (
+    JobManifest,
+    MANIFEST_FILE,
+    STATUS_PENDING,
+    STATUS_DONE,
+    STATUS_PARTIAL,
+    STATUS_FAILED,
+    STATUS_SKIPPED
+)
+
+
+def create(tmp_path, titles=("첫 번째 제목", "두 번째 제목", "세 번째 제목")):
+    return JobManifest.create(str(tmp_path), list(titles), "캠핑", "gpt-4o-mini", 2000, 3000)
+
+
+def test_create_numbers_titles_from_one(tmp_path):
+    manifest = create(tmp_path)
+    
+    assert (tmp_path / MANIFEST_FILE).exists()
+    assert [item["idx"] for item in manifest.items] == [1, 2, 3]
+    assert all(item["status"] == STATUS_PENDING for item in manifest.items)
+    assert manifest.save_dir == str(tmp_path)
+    assert manifest.batch_id is None
+
+
+def test_add_continues_numbering(tmp_path):
+    manifest = create(tmp_path, ["첫 번째 제목"])
+    
+    assert manifest.add("추가한 제목") == 2
+    assert manifest.remaining() == [(1, "첫 번째 제목"), (2, "추가한 제목")]
+
+
+def test_remaining_skips_done_and_skipped(tmp_path):
+    manifest = create(tmp_path, ["하나", "둘", "셋", "넷", "다섯"])
+    manifest.update(1, STATUS_DONE, output="01_하나.txt")
+    manifest.update(2, STATUS_SKIPPED, output="old.txt")
+    manifest.update(3, STATUS_FAILED, error="timeout")
+    manifest.update(4, STATUS_PARTIAL, output="04_넷.txt")
+    
+    assert manifest.remaining() == [(3, "셋"), (4, "넷"), (5, "다섯")]
+    assert manifest.count(STATUS_DONE) == 1
+    assert manifest.count(STATUS_PENDING) == 1
+
+
+def test_update_replaces_output_and_error(tmp_path):
+    manifest = create(tmp_path)
+    manifest.update(2, STATUS_FAILED, error="rate limit")
+    manifest.update(2, STATUS_DONE, output="02_두_번째_제목.txt")
+    
+    item = manifest.items[1]
+    assert (item["status"], item["output"], item["error"]) == (STATUS_DONE, "02_두_번째_제목.txt", None)
+
+
+def test_resume_round_trip(tmp_path):
+    manifest = create(tmp_path)
+    manifest.update(1, STATUS_DONE, output="01_첫_번째_제목.txt")
+    manifest.set_batch("batch_abc", 3)
+    
+    loaded = JobManifest.load(str(tmp_path))
+    
+    assert loaded.data == manifest.data
+    assert (loaded.keyword, loaded.model, loaded.min_chars, loaded.max_chars) == ("캠핑", "gpt-4o-mini", 2000, 3000)
+    assert loaded.remaining() == [(2, "두 번째 제목"), (3, "세 번째 제목")]
+    assert (loaded.batch_id, loaded.batch_job) == ("batch_abc", 3)
+    
+    loaded.set_batch(None)
+    assert JobManifest.load(str(tmp_path)).batch_id is None
+
+
+def test_load_missing_manifest(tmp_path):
+    assert JobManifest.load(str(tmp_path)) is None
+
+
+def test_write_leaves_no_temp_files(tmp_path):
+    manifest = create(tmp_path)
+    for idx in (1, 2, 3):
+        manifest.update(idx, STATUS_DONE)
+    
+    assert [path.name for path in tmp_path.iterdir()] == [MANIFEST_FILE]
@@ -0,0 +1,61 @@
+from title_dedupe import (
+    TitleIndex,
+    DUPLICATE_THRESHOLD,
+    SOURCE_SEARCH,
+    SOURCE_GENERATED,
+    dedupe_titles,
+    jaccard,
+    normalize_title,
+    shingles
+)
+
+
+def similarity(a, b):
+    return jaccard(shingles(normalize_title(a)), shingles(normalize_title(b)))
+
+
+def test_default_threshold():
+    assert DUPLICATE_THRESHOLD == 0.6
+
+
+def test_normalize_title():
+    assert normalize_title("캠핑 초보 필수템 5가지!!") == "캠핑초보필수템5가지"
+    assert normalize_title("ＴＯＰ&amp;10 🏕️") == "top10"
+
+
+def test_exactly_at_threshold_is_duplicate():
+    assert similarity("가나다라", "가나다라마바") == 0.6
+    
+    index = TitleIndex()
+    index.add("가나다라", SOURCE_SEARCH)
+    duplicate = index.check("가나다라마바")
+    
+    assert duplicate is not None
+    assert (duplicate.match, duplicate.similarity, duplicate.source) == ("가나다라", 0.6, SOURCE_SEARCH)
+
+
+def test_below_threshold_is_kept():
+    assert similarity("가나다라", "가나다라마바사") == 0.5
+    
+    index = TitleIndex()
+    index.add("가나다라", SOURCE_SEARCH)
+    
+    assert index.check("가나다라마바사") is None
+
+
+def test_dedupe_titles_keeps_first_and_checks_search_results():
+    result = dedupe_titles(
+        [
+            "캠핑 준비물 체크리스트 총정리",
+            "캠핑 준비물 체크리스트 총정리!!",
+            "여름 캠핑 필수템 추천",
+            "초보 캠핑 장비 고르는 법",
+        ],
+        corpus=["여름 캠핑 필수템 추천 BEST"]
+    )
+    
+    assert result.kept == ["캠핑 준비물 체크리스트 총정리", "초보 캠핑 장비 고르는 법"]
+    assert [(d.title, d.source) for d in result.duplicates] == [
+        ("캠핑 준비물 체크리스트 총정리!!", SOURCE_GENERATED),
+        ("여름 캠핑 필수템 추천", SOURCE_SEARCH),
+    ]
@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip("customtkinter")
+
+from title_list import TitleSelection, SORT_ORDER, SORT_TEXT, SORT_LENGTH
+
+
+def selection():
+    return TitleSelection(["캠핑 준비물 총정리", "Camping 장비 TOP 10", "여름 캠핑", "등산화 고르는 법"])
+
+
+def test_starts_all_selected():
+    model = selection()
+    
+    assert len(model) == 4
+    assert model.count == 4
+    assert model.view == [0, 1, 2, 3]
+    assert TitleSelection(["a", "b"], selected=False).count == 0
+
+
+def test_set_counts_only_changes():
+    model = selection()
+    model.set(1, False)
+    model.set(1, False)
+    model.set(2, 0)
+    model.set(2, True)
+    
+    assert model.count == 3
+    assert model.selected_titles() == ["캠핑 준비물 총정리", "여름 캠핑", "등산화 고르는 법"]
+
+
+def test_apply_filters_case_insensitive_and_sorts():
+    model = selection()
+    
+    model.apply(" CAMP ")
+    assert model.view == [1]
+    
+    model.apply("캠핑", SORT_LENGTH)
+    assert model.view == [2, 0]
+    
+    model.apply("", SORT_TEXT)
+    assert [model.titles[index] for index in model.view] == sorted(model.titles)
+    
+    model.apply("", SORT_ORDER)
+    assert model.view == [0, 1, 2, 3]
+
+
+def test_set_view_changes_only_filtered_titles():
+    model = selection()
+    model.apply("캠핑")
+    model.set_view(False)
+    
+    assert model.count == 2
+    assert model.selected_titles() == ["Camping 장비 TOP 10", "등산화 고르는 법"]
+    
+    model.set_titles(["새 제목"], selected=False)
+    assert (model.count, model.query, model.view) == (0, "", [0])
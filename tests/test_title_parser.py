@@ -0,0 +1,48 @@
+from pipeline import TitleLineParser, parse_title_line, parse_titles
+
+
+def test_parse_title_line():
+    assert parse_title_line("1. **캠핑 준비물 총정리** - 초보자용 체크리스트") == "캠핑 준비물 총정리"
+    assert parse_title_line("  12.여름 캠핑 필수템 TOP 10  ") == "여름 캠핑 필수템 TOP 10"
+    assert parse_title_line("") is None
+    assert parse_title_line("2. 짧음") is None
+
+
+def test_parse_titles_limit():
+    text = "1. 첫 번째 블로그 제목\n\n2. 두 번째 블로그 제목\n3. 세 번째 블로그 제목"
+    
+    assert parse_titles(text, 2) == ["첫 번째 블로그 제목", "두 번째 블로그 제목"]
+
+
+def test_feed_emits_each_completed_line():
+    titles = []
+    parser = TitleLineParser(titles.append)
+    
+    parser.feed("1. 첫 번째 블로그")
+    assert titles == []
+    parser.feed(" 제목 - 설명\n2. 두 번째")
+    assert titles == ["첫 번째 블로그 제목"]
+    parser.feed(" 블로그 제목\n")
+    assert titles == ["첫 번째 블로그 제목", "두 번째 블로그 제목"]
+
+
+def test_close_emits_last_line_without_newline():
+    titles = []
+    parser = TitleLineParser(titles.append)
+    parser.feed("1. 첫 번째 블로그 제목\n2. 마지막 블로그 제목")
+    
+    parser.close()
+    
+    assert titles == ["첫 번째 블로그 제목", "마지막 블로그 제목"]
+    assert parser.pending == ""
+
+
+def test_limit_and_skipped_lines():
+    titles = []
+    parser = TitleLineParser(titles.append, limit=2)
+    
+    parser.feed("제목을 생성했습니다.\n\n1. 첫 번째 블로그 제목\n짧음\n2. 두 번째 블로그 제목\n3. 세 번째 블로그 제목\n")
+    parser.close()
+    
+    assert titles == ["제목을 생성했습니다.", "첫 번째 블로그 제목"]
+    assert parser.count == 2
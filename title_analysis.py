@@ -0,0 +1,177 @@
+"""
+블로그 제목 분석 결과 구조
+분석 단계는 JSON 스키마로 응답 형식을 고정하고, 응답을 TitleAnalysis로 변환합니다.
+길이/문장 유형/특수문자/숫자/키워드 같은 통계 항목은 LLM이 아니라 title_stats에서 계산해 채웁니다.
+제목 생성 프롬프트에는 긴 원문 대신 to_compact()로 요약한 분석만 넣어 입력 토큰을 줄입니다.
+"""
+import json
+from dataclasses import dataclass, field, asdict
+
+
+def _string_list(description):
+    return {"type": "array", "items": {"type": "string"}, "description": description}
+
+
+# 분석 응답 JSON 스키마 (strict 모드: 모든 항목 필수, 추가 항목 불가)
+# 통계 항목은 직접 계산하므로 LLM에는 정성적 분석 항목만 요청
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "structures": {
+            "type": "array",
+            "description": "제목 구조 패턴",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "pattern": {"type": "string", "description": "구조 (예: '주제 + 방법')"},
+                    "frequency": {"type": "string", "description": "빈도 (높음/중간/낮음)"},
+                    "example": {"type": "string", "description": "목록에서 찾은 예시 제목"}
+                },
+                "required": ["pattern", "frequency", "example"],
+                "additionalProperties": False
+            }
+        },
+        "hooks": _string_list("클릭을 유도하는 후킹 요소"),
+        "content_strategies": _string_list("정보 전달 방식과 표현 기법 (하우투, 리뷰, 경험담 등)"),
+        "seo_factors": _string_list("SEO 최적화 요소 (키워드 배치, 구체성 등)"),
+        "differentiators": _string_list("차별화 포인트와 효과적인 제목의 공통점"),
+        "summary": {"type": "string", "description": "새 제목을 만들 때 참고할 핵심 요약 (2~3문장)"}
+    },
+    "required": [
+        "structures", "hooks", "content_strategies", "seo_factors", "differentiators", "summary"
+    ],
+    "additionalProperties": False
+}
+
+# chat.completions.create의 response_format 인자
+ANALYSIS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "title_analysis",
+        "strict": True,
+        "schema": ANALYSIS_SCHEMA
+    }
+}
+
+
+@dataclass
+class LengthStats:
+    """제목 길이 통계 (글자 수)"""
+    average: float = 0.0
+    min: int = 0
+    max: int = 0
+
+
+@dataclass
+class TitleStructure:
+    """제목 구조 패턴"""
+    pattern: str
+    frequency: str = ""
+    example: str = ""
+
+
+@dataclass
+class TitleAnalysis:
+    """블로그 제목 분석 결과"""
+    length_stats: LengthStats = field(default_factory=LengthStats)
+    sentence_types: list = field(default_factory=list)
+    special_chars: list = field(default_factory=list)
+    number_patterns: list = field(default_factory=list)
+    top_keywords: list = field(default_factory=list)
+    keyword_combinations: list = field(default_factory=list)
+    structures: list = field(default_factory=list)
+    hooks: list = field(default_factory=list)
+    content_strategies: list = field(default_factory=list)
+    seo_factors: list = field(default_factory=list)
+    differentiators: list = field(default_factory=list)
+    summary: str = ""
+    
+    @classmethod
+    def from_dict(cls, data):
+        """dict(분석 응답 JSON)에서 생성 (없는 항목은 빈 값)"""
+        data = dict(data)
+        data["length_stats"] = LengthStats(**data.get("length_stats", {}))
+        data["structures"] = [TitleStructure(**item) for item in data.get("structures", [])]
+        known = cls.__dataclass_fields__
+        return cls(**{key: value for key, value in data.items() if key in known})
+    
+    @classmethod
+    def from_json(cls, text, stats_fields=None):
+        """
+        분석 응답 텍스트를 변환합니다.
+        
+        Args:
+            text (str): 분석 응답 (JSON)
+            stats_fields (dict): 직접 계산한 통계 항목 (TitleStats.to_analysis_fields())
+        
+        Raises:
+            ValueError: JSON이 아니거나 형식이 맞지 않을 때
+        """
+        try:
+            return cls.from_dict({**json.loads(text), **(stats_fields or {})})
+        except (TypeError, AttributeError, json.JSONDecodeError) as e:
+            raise ValueError(f"분석 결과가 올바른 JSON 형식이 아닙니다: {e}") from e
+    
+    def to_dict(self):
+        """JSON으로 저장할 수 있는 dict"""
+        return asdict(self)
+    
+    def to_compact(self):
+        """
+        제목 생성 프롬프트에 넣을 짧은 요약 (항목당 한 줄)
+        
+        Returns:
+            str: 요약 텍스트
+        """
+        stats = self.length_stats
+        lines = [f"길이: 평균 {stats.average:g}자 ({stats.min}~{stats.max}자)"]
+        fields = [
+            ("문장 유형", self.sentence_types),
+            ("특수문자", self.special_chars),
+            ("숫자", self.number_patterns),
+            ("키워드", self.top_keywords),
+            ("키워드 조합", self.keyword_combinations),
+            ("구조", [f"{s.pattern}({s.frequency})" if s.frequency else s.pattern for s in self.structures]),
+            ("후킹", self.hooks),
+            ("전략", self.content_strategies),
+            ("SEO", self.seo_factors),
+            ("차별화", self.differentiators)
+        ]
+        lines += [f"{name}: {', '.join(values)}" for name, values in fields if values]
+        if self.summary:
+            lines.append(f"요약: {self.summary}")
+        return "\n".join(lines)
+    
+    def to_display(self):
+        """
+        화면에 표시할 분석 결과
+        
+        Returns:
+            str: 항목별로 정리한 텍스트
+        """
+        stats = self.length_stats
+        
+        def bullets(values):
+            return "\n".join(f"- {value}" for value in values) if values else "- (없음)"
+        
+        structures = "\n".join(
+            f"- {s.pattern} [{s.frequency}]" + (f"\n  예: {s.example}" if s.example else "")
+            for s in self.structures
+        ) or "- (없음)"
+        keywords = "\n".join(f"{i}. {keyword}" for i, keyword in enumerate(self.top_keywords, 1)) or "- (없음)"
+        
+        return (
+            f"📌 요약\n{self.summary}\n\n"
+            f"## 1. 제목 작성 형태\n"
+            f"- 길이: 평균 {stats.average:g}자 (최소 {stats.min}자 ~ 최대 {stats.max}자)\n"
+            f"{bullets(self.sentence_types)}\n"
+            f"{bullets(self.special_chars)}\n"
+            f"{bullets(self.number_patterns)}\n\n"
+            f"## 2. 핵심 키워드\n{keywords}\n\n"
+            f"키워드 조합\n{bullets(self.keyword_combinations)}\n\n"
+            f"## 3. 제목 구조\n{structures}\n\n"
+            f"후킹 요소\n{bullets(self.hooks)}\n\n"
+            f"## 4. 콘텐츠 전략\n{bullets(self.content_strategies)}\n\n"
+            f"SEO 요소\n{bullets(self.seo_factors)}\n\n"
+            f"## 5. 차별화 포인트\n{bullets(self.differentiators)}"
+        )
@@ -0,0 +1,232 @@
+"""
+비슷한 제목 찾기 (MinHash + LSH)
+생성된 제목끼리, 또는 생성된 제목과 검색한 블로그 제목이 문장부호만 다르거나
+거의 그대로 베낀 경우를 찾아 글을 작성하기 전에 걸러냅니다.
+
+제목을 정규화(HTML 엔티티/문장부호/공백 제거, 소문자)한 뒤 글자 2-gram 집합으로 만들고,
+MinHash 서명을 여러 밴드로 나눈 버킷(LSH)에서 후보만 골라 실제 자카드 유사도로 확인합니다.
+제목이 많아져도 모든 쌍을 비교하지 않습니다.
+"""
+import os
+import re
+import html
+import random
+import hashlib
+import unicodedata
+from dataclasses import dataclass, field
+
+# 이 값 이상이면 비슷한 제목으로 판단 (글자 2-gram 자카드 유사도, 0~1)
+DUPLICATE_THRESHOLD = float(os.getenv("TITLE_DUPLICATE_THRESHOLD", 0.6))
+
+# 글자 n-gram 크기 (한글은 음절 하나에 정보가 많아 2-gram 사용)
+SHINGLE_SIZE = 2
+
+# MinHash 해시 함수 수와 LSH 밴드 수 (밴드당 4행 → 유사도 약 0.5 이상이면 후보로 잡힘)
+NUM_PERM = 64
+NUM_BANDS = 16
+
+# 해시 계산용 메르센 소수 (2^61 - 1)
+_PRIME = (1 << 61) - 1
+
+# 정규화할 때 지우는 문자 (한글/영문/숫자 이외)
+_STRIP_PATTERN = re.compile(r"[^0-9a-z가-힣]+")
+
+# 출처
+SOURCE_GENERATED = "generated"
+SOURCE_SEARCH = "search"
+
+
+def normalize_title(title):
+    """
+    비교용 제목 정규화 (HTML 엔티티 변환, 전각→반각, 소문자, 문장부호/이모지/공백 제거)
+    
+    예: '캠핑 초보 필수템 5가지!!' → '캠핑초보필수템5가지'
+    """
+    text = unicodedata.normalize("NFKC", html.unescape(title)).lower()
+    return _STRIP_PATTERN.sub("", text)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """정규화한 제목의 글자 n-gram 집합 (n보다 짧으면 제목 전체)"""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def jaccard(a, b):
+    """두 집합의 자카드 유사도"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _shingle_hash(shingle):
+    """실행할 때마다 같은 값이 나오는 64비트 해시 (내장 hash()는 실행마다 바뀜)"""
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), "little")
+
+
+class MinHasher:
+    """집합의 MinHash 서명 계산기 (같은 seed면 항상 같은 서명)"""
+    
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = random.Random(seed)
+        self.params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+    
+    def signature(self, items):
+        """
+        Args:
+            items (set): n-gram 집합
+        
+        Returns:
+            tuple: 해시 함수별 최솟값
+        """
+        hashes = [_shingle_hash(item) for item in items]
+        if not hashes:
+            return tuple(_PRIME for _ in self.params)
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self.params)
+
+
+@dataclass
+class Duplicate:
+    """비슷한 제목으로 판단된 항목"""
+    title: str
+    match: str
+    similarity: float
+    source: str
+    
+    def describe(self):
+        """한 줄 설명 (예: '제목' ≈ 검색 결과 '원본' (82%))"""
+        where = "검색 결과" if self.source == SOURCE_SEARCH else "생성 제목"
+        return f"'{self.title}' ≈ {where} '{self.match}' ({self.similarity:.0%})"
+    
+    def to_dict(self):
+        return {
+            "title": self.title,
+            "match": self.match,
+            "similarity": round(self.similarity, 3),
+            "source": self.source
+        }
+
+
+class TitleIndex:
+    """
+    제목 유사도 색인 (MinHash LSH)
+    
+    사용 예:
+        index = TitleIndex()
+        index.add_all(blog_titles, SOURCE_SEARCH)
+        duplicate = index.check("새 제목")
+    """
+    
+    def __init__(self, threshold=DUPLICATE_THRESHOLD, num_perm=NUM_PERM, bands=NUM_BANDS):
+        if num_perm % bands:
+            raise ValueError(f"해시 함수 수({num_perm})는 밴드 수({bands})로 나누어떨어져야 합니다.")
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets = [{} for _ in range(bands)]
+        self.entries = []
+        self.normalized = {}
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows] for i in range(self.bands)]
+    
+    def add(self, title, source=SOURCE_GENERATED):
+        """제목을 색인에 추가"""
+        text = normalize_title(title)
+        items = shingles(text)
+        entry_id = len(self.entries)
+        self.entries.append((title, source, items))
+        self.normalized.setdefault(text, entry_id)
+        
+        for band, key in zip(self.buckets, self._band_keys(self.hasher.signature(items))):
+            band.setdefault(key, []).append(entry_id)
+    
+    def add_all(self, titles, source=SOURCE_GENERATED):
+        for title in titles:
+            self.add(title, source)
+    
+    def check(self, title):
+        """
+        색인에서 가장 비슷한 제목을 찾습니다.
+        
+        Returns:
+            Duplicate: 기준 이상으로 비슷한 제목 (없으면 None)
+        """
+        text = normalize_title(title)
+        
+        # 정규화하면 같은 제목 (문장부호/띄어쓰기만 다른 경우)
+        if text in self.normalized:
+            match, source, _ = self.entries[self.normalized[text]]
+            return Duplicate(title, match, 1.0, source)
+        
+        items = shingles(text)
+        candidates = set()
+        for band, key in zip(self.buckets, self._band_keys(self.hasher.signature(items))):
+            candidates.update(band.get(key, ()))
+        
+        best = None
+        for entry_id in candidates:
+            match, source, other = self.entries[entry_id]
+            similarity = jaccard(items, other)
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = Duplicate(title, match, similarity, source)
+        return best
+
+
+@dataclass
+class DedupeResult:
+    """중복 제거 결과"""
+    kept: list = field(default_factory=list)
+    duplicates: list = field(default_factory=list)
+
+
+def dedupe_titles(titles, corpus=(), threshold=DUPLICATE_THRESHOLD, index=None):
+    """
+    생성된 제목에서 서로 비슷하거나 검색 결과와 비슷한 제목을 걸러냅니다.
+    (앞에 나온 제목을 남기고 뒤에 나온 비슷한 제목을 뺌)
+    
+    Args:
+        titles (list): 생성된 제목 리스트
+        corpus (list): 검색한 블로그 제목 리스트
+        threshold (float): 비슷한 제목으로 판단할 유사도
+        index (TitleIndex): 이어서 사용할 색인 (지정하면 corpus는 이미 들어 있다고 보고 남은 제목을 추가)
+    
+    Returns:
+        DedupeResult: 남긴 제목과 걸러낸 제목
+    """
+    if index is None:
+        index = TitleIndex(threshold)
+        index.add_all(corpus, SOURCE_SEARCH)
+    
+    result = DedupeResult()
+    for title in titles:
+        duplicate = index.check(title)
+        if duplicate is None:
+            index.add(title, SOURCE_GENERATED)
+            result.kept.append(title)
+        else:
+            result.duplicates.append(duplicate)
+    return result
+
+
+def format_duplicates(duplicates):
+    """
+    걸러낸 제목 목록 텍스트
+    
+    Args:
+        duplicates (list): Duplicate 또는 Duplicate.to_dict() 결과 리스트
+    
+    Returns:
+        str: 한 줄에 하나씩 정리한 텍스트
+    """
+    lines = []
+    for duplicate in duplicates:
+        if isinstance(duplicate, dict):
+            duplicate = Duplicate(**duplicate)
+        lines.append(f"- {duplicate.describe()}")
+    return "\n".join(lines)
@@ -0,0 +1,282 @@
+"""
+가상 스크롤 제목 선택 목록
+제목마다 CTkFrame + CTkCheckBox(캔버스로 그리는 복합 위젯)를 만들면 제목이 수백 개일 때
+목록을 만드는 데만 몇 초가 걸려 화면이 멈추므로, 화면에 보이는 줄 수만큼만 체크박스를 만들어 두고
+스크롤할 때 같은 체크박스에 다른 제목을 다시 연결합니다.
+
+선택 상태는 위젯 변수 대신 제목 순서대로의 bool 리스트에 보관하므로
+검색, 정렬, 전체 선택/해제는 리스트만 바꾸고 보이는 줄만 다시 그립니다.
+"""
+import sys
+import customtkinter as ctk
+
+# 한 줄 높이 (픽셀)
+ROW_HEIGHT = 40
+
+# 정렬 방법
+SORT_ORDER = "생성 순"
+SORT_TEXT = "가나다 순"
+SORT_LENGTH = "짧은 순"
+SORT_MODES = (SORT_ORDER, SORT_TEXT, SORT_LENGTH)
+
+
+class TitleSelection:
+    """
+    제목과 선택 상태 (화면과 무관한 데이터)
+    
+    titles와 selected는 제목 순서대로의 리스트이고,
+    view는 검색/정렬한 결과를 제목 번호(0부터) 리스트로 보관합니다.
+    """
+    
+    def __init__(self, titles=(), selected=True):
+        self.set_titles(titles, selected)
+    
+    def __len__(self):
+        return len(self.titles)
+    
+    def set_titles(self, titles, selected=True):
+        """제목 목록 교체 (검색/정렬 초기화)"""
+        self.titles = list(titles)
+        self.selected = [selected] * len(self.titles)
+        self.count = len(self.titles) if selected else 0
+        self._lowered = [title.lower() for title in self.titles]
+        self.query = ""
+        self.sort = SORT_ORDER
+        self.view = list(range(len(self.titles)))
+    
+    def apply(self, query="", sort=SORT_ORDER):
+        """
+        검색어가 들어간 제목만 정렬해서 view에 남깁니다.
+        
+        Args:
+            query (str): 검색어 (대소문자 무시, 빈 문자열이면 전체)
+            sort (str): 정렬 방법 (SORT_MODES)
+        """
+        query = query.strip().lower()
+        if query:
+            view = [index for index, text in enumerate(self._lowered) if query in text]
+        else:
+            view = list(range(len(self.titles)))
+        
+        if sort == SORT_TEXT:
+            view.sort(key=self.titles.__getitem__)
+        elif sort == SORT_LENGTH:
+            view.sort(key=lambda index: len(self.titles[index]))
+        
+        self.query = query
+        self.sort = sort
+        self.view = view
+    
+    def set(self, index, value):
+        """제목 하나의 선택 상태 변경"""
+        value = bool(value)
+        if self.selected[index] != value:
+            self.selected[index] = value
+            self.count += 1 if value else -1
+    
+    def set_view(self, value):
+        """view에 있는(검색된) 제목을 모두 선택/해제"""
+        for index in self.view:
+            self.set(index, value)
+    
+    def selected_titles(self):
+        """선택한 제목 (생성 순)"""
+        return [title for title, selected in zip(self.titles, self.selected) if selected]
+
+
+class VirtualTitleList(ctk.CTkFrame):
+    """
+    보이는 줄만 체크박스로 그리는 제목 선택 목록
+    
+    사용 예:
+        title_list = VirtualTitleList(parent)
+        title_list.pack(fill="both", expand=True)
+        title_list.set_titles(titles)
+        selected = title_list.selected_titles()
+    """
+    
+    def __init__(self, master, row_height=ROW_HEIGHT, **kwargs):
+        kwargs.setdefault("fg_color", "transparent")
+        super().__init__(master, **kwargs)
+        self.model = TitleSelection()
+        self.row_height = row_height
+        # 맨 위 줄에 표시하는 view 위치
+        self.first = 0
+        # 다시 사용하는 체크박스와 각 줄에 연결된 제목 번호
+        self.rows = []
+        self.row_index = []
+        self.visible_rows = 1
+        
+        # 검색, 정렬, 선택 수
+        toolbar = ctk.CTkFrame(self, fg_color="transparent")
+        toolbar.pack(fill="x", pady=(0, 5))
+        
+        self.filter_entry = ctk.CTkEntry(toolbar, placeholder_text="🔎 제목 검색", width=220)
+        self.filter_entry.pack(side="left", padx=(10, 5))
+        self.filter_entry.bind("<KeyRelease>", lambda event: self.apply_filter())
+        
+        self.sort_var = ctk.StringVar(value=SORT_ORDER)
+        ctk.CTkSegmentedButton(
+            toolbar,
+            values=list(SORT_MODES),
+            variable=self.sort_var,
+            command=lambda value: self.apply_filter()
+        ).pack(side="left", padx=5)
+        
+        self.count_label = ctk.CTkLabel(toolbar, text="", font=ctk.CTkFont(size=12))
+        self.count_label.pack(side="right", padx=10)
+        
+        # 줄 영역 + 스크롤바 (줄 영역의 크기는 체크박스 수와 관계없이 바깥 크기를 따름)
+        body = ctk.CTkFrame(self, fg_color=("gray90", "gray20"), corner_radius=10)
+        body.pack(fill="both", expand=True)
+        
+        self.scrollbar = ctk.CTkScrollbar(body, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y", padx=(0, 5), pady=5)
+        
+        self.rows_frame = ctk.CTkFrame(body, fg_color="transparent")
+        self.rows_frame.pack(side="left", fill="both", expand=True, padx=5, pady=5)
+        self.rows_frame.grid_propagate(False)
+        self.rows_frame.grid_columnconfigure(0, weight=1)
+        self.rows_frame.bind("<Configure>", self.on_resize)
+        self._bind_wheel(self.rows_frame)
+        
+        self.update_count()
+    
+    def _bind_wheel(self, widget):
+        """마우스 휠로 스크롤 (Windows/macOS: MouseWheel, Linux: Button-4/5)"""
+        widget.bind("<MouseWheel>", self.on_wheel)
+        widget.bind("<Button-4>", self.on_wheel)
+        widget.bind("<Button-5>", self.on_wheel)
+    
+    def set_titles(self, titles, selected=True):
+        """
+        제목 목록을 바꿉니다. (체크박스를 새로 만들지 않고 보이는 줄만 다시 그림)
+        
+        Args:
+            titles (list): 제목 리스트
+            selected (bool): 처음 선택 상태
+        """
+        self.model.set_titles(titles, selected)
+        self.filter_entry.delete(0, "end")
+        self.sort_var.set(SORT_ORDER)
+        self.first = 0
+        self.redraw()
+    
+    def selected_titles(self):
+        """선택한 제목 (생성 순)"""
+        return self.model.selected_titles()
+    
+    def select_all(self):
+        """보이는(검색된) 제목 모두 선택"""
+        self.model.set_view(True)
+        self.redraw()
+    
+    def deselect_all(self):
+        """보이는(검색된) 제목 모두 선택 해제"""
+        self.model.set_view(False)
+        self.redraw()
+    
+    def apply_filter(self):
+        """검색어/정렬 적용 후 맨 위로"""
+        self.model.apply(self.filter_entry.get(), self.sort_var.get())
+        self.first = 0
+        self.redraw()
+    
+    def _clamp(self, first):
+        """마지막 줄까지 보이는 범위 안으로 맞춘 view 위치"""
+        last = max(0, len(self.model.view) - self.visible_rows)
+        return min(max(0, int(first)), last)
+    
+    def scroll_to(self, first):
+        """view 위치 first부터 표시"""
+        first = self._clamp(first)
+        if first != self.first:
+            self.first = first
+            self.redraw()
+    
+    def on_scrollbar(self, action, value, unit=None):
+        """스크롤바 콜백 ('moveto', 비율) 또는 ('scroll', 줄 수, 'units')"""
+        if action == "moveto":
+            self.scroll_to(round(float(value) * len(self.model.view)))
+        elif action == "scroll":
+            self.scroll_to(self.first + int(value))
+    
+    def on_wheel(self, event):
+        """휠 한 칸에 3줄씩 (macOS는 휠 이동량만큼)"""
+        if event.num == 4:
+            delta = -3
+        elif event.num == 5:
+            delta = 3
+        elif sys.platform == "darwin":
+            delta = -event.delta
+        else:
+            delta = -int(event.delta / 40)
+        self.scroll_to(self.first + delta)
+    
+    def on_resize(self, event):
+        """높이가 바뀌면 보이는 줄 수를 다시 계산 (모자란 체크박스만 추가로 만듦)"""
+        visible_rows = max(1, event.height // self.row_height)
+        if visible_rows != self.visible_rows or not self.rows:
+            self.visible_rows = visible_rows
+            self.first = self._clamp(self.first)
+            self.redraw()
+    
+    def _row(self, position):
+        """position번째 줄의 체크박스 (없으면 만듦)"""
+        while len(self.rows) <= position:
+            row = len(self.rows)
+            checkbox = ctk.CTkCheckBox(
+                self.rows_frame,
+                text="",
+                font=ctk.CTkFont(size=13),
+                command=lambda row=row: self.on_toggle(row)
+            )
+            self.rows_frame.grid_rowconfigure(row, minsize=self.row_height)
+            self._bind_wheel(checkbox)
+            self.rows.append(checkbox)
+            self.row_index.append(None)
+        return self.rows[position]
+    
+    def on_toggle(self, row):
+        """체크박스를 누르면 연결된 제목의 선택 상태 변경"""
+        index = self.row_index[row]
+        if index is not None:
+            self.model.set(index, self.rows[row].get())
+            self.update_count()
+    
+    def redraw(self):
+        """보이는 줄에 제목을 연결하고 스크롤바/선택 수 갱신"""
+        model = self.model
+        shown = model.view[self.first:self.first + self.visible_rows]
+        
+        for position, index in enumerate(shown):
+            checkbox = self._row(position)
+            if self.row_index[position] != index:
+                checkbox.configure(text=f"{index + 1}. {model.titles[index]}")
+                self.row_index[position] = index
+            # select/deselect는 command를 호출하지 않음
+            if model.selected[index]:
+                checkbox.select()
+            else:
+                checkbox.deselect()
+            if not checkbox.grid_info():
+                checkbox.grid(row=position, column=0, sticky="ew", padx=10)
+        
+        # 남는 줄은 숨김 (다음에 다시 사용)
+        for position in range(len(shown), len(self.rows)):
+            self.row_index[position] = None
+            self.rows[position].grid_remove()
+        
+        total = len(model.view)
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.update_count()
+    
+    def update_count(self):
+        model = self.model
+        text = f"선택 {model.count}/{len(model)}개"
+        if len(model.view) != len(model):
+            text += f" (검색 결과 {len(model.view)}개)"
+        self.count_label.configure(text=text)
@@ -3,53 +3,59 @@
 이 파일에서 제목 관련 모든 프롬프트를 중앙 관리합니다.
 """
 
-def get_analysis_prompt(titles_text, keyword):
+def get_analysis_prompt(titles_text, keyword, stats_text, related_text=""):
     """
     블로그 제목 분석을 위한 프롬프트를 반환합니다.
     
     Args:
         titles_text (str): 분석할 블로그 제목들의 텍스트
         keyword (str): 검색 키워드
+        stats_text (str): 직접 계산한 제목 통계 (TitleStats.to_prompt())
+        related_text (str): 검색 결과에서 확장한 연관 키워드 (KeywordGraph.to_prompt(), 없으면 생략)
     
     Returns:
         str: 분석 프롬프트
     """
+    related_section = ""
+    if related_text:
+        related_section = f"""
+# 연관 키워드 (검색 결과의 제목/요약에서 확장한 검색어, 가중치는 등장한 검색 결과 수)
+{related_text}
+- 연관 키워드는 SEO 최적화 요소와 차별화 포인트를 분석할 때 함께 참고하세요
+"""
+
     return f"""당신은 블로그 콘텐츠 전략 전문가입니다. 아래 제공된 블로그 제목들을 심층 분석해주세요.
 
 # 분석할 블로그 제목 목록
 {titles_text}
 
+# 제목 통계 (전체 제목에서 직접 계산한 정확한 값)
+{stats_text}
+{related_section}
 # 분석 요구사항
+길이, 문장 유형, 특수문자, 숫자, 키워드 빈도는 위 통계를 그대로 근거로 삼고 다시 세지 마세요.
 다음 항목들을 매우 구체적이고 상세하게 분석해주세요:
 
-## 1. 제목 작성 형태 분석
-- 제목의 평균 길이와 글자 수 범위
-- 사용되는 문장 유형 (의문문, 평서문, 감탄문 등)
-- 특수문자나 이모지 사용 패턴
-- 숫자 사용 패턴 (예: "5가지", "2023년" 등)
-
-## 2. 핵심 키워드 추출
-- 가장 많이 등장하는 키워드 TOP 10
-- 키워드의 조합 패턴 (어떤 키워드들이 함께 자주 사용되는지)
-- 주제별 키워드 분류
-
-## 3. 제목 구조 분석
+## 1. 제목 구조 분석
 - 일반적인 제목 구조 패턴 (예: "주제 + 방법", "질문형", "팁 나열형" 등)
 - 후킹 요소 (클릭을 유도하는 요소)
 - 구조별 빈도 분석
 
-## 4. 콘텐츠 패턴 및 전략 분석
+## 2. 콘텐츠 패턴 및 전략 분석
 - 독자의 관심을 끄는 표현 기법
 - 정보 전달 방식 (하우투, 리뷰, 경험담, 팁 공유 등)
 - SEO 최적화 요소 (키워드 배치, 구체성 등)
 - 감성적 어필 vs 논리적 어필 비율
 
-## 5. 차별화 포인트
+## 3. 차별화 포인트
 - 경쟁 블로그들과 차별화되는 독특한 표현
 - 트렌드가 되는 제목 스타일
 - 효과적인 제목의 공통점
 
-JSON 형식으로 구조화하여 응답해주세요."""
+지정된 JSON 스키마 형식으로만 응답해주세요.
+- 목록 항목은 문장 대신 짧은 구절로 핵심만 적어주세요
+- structures의 example은 위 목록에 있는 제목을 그대로 인용하세요
+- summary에는 새 제목을 만들 때 가장 중요한 점을 2~3문장으로 요약하세요"""
 
 
 def get_analysis_system_prompt():
@@ -67,7 +73,7 @@ def get_generation_prompt(analysis_result, titles_text, keyword, num_generate):
     새로운 블로그 제목 생성을 위한 프롬프트를 반환합니다.
     
     Args:
-        analysis_result (str): 분석 결과 텍스트
+        analysis_result (str): 요약된 분석 결과 (TitleAnalysis.to_compact())
         titles_text (str): 기존 블로그 제목들의 텍스트
         keyword (str): 검색 키워드
         num_generate (int): 생성할 제목 개수
@@ -77,7 +83,7 @@ def get_generation_prompt(analysis_result, titles_text, keyword, num_generate):
     """
     return f"""당신은 블로그 콘텐츠 크리에이터입니다. 앞서 분석한 결과를 바탕으로 '{keyword}' 키워드에 대한 새로운 블로그 제목을 생성해주세요.
 
-# 기존 제목 분석 결과
+# 기존 제목 분석 결과 (요약)
 {analysis_result}
 
 # 기존 블로그 제목들 (참고용)
@@ -100,6 +106,46 @@ def get_generation_prompt(analysis_result, titles_text, keyword, num_generate):
 ..."""
 
 
+def get_replacement_prompt(analysis_result, keyword, kept_titles, rejected_titles, num_generate):
+    """
+    비슷한 제목으로 걸러낸 자리를 채울 새 제목 생성 프롬프트를 반환합니다.
+    
+    Args:
+        analysis_result (str): 요약된 분석 결과 (TitleAnalysis.to_compact())
+        keyword (str): 검색 키워드
+        kept_titles (list): 이미 채택된 제목 리스트
+        rejected_titles (list): 기존 제목과 비슷해서 제외된 제목 리스트
+        num_generate (int): 새로 생성할 제목 개수
+    
+    Returns:
+        str: 생성 프롬프트
+    """
+    kept = "\n".join(f"- {title}" for title in kept_titles) or "- (없음)"
+    rejected = "\n".join(f"- {title}" for title in rejected_titles)
+    
+    return f"""'{keyword}' 키워드에 대한 블로그 제목을 {num_generate}개 더 생성해주세요.
+
+# 기존 제목 분석 결과 (요약)
+{analysis_result}
+
+# 이미 채택된 제목 (겹치지 않게)
+{kept}
+
+# 기존 블로그 제목과 너무 비슷해서 제외된 제목 (표현과 구성을 바꿔서)
+{rejected}
+
+# 요구사항
+1. 위 제목들과 단어 순서나 숫자, 문장부호만 바꾼 제목은 만들지 마세요
+2. 핵심 키워드는 자연스럽게 포함하되 관점, 대상 독자, 형식(질문형, 하우투형, 리스트형, 경험담형 등)을 다르게 하세요
+
+정확히 {num_generate}개의 제목을 생성하고, 각 제목 옆에 간단한 설명을 덧붙여주세요.
+
+형식:
+1. [제목] - [설명]
+2. [제목] - [설명]
+..."""
+
+
 def get_generation_system_prompt():
     """
     생성 단계의 시스템 프롬프트를 반환합니다.
@@ -0,0 +1,256 @@
+"""
+블로그 제목 통계
+제목 길이, 문장 유형, 특수문자/이모지, 숫자 패턴, 키워드 빈도와 함께 쓰이는 조합처럼
+정해진 방법으로 셀 수 있는 항목은 LLM에 맡기지 않고 직접 계산합니다.
+계산한 값은 분석 프롬프트에 넣고, LLM은 구조/전략 같은 정성적 분석만 합니다.
+
+한 번의 순회로 모든 제목을 토큰화하고 Counter로 집계하므로
+페이지 검색으로 수백 개의 제목을 모아도 바로 계산됩니다.
+"""
+import re
+import html
+import statistics
+from itertools import combinations
+from collections import Counter
+from dataclasses import dataclass, field
+
+# 키워드/조합 상위 개수
+TOP_KEYWORDS = 10
+TOP_COMBINATIONS = 10
+
+# 조합을 셀 때 대상으로 삼을 상위 키워드 수 (제목당 조합 수를 제한)
+COMBINATION_POOL = 30
+
+# 토큰: 한글 / 영문 묶음
+TOKEN_PATTERN = re.compile(r"[가-힣]+|[A-Za-z][A-Za-z0-9+#]*")
+
+# 숫자 + 단위 (예: 5가지, 2024년, 3박, 10만원)
+NUMBER_PATTERN = re.compile(
+    r"\d+(?:[.,]\d+)?\s*(만원|천원|가지|년|월|일|개|곳|원|분|시간|박|위|번|명|세|평|주|편|탄|%|kg|km)?"
+)
+YEAR_PATTERN = re.compile(r"^(19|20)\d{2}년$")
+
+# 의문문 어미 (끝 부분 기준)
+QUESTION_ENDINGS = ("까", "나요", "가요", "는지", "을지", "인지", "할래", "을래")
+
+# 토큰 끝에서 떼어낼 조사 (긴 것부터 확인)
+PARTICLES = (
+    "에서는", "으로는", "이라는", "에서", "으로", "까지", "부터", "에게", "처럼", "보다",
+    "이랑", "하고", "라는", "은", "는", "이", "가", "을", "를", "에", "의", "도", "로", "와", "과", "만", "랑"
+)
+
+# 조사를 뗀 뒤 남아야 하는 최소 글자 수 (예: '아이'의 '이'는 떼지 않음)
+MIN_STEM = 2
+
+# 키워드에서 제외할 단어
+STOPWORDS = {
+    "및", "그리고", "하는", "있는", "위한", "대한", "통해", "정말", "진짜", "너무", "이런", "그런",
+    "하기", "해서", "하고", "후기", "the", "and", "of", "to", "in", "for"
+}
+
+
+def is_emoji_modifier(char):
+    """이모지에 붙는 보이지 않는 문자 여부 (이형 선택자 U+FE00~U+FE0F, ZWJ U+200D, 키캡 U+20E3)"""
+    code = ord(char)
+    return 0xFE00 <= code <= 0xFE0F or code in (0x200D, 0x20E3)
+
+
+def is_emoji(char):
+    """이모지/그림 문자 여부"""
+    code = ord(char)
+    return code >= 0x1F000 or 0x2600 <= code <= 0x27BF or 0x2B00 <= code <= 0x2BFF
+
+
+def strip_particle(token):
+    """한글 토큰 끝의 조사를 떼어냅니다. (예: '캠핑장에서' → '캠핑장')"""
+    for particle in PARTICLES:
+        if token.endswith(particle) and len(token) - len(particle) >= MIN_STEM:
+            return token[:-len(particle)]
+    return token
+
+
+def tokenize(title):
+    """
+    제목을 키워드 토큰으로 나눕니다. (조사 제거, 영문 소문자, 한 글자/불용어/숫자+단위 제외)
+    
+    Returns:
+        list: 제목에 나온 순서대로의 토큰 리스트
+    """
+    tokens = []
+    # '5가지', '2024년' 같은 숫자+단위는 숫자 패턴으로 따로 세므로 제외
+    for token in TOKEN_PATTERN.findall(NUMBER_PATTERN.sub(" ", title)):
+        if "가" <= token[0] <= "힣":
+            token = strip_particle(token)
+        else:
+            token = token.lower()
+        if len(token) > 1 and token not in STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+def sentence_type(title):
+    """문장 유형 (의문문/감탄문/평서문)"""
+    text = title.strip()
+    if "?" in text or "？" in text:
+        return "의문문"
+    
+    # 끝의 특수문자/이모지를 떼고 어미 확인
+    body = re.sub(r"[^가-힣A-Za-z0-9]+$", "", text)
+    if body.endswith(QUESTION_ENDINGS):
+        return "의문문"
+    if "!" in text or "！" in text:
+        return "감탄문"
+    return "평서문"
+
+
+def number_label(match):
+    """숫자 패턴 표시 이름 (예: '5가지' → 'N가지', '2024년' → '연도(0000년)')"""
+    text = match.group(0).replace(" ", "")
+    if YEAR_PATTERN.match(text):
+        return "연도(0000년)"
+    unit = match.group(1)
+    return f"N{unit}" if unit else "숫자"
+
+
+def _percent(count, total):
+    return round(count * 100 / total) if total else 0
+
+
+@dataclass
+class TitleStats:
+    """제목 목록 통계"""
+    count: int = 0
+    average: float = 0.0
+    median: float = 0.0
+    min: int = 0
+    max: int = 0
+    sentence_types: dict = field(default_factory=dict)
+    emoji_titles: int = 0
+    special_titles: int = 0
+    special_chars: list = field(default_factory=list)
+    number_titles: int = 0
+    number_patterns: list = field(default_factory=list)
+    top_keywords: list = field(default_factory=list)
+    bigrams: list = field(default_factory=list)
+    combinations: list = field(default_factory=list)
+    
+    def to_prompt(self):
+        """
+        분석 프롬프트에 넣을 통계 텍스트
+        
+        Returns:
+            str: 항목당 한 줄로 정리한 통계
+        """
+        n = self.count
+        types = ", ".join(f"{name} {_percent(count, n)}%" for name, count in self.sentence_types.items())
+        chars = ", ".join(f"'{char}' {count}회" for char, count in self.special_chars) or "없음"
+        numbers = ", ".join(f"{label} {count}회" for label, count in self.number_patterns) or "없음"
+        keywords = ", ".join(f"{word}({count})" for word, count in self.top_keywords)
+        bigrams = ", ".join(f"'{' '.join(pair)}'({count})" for pair, count in self.bigrams) or "없음"
+        pairs = ", ".join(f"{a}+{b}({count})" for (a, b), count in self.combinations) or "없음"
+        
+        return "\n".join([
+            f"- 제목 수: {n}개",
+            f"- 글자 수: 평균 {self.average:g}자, 중앙값 {self.median:g}자, 범위 {self.min}~{self.max}자",
+            f"- 문장 유형: {types}",
+            f"- 이모지 사용: {_percent(self.emoji_titles, n)}% / 특수문자 사용: {_percent(self.special_titles, n)}%",
+            f"- 자주 쓰인 특수문자: {chars}",
+            f"- 숫자 포함: {_percent(self.number_titles, n)}% ({numbers})",
+            f"- 키워드 TOP {len(self.top_keywords)} (등장한 제목 수): {keywords}",
+            f"- 연달아 쓰인 단어: {bigrams}",
+            f"- 같은 제목에 함께 쓰인 키워드: {pairs}"
+        ])
+    
+    def to_analysis_fields(self):
+        """
+        TitleAnalysis의 통계 항목 값 (분석 응답과 합쳐서 사용)
+        
+        Returns:
+            dict: length_stats, sentence_types, special_chars, number_patterns, top_keywords, keyword_combinations
+        """
+        n = self.count
+        special = [f"이모지 사용 {_percent(self.emoji_titles, n)}%", f"특수문자 사용 {_percent(self.special_titles, n)}%"]
+        special += [f"'{char}' {count}회" for char, count in self.special_chars]
+        numbers = [f"숫자 포함 {_percent(self.number_titles, n)}%"]
+        numbers += [f"{label} {count}회" for label, count in self.number_patterns]
+        
+        return {
+            "length_stats": {"average": self.average, "min": self.min, "max": self.max},
+            "sentence_types": [f"{name} {_percent(count, n)}%" for name, count in self.sentence_types.items()],
+            "special_chars": special,
+            "number_patterns": numbers,
+            "top_keywords": [f"{word} ({count}회)" for word, count in self.top_keywords],
+            "keyword_combinations": [f"{a}+{b} ({count}회)" for (a, b), count in self.combinations]
+        }
+
+
+def compute_title_stats(titles, top_keywords=TOP_KEYWORDS, top_combinations=TOP_COMBINATIONS):
+    """
+    제목 목록의 통계를 계산합니다.
+    
+    Args:
+        titles (list): 블로그 제목 리스트
+        top_keywords (int): 키워드 상위 개수
+        top_combinations (int): 조합 상위 개수
+    
+    Returns:
+        TitleStats: 통계
+    """
+    # 검색 결과에 남아 있을 수 있는 HTML 엔티티(&amp; 등)는 글자로 바꿔서 셈
+    titles = [html.unescape(title).strip() for title in titles if title and title.strip()]
+    if not titles:
+        return TitleStats()
+    
+    lengths = []
+    types = Counter()
+    chars = Counter()
+    numbers = Counter()
+    keywords = Counter()
+    bigrams = Counter()
+    title_tokens = []
+    emoji_titles = special_titles = number_titles = 0
+    
+    for title in titles:
+        lengths.append(len(title))
+        types[sentence_type(title)] += 1
+        
+        # '❤️'의 이형 선택자 같은 보이지 않는 문자는 빼고 앞의 기호만 셈
+        specials = [c for c in title if not (c.isalnum() or c.isspace() or is_emoji_modifier(c))]
+        if any(is_emoji(c) for c in specials):
+            emoji_titles += 1
+        if specials:
+            special_titles += 1
+            chars.update(c for c in specials if not is_emoji(c))
+        
+        labels = [number_label(m) for m in NUMBER_PATTERN.finditer(title)]
+        if labels:
+            number_titles += 1
+            numbers.update(labels)
+        
+        tokens = tokenize(title)
+        keywords.update(set(tokens))
+        bigrams.update(set(zip(tokens, tokens[1:])))
+        title_tokens.append(tokens)
+    
+    # 상위 키워드끼리만 같은 제목 조합을 셈 (제목당 조합 수 제한)
+    pool = {word for word, _ in keywords.most_common(COMBINATION_POOL)}
+    pairs = Counter()
+    for tokens in title_tokens:
+        pairs.update(combinations(sorted(pool.intersection(tokens)), 2))
+    
+    return TitleStats(
+        count=len(titles),
+        average=round(sum(lengths) / len(lengths), 1),
+        median=statistics.median(lengths),
+        min=min(lengths),
+        max=max(lengths),
+        sentence_types=dict(types.most_common()),
+        emoji_titles=emoji_titles,
+        special_titles=special_titles,
+        special_chars=chars.most_common(5),
+        number_titles=number_titles,
+        number_patterns=numbers.most_common(5),
+        top_keywords=keywords.most_common(top_keywords),
+        bigrams=[(pair, count) for pair, count in bigrams.most_common(top_combinations) if count > 1],
+        combinations=[(pair, count) for pair, count in pairs.most_common(top_combinations) if count > 1]
+    )
@@ -0,0 +1,157 @@
+"""
+화면 업데이트 디스패처
+Tk는 스레드에 안전하지 않으므로 작업 스레드는 위젯을 직접 건드리지 않고
+큐에 업데이트를 넣기만 하고, 메인 루프가 일정 간격(after)으로 큐를 비우며 실행합니다.
+
+같은 키의 업데이트(진행률, 상태 문구 등)는 마지막 것만 남겨 합치므로
+여러 작업 스레드가 동시에 진행 상황을 보내도 화면이 밀리지 않습니다.
+"""
+import sys
+import time
+import itertools
+import threading
+import functools
+import tkinter as tk
+
+# 큐를 비우는 간격 (약 60fps)
+DEFAULT_INTERVAL_MS = 16
+
+# 한 번에 큐를 비우는 데 쓸 최대 시간 (남은 업데이트는 다음 틱에 실행)
+DEFAULT_BUDGET_MS = 8
+
+
+class UIDispatcher:
+    """
+    작업 스레드 → 메인 스레드 화면 업데이트 큐
+    
+    사용 예:
+        self.ui = UIDispatcher(self)
+        self.ui.start()
+        # 작업 스레드에서
+        self.ui.post(self.update_status, "검색 중...", 0.1, key="status")
+    """
+    
+    def __init__(self, root, interval_ms=DEFAULT_INTERVAL_MS, budget_ms=DEFAULT_BUDGET_MS):
+        """
+        Args:
+            root: Tk 루트 윈도우
+            interval_ms (int): 큐를 비우는 간격 (밀리초)
+            budget_ms (int): 한 번의 틱에서 업데이트를 실행할 최대 시간 (밀리초)
+        """
+        self.root = root
+        self.interval_ms = interval_ms
+        self.budget = budget_ms / 1000
+        self.main_thread = threading.current_thread()
+        # 실행 순서를 유지하는 대기 업데이트 (키 → (함수, 인자, 키워드 인자))
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._running = False
+    
+    def start(self):
+        """메인 루프에서 주기적으로 큐 비우기 시작"""
+        if not self._running:
+            self._running = True
+            self.root.after(self.interval_ms, self._tick)
+    
+    def stop(self):
+        """큐 비우기 중단"""
+        self._running = False
+    
+    def in_main_thread(self):
+        """현재 스레드가 Tk 메인 스레드인지 여부"""
+        return threading.current_thread() is self.main_thread
+    
+    def post(self, fn, *args, key=None, **kwargs):
+        """
+        메인 스레드에서 실행할 업데이트를 큐에 넣습니다. (어느 스레드에서나 호출 가능)
+        
+        Args:
+            fn (callable): 실행할 함수
+            *args, **kwargs: fn에 전달할 인자
+            key: 합치기 키 - 같은 키로 아직 실행되지 않은 업데이트가 있으면 버리고 새 것만 실행
+                 (None이면 모든 업데이트를 순서대로 실행)
+        """
+        with self._lock:
+            if key is None:
+                key = ("call", next(self._counter))
+            else:
+                # 이전 업데이트를 버리고 맨 뒤로 옮겨 다른 업데이트와의 순서를 유지
+                self._pending.pop(key, None)
+            self._pending[key] = (fn, args, kwargs)
+    
+    def call(self, fn, *args, key=None, **kwargs):
+        """
+        메인 스레드면 바로 실행하고, 작업 스레드면 큐에 넣습니다.
+        (바로 실행할 때는 같은 키로 대기 중인 오래된 업데이트를 버림)
+        """
+        if not self.in_main_thread():
+            self.post(fn, *args, key=key, **kwargs)
+            return
+        
+        if key is not None:
+            with self._lock:
+                self._pending.pop(key, None)
+        fn(*args, **kwargs)
+    
+    def _tick(self):
+        """대기 중인 업데이트 실행 (메인 루프에서 호출)"""
+        if not self._running:
+            return
+        
+        # 대화상자처럼 실행이 오래 걸리는 업데이트 중에도 화면이 갱신되도록 다음 틱을 먼저 예약
+        try:
+            self.root.after(self.interval_ms, self._tick)
+        except tk.TclError:
+            # 창이 닫힘
+            self._running = False
+            return
+        
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        
+        deadline = time.perf_counter() + self.budget
+        items = iter(pending.items())
+        for _, (fn, args, kwargs) in items:
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+            
+            if time.perf_counter() > deadline:
+                break
+        
+        # 시간 안에 실행하지 못한 업데이트는 다음 틱으로 (그사이 새로 들어온 같은 키는 새 것 우선)
+        rest = dict(items)
+        if rest:
+            with self._lock:
+                for key in self._pending:
+                    rest.pop(key, None)
+                rest.update(self._pending)
+                self._pending = rest
+
+
+def ui_thread(key=None):
+    """
+    화면 업데이트 메서드를 어느 스레드에서 호출해도 메인 스레드에서 실행되도록 하는 데코레이터
+    (메서드의 인스턴스에 UIDispatcher가 self.ui로 있어야 함)
+    
+    Args:
+        key: 합치기 키 (문자열) 또는 메서드 인자를 받아 키를 만드는 함수
+    
+    사용 예:
+        @ui_thread(key="status")
+        def update_status(self, text, progress): ...
+        
+        @ui_thread(key=lambda textbox, content: ("textbox", id(textbox)))
+        def update_textbox(self, textbox, content): ...
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            update_key = key(*args, **kwargs) if callable(key) else key
+            if update_key is not None:
+                update_key = (method.__name__, update_key)
+            self.ui.call(method, self, *args, key=update_key, **kwargs)
+        return wrapper
+    return decorator